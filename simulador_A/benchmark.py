@@ -0,0 +1,207 @@
+import argparse, json, multiprocessing, os, platform, subprocess, sys, time
+from workloadGenerator import WorkloadGenerator
+from taskTable import TaskTable
+from taskScheduler import TaskScheduler
+from schedulingPolicy import policy_names
+from process import Process
+from mutex import Synchronization
+from engine import EventEngine
+from timeline import Timeline
+
+# Suíte de desempenho do simulador (sem interface gráfica). Cada caso é um
+# algoritmo x tamanho x variante de carga, gerada pelo WorkloadGenerator com
+# semente fixa, então os mesmos casos produzem as mesmas simulações em qualquer
+# commit. Cada caso roda em um processo novo, para que o pico de memória (RSS)
+# seja apenas o dele.
+#
+# Métricas por caso:
+# - ticks_per_sec: ticks simulados por segundo de relógio
+# - decisions_per_sec: ticks em que o escalonador de fato decidiu (o motor por
+#   eventos salta os demais) por segundo
+# - peak_rss_kb: pico de memória do processo (None onde o módulo resource não existe)
+# - wall_time: melhor tempo entre as repetições (a geração da carga fica de fora)
+#
+# O resultado é um JSON; com --compare os tempos são comparados com os de outra execução.
+#
+# Exemplo:
+#   python benchmark.py -o base.json
+#   python benchmark.py -s 10 1000 100000 -a FCFS SRTF --compare base.json -o novo.json
+
+SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+# carga abaixo da capacidade da CPU (0.18 tarefa/tick x 5 ticks), para que a
+# fila não cresça sem limite nas cargas grandes
+WORKLOAD = {'arrival_rate': 0.18, 'mean_burst': 5}
+
+VARIANTS = {
+    'plain': {},                                                                # apenas CPU
+    'events': {'io_density': 0.5, 'mutex_probability': 0.1, 'mutex_count': 4}   # com IO e ML/MU
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Suíte de desempenho do simulador (saída em JSON)')
+    parser.add_argument('-a', '--algorithms', nargs='+', type=str.upper, choices=policy_names(), help='algoritmos (padrão: todos)')
+    parser.add_argument('-s', '--sizes', nargs='+', type=int, default=SIZES, help='quantidades de tarefas (padrão: 10 a 1000000)')
+    parser.add_argument('--variants', nargs='+', choices=list(VARIANTS), default=list(VARIANTS), help='cargas sem eventos (plain) e com IO/ML/MU (events)')
+    parser.add_argument('-q', '--quantum', type=int, default=3, help='quantum (padrão: 3)')
+    parser.add_argument('--alpha', type=int, default=1, help='alpha (padrão: 1)')
+    parser.add_argument('--seed', type=int, default=42, help='semente das cargas (padrão: 42)')
+    parser.add_argument('-r', '--repeat', type=int, default=1, help='repetições por caso; vale o menor tempo (padrão: 1)')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='casos em paralelo (padrão: 1, para não disputarem a CPU)')
+    parser.add_argument('--compare', help='JSON de uma execução anterior para comparar os tempos')
+    parser.add_argument('-o', '--output', help='arquivo JSON de saída (padrão: saída padrão)')
+    return parser
+
+
+def peak_rss() -> int:
+    """Pico de memória do processo em KB (None sem o módulo resource, ex.: Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # no macOS o valor vem em bytes
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def commit() -> str:
+    """Commit atual do repositório (None fora de um repositório git)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def simulate_table(algorithm: str, quantum: int, alpha: int, table: TaskTable) -> tuple[int, int, TaskScheduler]:
+    """Simulação completa como em engine.simulate, mantendo o motor para contar as decisões"""
+    process = Process()
+    process.load_table(table)
+    task_scheduler = TaskScheduler(algorithm, quantum, alpha)
+    engine = EventEngine(process, task_scheduler, Synchronization())
+
+    timeline = Timeline()
+    end = engine.run(timeline)
+
+    running = task_scheduler.running(process)
+    for task in running:
+        task.stop = end
+    process.finish(end, timeline, running)
+    task_scheduler.update_metrics(process)
+
+    return end, engine.ticks_executed, task_scheduler
+
+
+def run_case(case: tuple) -> dict:
+    """Executa um caso (algoritmo, tamanho, variante, quantum, alpha, semente, repetições)"""
+    algorithm, size, variant, quantum, alpha, seed, repeat = case
+    table = TaskTable.from_tasks(WorkloadGenerator(seed=seed, **WORKLOAD, **VARIANTS[variant]).tasks(size))
+
+    wall_time = float('inf')
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        end, decisions, task_scheduler = simulate_table(algorithm, quantum, alpha, table)
+        wall_time = min(wall_time, time.perf_counter() - started)
+
+    return {
+        'algorithm': algorithm,
+        'size': size,
+        'variant': variant,
+        'ticks': end,
+        'decisions': decisions,
+        'wall_time': round(wall_time, 6),
+        'ticks_per_sec': round(end / wall_time, 1) if wall_time else None,
+        'decisions_per_sec': round(decisions / wall_time, 1) if wall_time else None,
+        'peak_rss_kb': peak_rss(),
+        'turnaround_time': task_scheduler.turnaround_time,
+        'waiting_time': task_scheduler.waiting_time
+    }
+
+
+def case_key(result: dict) -> tuple:
+    return result['algorithm'], result['size'], result['variant']
+
+
+def compare(results: list[dict], path: str, output=sys.stderr):
+    """Mostra a variação do tempo de cada caso em relação a uma execução anterior"""
+    with open(path, 'r', encoding='utf-8') as file:
+        base = {case_key(result): result for result in json.load(file)['results']}
+
+    for result in results:
+        old = base.get(case_key(result))
+        if old is None:
+            continue
+
+        change = (result['wall_time'] / old['wall_time'] - 1) * 100 if old['wall_time'] else 0.0
+        # tempos ou métricas diferentes indicam que o escalonamento mudou, não só o desempenho
+        note = '' if (old['ticks'], old['turnaround_time']) == (result['ticks'], result['turnaround_time']) else ' | RESULTADO DIFERENTE'
+        print(f"{result['algorithm']:>8} {result['size']:>8} {result['variant']:<6} "
+              f"{old['wall_time']:.4f} s -> {result['wall_time']:.4f} s ({change:+.1f}%){note}", file=output)
+
+
+def run_benchmark(algorithms: list[str] = None, sizes: list[int] = SIZES, variants: list[str] = None, quantum: int = 3, alpha: int = 1,
+                  seed: int = 42, repeat: int = 1, jobs: int = 1):
+    """Gera o resultado de cada caso, na ordem algoritmo x variante x tamanho"""
+    if min(sizes) < 1:
+        raise ValueError('os tamanhos devem ser positivos')
+
+    cases = [
+        (algorithm, size, variant, quantum, alpha, seed, repeat)
+        for algorithm in algorithms or policy_names()
+        for variant in variants or list(VARIANTS)
+        for size in sizes
+    ]
+
+    # um processo novo por caso: o pico de memória de um caso não contamina o seguinte
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(max(1, jobs), maxtasksperchild=1) as pool:
+        yield from pool.imap(run_case, cases)
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    results = []
+    try:
+        for result in run_benchmark(args.algorithms, args.sizes, args.variants, args.quantum, args.alpha, args.seed, args.repeat, args.jobs):
+            print(f"{result['algorithm']:>8} {result['size']:>8} {result['variant']:<6} {result['wall_time']:.4f} s "
+                  f"{result['ticks_per_sec'] or 0:.0f} ticks/s {result['decisions_per_sec'] or 0:.0f} decisões/s", file=sys.stderr)
+            results.append(result)
+
+        report = {
+            'commit': commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quantum': args.quantum,
+            'alpha': args.alpha,
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'workload': WORKLOAD,
+            'variants': {variant: VARIANTS[variant] for variant in args.variants},
+            'results': results
+        }
+
+        if args.compare:
+            compare(results, args.compare)
+
+    except (OSError, ValueError, KeyError) as error:
+        print(f'ERRO | {error}', file=sys.stderr)
+        return 1
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        json.dump(report, output, ensure_ascii=False, indent=2)
+        output.write('\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
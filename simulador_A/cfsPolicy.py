@@ -0,0 +1,105 @@
+from functools import lru_cache
+from math import inf
+from readyQueue import ReadyQueue
+from tcb import TCB
+from schedulingPolicy import PreemptivePolicy, register_policy
+
+# Completely Fair Scheduler (no estilo do Linux): cada tarefa acumula um tempo
+# virtual (vruntime) que cresce mais devagar quanto maior a prioridade, e roda a
+# de menor vruntime. A árvore ordenada do Linux é a fila de prontas com heap
+# preguiçoso: o vruntime de uma tarefa pronta não muda até ela voltar à CPU,
+# então a chave calculada ao entrar na fila continua válida.
+#
+# - o quantum é a granularidade mínima: a tarefa roda ao menos um quantum antes
+#   de ceder a CPU para outra de vruntime menor
+# - tarefas novas começam no menor vruntime do núcleo (min_vruntime), e as que
+#   voltam do IO recebem no máximo um quantum de vantagem sobre ele
+#
+# vruntime = policy_data + duration_current x passo, com valores inteiros (o
+# motor por eventos calcula exatamente quando a tarefa atual deixa de ser a menor)
+
+NICE_0_WEIGHT = 1024    # peso da prioridade 0
+VRUNTIME_TICK = 1024    # vruntime de um tick com a prioridade 0
+
+
+@lru_cache(maxsize=None)
+def vruntime_step(priority: int) -> int:
+    """vruntime acumulado por tick: cada nível de prioridade vale ~25% a mais de peso, como o nice do Linux"""
+    weight = round(NICE_0_WEIGHT * 1.25 ** max(-20, min(19, priority)))
+    return VRUNTIME_TICK * NICE_0_WEIGHT // weight
+
+
+def vruntime(task: TCB) -> int:
+    return task.policy_data + task.duration_current * vruntime_step(task.priority_init)
+
+
+@register_policy
+class CFSPolicy(PreemptivePolicy):
+    name = 'CFS'
+
+    def __init__(self, scheduler):
+        super().__init__(scheduler)
+        self.min_vruntime = 0   # só cresce
+
+
+    def ready_key(self):
+        return vruntime
+
+
+    def on_enqueue(self, task: TCB):
+        if task.policy_data is None:
+            # nova: entra no menor vruntime do núcleo
+            task.policy_data = self.update_min_vruntime(task.queue) - task.duration_current * vruntime_step(task.priority_init)
+
+
+    def update_min_vruntime(self, queue: ReadyQueue) -> int:
+        """Menor vruntime entre as tarefas em execução e a primeira pronta (sem retroceder)"""
+        candidates = [vruntime(task) for task in queue.running.values()]
+        entry = queue.peek()
+        if entry:
+            candidates.append(entry[0])
+        if candidates:
+            self.min_vruntime = max(self.min_vruntime, min(candidates))
+        return self.min_vruntime
+
+
+    def dispatched(self, task: TCB):
+        # limita a vantagem de quem ficou muito tempo fora da CPU (ex.: IO)
+        floor = self.update_min_vruntime(task.queue) - self.scheduler.quantum * VRUNTIME_TICK
+        current = vruntime(task)
+        if current < floor:
+            task.policy_data += floor - current
+
+
+    def choose(self, queue: ReadyQueue, running: TCB) -> TCB:
+        entry = queue.peek()
+        if running and (self.scheduler.remaining_quantum_time < self.scheduler.quantum or entry is None or entry[0] >= vruntime(running)):
+            return running
+        return entry[3] if entry else None
+
+
+    def window(self, queue: ReadyQueue, running: TCB) -> tuple[int, callable]:
+        entry = queue.peek()
+        if entry is None:
+            return inf, self.step_increment
+
+        remaining = self.scheduler.remaining_quantum_time
+        if remaining < self.scheduler.quantum:
+            return self.scheduler.quantum - remaining, self.step_increment
+
+        # ticks até o vruntime da tarefa atual passar o da primeira pronta
+        return max(0, (entry[0] - vruntime(running)) // vruntime_step(running.priority_init)), self.step_increment
+
+
+    def migrate(self, task: TCB, target: "CFSPolicy"):
+        # o vruntime é relativo ao min_vruntime de cada núcleo
+        if task.policy_data is not None:
+            task.policy_data += target.min_vruntime - self.min_vruntime
+
+
+    def get_context(self):
+        return self.min_vruntime
+
+
+    def set_context(self, context):
+        self.min_vruntime = context
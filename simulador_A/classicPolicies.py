@@ -0,0 +1,346 @@
+from math import inf
+from process import Process
+from readyQueue import ReadyQueue, Aging
+from tcb import TCB, State
+from mutex import Synchronization
+from schedulingPolicy import SchedulingPolicy, register_policy
+
+# Algoritmos originais do simulador: FCFS (com quantum), SRTF, PRIOP e PRIOPEnv.
+# Os preemptivos não interrompem a tarefa em seção crítica.
+
+# Tipos de Tarefas: orientadas a processamento (CPU-bound tasks)
+def ready_key_fcfs(task: TCB) -> int:
+    return 0  # ordem de ingresso (posição na lista)
+
+
+def ready_key_srtf(task: TCB) -> int:
+    return task.duration - task.duration_current
+
+
+def ready_key_priop(task: TCB) -> int:
+    return -task.priority_init
+
+
+@register_policy
+class FCFSPolicy(SchedulingPolicy):
+    name = 'FCFS'   # cooperativo
+
+    def ready_key(self):
+        return ready_key_fcfs
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization) -> bool:
+        """Execução do algoritmo FCFS"""
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        # continua até a que a tarefa saia da seção crítica
+        if task_running and sync.holds(task_running):
+            #if task_running == State.RUNNING:
+            scheduler.remaining_quantum_time += 1
+            return False
+
+        task_running: TCB = queue.first_running()
+
+        # Se não tiver task rodando, tenta encontrar uma tarefa pronta
+        if not task_running:
+            scheduler.remaining_quantum_time = 1
+            task_ready: TCB = queue.first_ready()
+            if not task_ready: # se não tiver tarefa pronta verifica se existe alguma tarefa que está por vir
+                if not tasks:
+                    return True # Não existe mais tarefas para ser processada
+                
+                return False # aguarda a tarefa ficar pronta
+            
+            # coloca a tarefa para rodar
+            scheduler.dispatch(process, task_ready, sync)
+            
+            return False
+
+        if scheduler.remaining_quantum_time >= scheduler.quantum:
+            scheduler.remaining_quantum_time = 1
+
+            # pega a próxima tarefa ques está pronta e que não é a mesma que rodou na última execução
+            task_ready: TCB = queue.first_ready(exclude=task_running)
+
+            # A tarefa continua rodando, pois não tem nenhuma tarefa pronta disponível no momento
+            if not task_ready:
+                return False
+            
+            # troca a tarefa para a próxima até estourar o quantum
+            scheduler.preempt(task_running, State.READY, sync) # coloca a tarefa na fila de pronta
+            scheduler.dispatch(process, task_ready, sync)
+
+            return False
+        
+        scheduler.remaining_quantum_time += 1
+
+        return False
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        """Janela estável do algoritmo FCFS"""
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        if task_running and sync.holds(task_running):
+            return inf, self.step_increment
+
+        task_running: TCB = queue.first_running()
+
+        if not task_running:
+            if queue.has_ready():
+                return 0, None
+            return inf, self.step_one
+
+        # com outra tarefa pronta, troca assim que estourar o quantum
+        if queue.has_ready(exclude=task_running):
+            return max(0, scheduler.quantum - scheduler.remaining_quantum_time), self.step_increment
+
+        return inf, self.step_cycle
+
+
+class ClassicPreemptivePolicy(SchedulingPolicy):
+    """Janela estável comum a SRTF, PRIOP e PRIOPEnv"""
+
+    def steady_preemptive(self, process: Process, sync: Synchronization, best) -> tuple[int, callable]:
+        """Janela estável comum aos algoritmos preemptivos (SRTF, PRIOP e PRIOPEnv)"""
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        if task_running and task_running.finished():
+            return 0, None
+
+        if not queue.has_active():
+            return (inf, self.step_keep) if not task_running else (0, None)
+
+        if task_running and sync.holds(task_running):
+            return inf, self.step_increment
+
+        has_ready = queue.has_ready(exclude=task_running)
+
+        if task_running and scheduler.remaining_quantum_time >= scheduler.quantum:
+            return (0, None) if has_ready else (inf, self.step_increment)
+
+        # a tarefa atual precisa continuar sendo a escolhida
+        if not task_running or task_running.state != State.RUNNING or best() != task_running:
+            return 0, None
+
+        if has_ready:
+            return scheduler.quantum - scheduler.remaining_quantum_time, self.step_increment
+
+        return inf, self.step_increment
+
+
+@register_policy
+class SRTFPolicy(ClassicPreemptivePolicy):
+    name = 'SRTF'   # preemptivo
+
+    def ready_key(self):
+        return ready_key_srtf
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization) -> bool:
+        """Execução do algoritmo SRTF"""
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        if task_running and task_running.finished():
+            task_running.terminate(sync)
+            process.task_current = None
+            task_running = process.task_current
+            scheduler.remaining_quantum_time = 1
+
+        if not queue.has_active(): # significa que tem tarefa suspensa ou ainda falta carregar na memória
+            process.task_current = None
+            return False
+        
+        # se a tarefa atual pertence a seção crítica, deixa ela rodar até sair da seção
+        if task_running and sync.holds(task_running):
+            #if task_running == State.RUNNING:
+            scheduler.remaining_quantum_time += 1
+            return False
+
+        # faz a troca de tarefa se estourou o quantum
+        if task_running and scheduler.remaining_quantum_time >= scheduler.quantum:
+
+            # procura a tarefa pronta de menor tempo restante
+            task = queue.first_ready(exclude=task_running)
+
+            # a tarefa atual continua rodando, pois ainda não existe tarefas prontas
+            if not task:
+                scheduler.remaining_quantum_time += 1
+                return False
+
+        else:
+            # procura a tarefa de menor tempo de duração restante
+            # se tiver mais de uma tarefa, pega a primeira delas
+            task = queue.best()
+
+        if task == task_running:
+            scheduler.remaining_quantum_time += 1
+            return False
+        elif task_running:
+            scheduler.preempt(task_running, State.SUSPENDED, sync)
+        
+        scheduler.task_swap(process, task, sync)
+        scheduler.remaining_quantum_time = 1
+
+        return False
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        """Janela estável do algoritmo SRTF"""
+        # tempo restante no próximo tick (tarefas rodando avançam antes da decisão)
+        return self.steady_preemptive(process, sync, lambda: process.ready_queue.best(offset=-1))
+
+
+@register_policy
+class PRIOPPolicy(ClassicPreemptivePolicy):
+    name = 'PRIOP'  # preemptivo por prioridade
+
+    def ready_key(self):
+        return ready_key_priop
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization):
+        """Execução do algoritmo PRIOP"""
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        # Faz a verificação se a tarefa que está rodando ainda não terminou
+        if task_running and task_running.finished():
+            task_running.terminate(sync)
+            process.task_current = None
+            task_running = process.task_current
+            scheduler.remaining_quantum_time = 1
+
+        if not queue.has_active(): 
+            process.task_current = None
+            return False
+        
+        task_running: TCB = process.task_current
+
+        # se a tarefa estiver na seção crítica, continua até que ela saia da seção
+        if task_running and sync.holds(task_running):
+            #if task_running == State.RUNNING:
+            scheduler.remaining_quantum_time += 1
+            return False
+
+        if task_running and scheduler.remaining_quantum_time >= scheduler.quantum:
+
+            # tenta procurar outra tarefa pronta para executar
+            task = queue.first_ready(exclude=task_running)
+            
+            if not task:
+                # coloca a última tarefa para executar novamente, pois não encontrou nenhuma tarefa pronta
+                scheduler.remaining_quantum_time += 1
+                return False
+            
+            scheduler.preempt(task_running, State.SUSPENDED, sync)
+
+        else:
+            # se existir outra tarefa pronta e com prioridade maior que a tarefa atual, faz a troca
+            task = queue.best()
+
+        if task != task_running:
+            scheduler.remaining_quantum_time = 1
+            scheduler.task_swap(process, task, sync)
+        else:
+            scheduler.dispatch(process, task_running, sync)
+            scheduler.remaining_quantum_time += 1
+
+        return False
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        """Janela estável do algoritmo PRIOP"""
+        return self.steady_preemptive(process, sync, process.ready_queue.best)
+
+
+@register_policy
+class PRIOPEnvPolicy(ClassicPreemptivePolicy):
+    name = 'PRIOPEnv'   # preemptivo por prioridade com envelhecimento
+
+    def __init__(self, scheduler):
+        super().__init__(scheduler)
+        # envelhecimento preguiçoso: a fila ordena pela prioridade envelhecida sem percorrer as tarefas
+        self.aging = Aging(scheduler.alpha)
+
+
+    def ready_key(self):
+        return self.aging.key
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization):
+        """Executa o algoritmo PRIOEnv"""
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        # Faz a verificação se a tarefa que está rodando ainda não terminou
+        if task_running and task_running.finished():
+            task_running.terminate(sync)
+            process.task_current = None
+            task_running = process.task_current
+            scheduler.remaining_quantum_time = 1
+
+        if not queue.has_active():
+            process.task_current = None
+            return False
+
+        # se a tarefa estiver na seção crítica, continua até que ela saia da seção
+        if task_running and sync.holds(task_running):
+            scheduler.remaining_quantum_time += 1
+            return False
+
+        if task_running and scheduler.remaining_quantum_time >= scheduler.quantum:
+
+            # tenta procurar outra tarefa pronta para executar (a de maior prioridade envelhecida)
+            task = queue.first_ready(exclude=task_running)
+
+            if not task:
+                # coloca a última tarefa para executar novamente, pois não encontrou nenhuma tarefa pronta
+                scheduler.remaining_quantum_time += 1
+                return False
+
+            scheduler.preempt(task_running, State.SUSPENDED, sync)
+
+        else:
+            # se existir outra tarefa pronta e com prioridade maior que a tarefa atual, faz a troca
+            task = queue.best()
+
+        if task != task_running:
+            scheduler.remaining_quantum_time = 1
+
+            # incrementa a prioridade das tarefas prontas, pois o escalonador escolheu outra tarefa
+            self.aging.age()
+
+            scheduler.task_swap(process, task, sync)
+            # a escolhida não envelhece (o acumulado foi gravado ao sair da fila)
+            if process.task_current is task:
+                task.priority_current -= scheduler.alpha
+
+        else:
+            scheduler.dispatch(process, task_running, sync)
+            scheduler.remaining_quantum_time += 1
+
+        return False
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        """Janela estável do algoritmo PRIOPEnv"""
+        return self.steady_preemptive(process, sync, process.ready_queue.best)
+
+
+    def get_context(self):
+        return self.aging.epoch
+
+
+    def set_context(self, context):
+        self.aging.epoch = context
@@ -0,0 +1,36 @@
+from math import inf
+from readyQueue import ReadyQueue
+from tcb import TCB
+from schedulingPolicy import PreemptivePolicy, register_policy
+
+# Earliest Deadline First: roda a tarefa de prazo mais próximo, preemptando a
+# atual quando chega uma com prazo anterior (sem quantum). O arquivo de tarefas
+# não tem prazo: a prioridade da tarefa é lida como o prazo relativo ao ingresso.
+
+
+def deadline(task: TCB) -> int:
+    return task.start + task.priority_init
+
+
+@register_policy
+class EDFPolicy(PreemptivePolicy):
+    name = 'EDF'
+
+    def ready_key(self):
+        return deadline
+
+
+    def choose(self, queue: ReadyQueue, running: TCB) -> TCB:
+        entry = queue.peek()
+        # empate: a tarefa em execução continua
+        if running and (entry is None or entry[0] >= deadline(running)):
+            return running
+        return entry[3] if entry else None
+
+
+    def window(self, queue: ReadyQueue, running: TCB) -> tuple[int, callable]:
+        # os prazos não mudam: a escolha só muda com ingressos e tarefas que acordam
+        entry = queue.peek()
+        if entry is None or entry[0] >= deadline(running):
+            return inf, self.step_increment
+        return 0, None
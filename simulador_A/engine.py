@@ -0,0 +1,208 @@
+import heapq
+from tcb import TCB, State, EventType
+from process import Process
+from taskScheduler import TaskScheduler
+from smpScheduler import SMPScheduler
+from mutex import Synchronization
+from taskTable import TaskTable
+from timeline import Timeline, NullTimeline
+from metrics import StreamingMetrics
+
+# O motor por eventos discretos executa apenas os ticks em que algo pode mudar
+# (ingressos, estouros de quantum, términos, IO e pontos de ML/MU/SW/SS). Entre dois
+# eventos os contadores das tarefas e do escalonador são creditados em lote,
+# produzindo a mesma linha do tempo e as mesmas métricas do laço tick a tick.
+
+
+def timeline_state(task: TCB) -> str:
+    """Codificação do estado da tarefa utilizada na linha do tempo"""
+    return (
+        ' ' if task.state == State.READY else
+        task.color if task.state == State.RUNNING else
+        ' ' if task.state == State.SUSPENDED else
+        't' if task.start == State.TERMINATED else 'n'
+    )
+
+
+def save_timeline(timeline: Timeline, tasks: list[TCB]) -> Timeline:
+    """Salva os estados das tarefas"""
+    for task in tasks:
+        timeline.append(task.id, timeline_state(task))
+
+    return timeline
+
+
+def tick(time: int, process: Process, task_scheduler: TaskScheduler, sync: Synchronization, timeline: Timeline) -> bool:
+    """Executa um tick completo da simulação; retorna False quando não há mais tarefas"""
+    on_tick = sync.hooks.on_tick
+    if on_tick:
+        on_tick(time, 1)
+
+    # modo tabela: cria as tarefas que ingressam e descarta as terminadas
+    process.admit(time, timeline, sync)
+
+    tasks: list[TCB] = process.tasks
+
+    # inicializa o estado das tarefas
+    for task in tasks:
+        task.update_state(time, sync)
+
+    # se não tiver tarefa no process, finaliza o processo
+    if not process.has_task():
+        return False
+
+    # chama o escalonador para decidir qual tarefa deve rodar
+    task_scheduler.execute(process, sync)
+
+    save_timeline(timeline, tasks)
+
+    return True
+
+
+class EventEngine:
+    def __init__(self, process: Process, task_scheduler: TaskScheduler, sync: Synchronization):
+        self.process = process
+        self.task_scheduler = task_scheduler
+        self.sync = sync
+        self.events: list[tuple] = []
+        self.generation = 0
+        self.sequence = 0
+        self.ticks_executed = 0
+        self.ticks_skipped = 0
+
+
+    def push_event(self, time: int, event_type: EventType, task: TCB = None):
+        """Adiciona um evento na fila, marcado com a geração atual"""
+        self.sequence += 1
+        heapq.heappush(self.events, (time, self.sequence, self.generation, event_type, task))
+
+
+    def next_event(self, time: int) -> tuple[int, EventType]:
+        """Descarta eventos vencidos e retorna o próximo evento válido"""
+        while self.events:
+            event_time, _, generation, event_type, task = self.events[0]
+
+            # ingressos de TCBs já criados são fixos; os demais valem apenas para a geração atual
+            valid = (
+                task.state == State.NEW and event_time > time
+                if event_type == EventType.ARRIVAL and task is not None else
+                generation == self.generation
+            )
+
+            if valid:
+                return event_time, event_type
+
+            heapq.heappop(self.events)
+
+        return None
+
+
+    def schedule_events(self, time: int):
+        """Recalcula os eventos das tarefas ativas e do escalonador após um tick completo"""
+        self.generation += 1
+
+        for task in self.process.tasks:
+            if task.state in (State.RUNNING, State.SUSPENDED):
+                event = task.next_event(time, self.sync)
+                if event:
+                    self.push_event(event[0], event[1], task)
+
+        # modo tabela: a próxima tarefa ainda não criada
+        arrival = self.process.next_arrival()
+        if arrival is not None:
+            self.push_event(arrival, EventType.ARRIVAL)
+
+        steady = self.task_scheduler.steady_ticks(self.process, self.sync)
+        if steady != float('inf'):
+            self.push_event(time + steady + 1, EventType.QUANTUM)
+
+
+    def skip(self, ticks: int, timeline: Timeline):
+        """Credita em lote os ticks em que nada muda"""
+        tasks: list[TCB] = self.process.tasks
+
+        # o escalonador avalia a janela antes de as tarefas avançarem
+        self.task_scheduler.skip(self.process, self.sync, ticks)
+
+        for task in tasks:
+            timeline.append(task.id, timeline_state(task), ticks)
+            task.advance(ticks)
+
+        self.ticks_skipped += ticks
+
+
+    def run(self, timeline: Timeline) -> int:
+        """Executa a simulação completa e retorna o instante final"""
+        for task in self.process.tasks:
+            if task.state == State.NEW:
+                self.push_event(task.start, EventType.ARRIVAL, task)
+
+        time = 0
+
+        while tick(time, self.process, self.task_scheduler, self.sync, timeline):
+            self.ticks_executed += 1
+
+            self.schedule_events(time)
+            event = self.next_event(time)
+
+            # nenhuma tarefa ou decisão pode mudar: o laço tick a tick nunca terminaria
+            if not event:
+                raise RuntimeError(f'Simulação travada no instante {time}: nenhum evento pendente')
+
+            ticks = event[0] - time - 1
+            if ticks > 0:
+                on_tick = self.sync.hooks.on_tick
+                if on_tick:
+                    on_tick(time + 1, ticks)
+                self.skip(ticks, timeline)
+
+            time = event[0]
+
+        return time
+
+
+def simulate(algorithm: str, quantum: int, alpha: int, tasks: list[TCB] | TaskTable, events: bool = True, semaphores: dict[str, int] = None,
+             cores: int = 1, migration: str = 'FIXED', steal: str = 'NONE', listeners: list = None,
+             keep_timeline: bool = True, statistics: bool = True) -> tuple[Process, TaskScheduler, int, Timeline]:
+    """Executa a simulação completa sem interface gráfica e calcula as métricas ('semaphores': valor inicial de cada semáforo).
+    Com mais de um núcleo usa o SMPScheduler, com as políticas de migração e roubo de tarefas informadas.
+    'listeners' são inscritos nos ganchos de instrumentação (ex.: hooks.Counters, hooks.Trace).
+    Com statistics=True as estatísticas incrementais (metrics.py) ficam em task_scheduler.metrics;
+    com keep_timeline=False a linha do tempo é descartada."""
+    process = Process()
+
+    if isinstance(tasks, TaskTable):
+        process.load_table(tasks)
+        timeline = Timeline() if keep_timeline else NullTimeline()
+    else:
+        for task in tasks:
+            process.add_task(task)
+
+        process.sort_ready()
+        timeline = Timeline(task.id for task in tasks) if keep_timeline else NullTimeline()
+
+    if cores > 1:
+        task_scheduler = SMPScheduler(algorithm, quantum, alpha, cores, migration, steal)
+    else:
+        task_scheduler = TaskScheduler(algorithm, quantum, alpha)
+    sync = Synchronization(semaphores)
+    if statistics:
+        task_scheduler.metrics = StreamingMetrics(cores)
+        sync.hooks.subscribe(task_scheduler.metrics)
+    for listener in listeners or []:
+        sync.hooks.subscribe(listener)
+
+    if events:
+        time = EventEngine(process, task_scheduler, sync).run(timeline)
+    else:
+        time = 0
+        while tick(time, process, task_scheduler, sync, timeline):
+            time += 1
+
+    running = task_scheduler.running(process)
+    for task in running:
+        task.stop = time
+    timeline = process.finish(time, timeline, running)
+    task_scheduler.update_metrics(process)
+
+    return process, task_scheduler, time, timeline
@@ -0,0 +1,191 @@
+from matplotlib.ticker import MaxNLocator
+from tcb import TABLE_COLUMNS
+from timeline import Timeline
+from smpScheduler import LANE_PREFIX
+
+# Desenho incremental do gráfico de Gantt. Os artistas são criados uma única vez
+# e atualizados a cada passo:
+#
+# - uma coleção de retângulos por tarefa, estendida apenas nos trechos que
+#   mudaram (Timeline.take_changes)
+# - as células da tabela têm o texto trocado no lugar
+# - o eixo x cresce em blocos (dobrando) e os rótulos são escolhidos pelo
+#   MaxNLocator, então o custo de cada passo não cresce com o tempo simulado
+# - com backends interativos, apenas os artistas animados são redesenhados
+#   sobre o fundo salvo (blitting)
+
+STATE_COLORS = {
+    ' ': "lightgray",   # READY
+    'n': "white"        # NOT_STARTED / PRONTA
+}
+MIN_XLIM = 10
+
+
+class GanttRenderer:
+    def __init__(self, fig, ax_graph, ax_table):
+        self.fig = fig
+        self.ax_graph = ax_graph
+        self.ax_table = ax_table
+
+        self.bars: dict[str, tuple] = {}    # id -> (coleção, retângulos, cores)
+        self.table = None
+        self.table_ids: list[str] = []
+        self.task_ids: list[str] = []
+        self.rows: dict[str, int] = {}      # id -> linha no gráfico
+        self.xlim = 0
+        self.length = 0
+        self.background = None
+        self.full_redraw = True
+
+        ax_graph.set_xlabel("Tempo")
+        ax_graph.set_ylabel("Tarefas")
+        ax_graph.xaxis.set_major_locator(MaxNLocator(integer=True))
+        ax_table.axis('off')
+
+        # --- Legenda com o algoritmo e quantum ---
+        self.title = ax_graph.text(
+            0.5, 1.05, '',
+            ha='center', va='bottom', transform=ax_graph.transAxes,
+            fontsize=10, fontweight='bold', animated=True
+        )
+
+
+    def animated_artists(self) -> list:
+        artists = [self.title] + [collection for collection, _, _ in self.bars.values()]
+        if self.table is not None:
+            artists.append(self.table)
+        return artists
+
+
+    def set_tasks(self, task_ids: list[str]):
+        """Cria uma linha do gráfico por tarefa"""
+        for collection, _, _ in self.bars.values():
+            collection.remove()
+
+        self.bars = {}
+        self.task_ids = task_ids
+        self.rows = {task_id: row for row, task_id in enumerate(task_ids, start=1)}
+
+        for row, task_id in enumerate(task_ids, start=1):
+            collection = self.ax_graph.broken_barh([], (row - 0.4, 0.8))
+            collection.set_animated(True)
+            self.bars[task_id] = (collection, [], [])
+
+        self.ax_graph.set_yticks(range(1, len(task_ids) + 1))
+        # com vários núcleos as linhas são os núcleos (CPU0, CPU1, ...)
+        self.ax_graph.set_yticklabels([task_id if task_id.startswith(LANE_PREFIX) else f"P{task_id}" for task_id in task_ids])
+        self.ax_graph.set_ylim(0.4, len(task_ids) + 0.6)
+        self.full_redraw = True
+
+
+    def update_bars(self, timeline: Timeline):
+        """Atualiza apenas os retângulos dos trechos alterados"""
+        if list(timeline.keys()) != self.task_ids:
+            self.set_tasks(list(timeline.keys()))
+            timeline.watch()
+            changes = {task_id: 0 for task_id in self.task_ids}
+        else:
+            changes = timeline.take_changes()
+
+        for task_id, position in changes.items():
+            runs = timeline.runs[task_id]
+            collection, verts, colors = self.bars[task_id]
+            bottom, top = self.rows[task_id] - 0.4, self.rows[task_id] + 0.4
+
+            del verts[position:]
+            del colors[position:]
+
+            for start, end, state in runs[position:]:
+                verts.append([(start, bottom), (start, top), (end, top), (end, bottom)])
+                colors.append(STATE_COLORS.get(state, state))   # RUNNING: cor da tarefa
+
+            collection.set_verts(verts)
+            collection.set_facecolor(colors)
+
+        # o eixo x cresce dobrando, para não redesenhar o fundo a cada passo
+        self.length = length = timeline.length()
+        if length > self.xlim:
+            self.xlim = max(MIN_XLIM, 2 * self.xlim, length)
+            self.ax_graph.set_xlim(0, self.xlim)
+            self.full_redraw = True
+
+
+    def update_table(self, rows: list[list[str]], colors: list[str]):
+        """Troca o texto das células no lugar; a tabela só é recriada se as tarefas mudarem"""
+        ids = [row[0] for row in rows]
+
+        if self.table is None or ids != self.table_ids:
+            if self.table is not None:
+                self.table.remove()
+
+            cell_colors = []
+            for color in colors:
+                row_colors = ['white'] * len(TABLE_COLUMNS)
+                row_colors[1] = color
+                cell_colors.append(row_colors)
+
+            self.table = self.ax_table.table(
+                cellText=[list(row) for row in rows],
+                colLabels=TABLE_COLUMNS,
+                cellLoc='center',
+                colLoc='center',
+                loc='center',
+                cellColours=cell_colors
+            )
+            self.table.set_animated(True)
+            self.table_ids = ids
+            self.full_redraw = True
+            return
+
+        cells = self.table.get_celld()
+        for row, values in enumerate(rows, start=1):
+            for column, value in enumerate(values):
+                text = cells[(row, column)].get_text()
+                if text.get_text() != value:
+                    text.set_text(value)
+
+
+    def render(self, timeline: Timeline, rows: list[list[str]], colors: list[str], title: str, save: bool = False):
+        """Atualiza a interface gráfica do usuário (rows: linhas de TCB.table_row)"""
+        self.update_bars(timeline)
+        self.update_table(rows, colors)
+        self.title.set_text(title)
+        self.draw()
+
+        if save:
+            self.save()
+
+
+    def draw(self):
+        canvas = self.fig.canvas
+
+        if self.full_redraw or self.background is None or not canvas.supports_blit:
+            # redesenha o fundo (eixos, rótulos) e guarda para os próximos passos
+            canvas.draw()
+            if canvas.supports_blit:
+                self.background = canvas.copy_from_bbox(self.fig.bbox)
+            self.full_redraw = False
+        else:
+            canvas.restore_region(self.background)
+
+        for artist in self.animated_artists():
+            artist.axes.draw_artist(artist)
+
+        canvas.blit(self.fig.bbox)
+        canvas.flush_events()
+
+
+    def save(self, path: str = './plt.png', dpi: int = 300):
+        """Salva a figura completa (os artistas animados são incluídos temporariamente)"""
+        artists = self.animated_artists()
+        for artist in artists:
+            artist.set_animated(False)
+
+        # a imagem usa o eixo x justo, sem a folga do crescimento em blocos
+        self.ax_graph.set_xlim(0, max(1, self.length))
+        self.fig.savefig(path, dpi=dpi, bbox_inches="tight")
+        self.ax_graph.set_xlim(0, self.xlim)
+
+        for artist in artists:
+            artist.set_animated(True)
+        self.full_redraw = True
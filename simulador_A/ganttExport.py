@@ -0,0 +1,278 @@
+import argparse, json, sys
+from html import escape
+from smpScheduler import LANE_PREFIX
+
+# Exportação do gráfico de Gantt em SVG ou HTML, sem o matplotlib. O arquivo é
+# escrito em fluxo, tarefa por tarefa, a partir dos trechos da linha do tempo
+# (resultado do headless.py ou headless.build_result).
+#
+# Nível de detalhe: cada linha tem 'width' colunas de pixel. Trechos menores que
+# um pixel são agregados na coluna, que fica com o estado visível (pronta ou
+# executando) que ocupou mais ticks dela, e colunas vizinhas com o mesmo estado
+# viram um único retângulo. Assim cada tarefa gera no máximo 'width'
+# retângulos, qualquer que seja o tempo simulado.
+#
+# O SVG traz abaixo do gráfico a tabela de tarefas e as métricas; o HTML embute o
+# SVG e usa tabelas HTML.
+#
+# Exemplo:
+#   python headless.py tarefas.txt --gantt gantt.html
+#   python ganttExport.py resultado.json -o gantt.svg --width 2400
+
+DEFAULT_WIDTH = 1600    # pixels da área do gráfico
+ROW_HEIGHT = 16
+BAR_HEIGHT = 12
+AXIS_HEIGHT = 30
+TITLE_HEIGHT = 40
+TABLE_ROW_HEIGHT = 18
+CHAR_WIDTH = 7          # largura aproximada de um caractere (fonte de 11px)
+MARGIN = 10
+
+STATE_COLORS = {
+    ' ': "lightgray",   # READY
+    'n': None           # NOT_STARTED / TERMINADA: fundo
+}
+
+TASK_COLUMNS = ['ID', 'Cor', 'Início', 'Duração', 'Prioridade', 'Fim', 'Turnaround', 'Espera']
+
+
+def state_color(state: str) -> str:
+    """Cor do trecho (None para o fundo); RUNNING usa a cor da tarefa"""
+    if state in STATE_COLORS:
+        return STATE_COLORS[state]
+    if len(state) == 6 and all(char in '0123456789abcdefABCDEF' for char in state):
+        return '#' + state
+    return state
+
+
+def pixel_runs(runs, width: int, length: int) -> list[list]:
+    """Trechos [x0, x1, estado] em colunas de pixel inteiras ('length' ticks em 'width' pixels).
+    A coluna com vários trechos fica com o estado visível de maior duração nela; colunas vizinhas iguais são juntadas"""
+    pixels = []
+    column, weights = -1, {}
+
+    def emit(x0: int, x1: int, state: str):
+        if pixels and pixels[-1][1] == x0 and pixels[-1][2] == state:
+            pixels[-1][1] = x1
+        else:
+            pixels.append([x0, x1, state])
+
+    def flush():
+        if weights:
+            # o fundo só fica com a coluna se nada mais ocorreu nela (senão rajadas curtas sumiriam)
+            emit(column, column + 1, max(weights, key=lambda state: (STATE_COLORS.get(state, state) is not None, weights[state])))
+            weights.clear()
+
+    # posições em unidades inteiras (tick * width); a coluna c cobre [c * length, (c + 1) * length)
+    for start, end, state in runs:
+        if end <= start:
+            continue
+        left, right = start * width, end * width
+        first, last = left // length, right // length
+
+        if first != column:
+            flush()
+            column = first
+
+        if last == first:
+            # trecho dentro de uma única coluna
+            weights[state] = weights.get(state, 0) + right - left
+            continue
+
+        # fecha a coluna parcial da esquerda, emite as colunas inteiras e abre a da direita
+        weights[state] = weights.get(state, 0) + (first + 1) * length - left
+        flush()
+        if last > first + 1:
+            emit(first + 1, last, state)
+        column = last
+        if right > last * length:
+            weights[state] = right - last * length
+
+    flush()
+    return pixels
+
+
+def nice_step(length: int, width: int) -> int:
+    """Passo dos rótulos do eixo x: 1, 2 ou 5 vezes uma potência de 10, com ao menos ~80 pixels entre rótulos"""
+    magnitude = 1
+    while True:
+        for factor in (1, 2, 5):
+            step = factor * magnitude
+            if step * width >= 80 * length:
+                return step
+        magnitude *= 10
+
+
+def chart_rows(result: dict, lanes: bool) -> dict:
+    """Linhas do gráfico: as tarefas ou, com 'lanes' e vários núcleos, os núcleos"""
+    if lanes and result.get('core_timeline'):
+        return result['core_timeline']
+    return result['timeline']
+
+
+def row_label(row_id: str) -> str:
+    return row_id if row_id.startswith(LANE_PREFIX) else f'P{row_id}'
+
+
+def title_lines(result: dict) -> list[str]:
+    """Título e métricas (as do terminal em main.py, com duas casas decimais)"""
+    title = f"Algoritmo: {result['algorithm']} | Quantum: {result['quantum']} | ALPHA : {result['alpha']}"
+    if result.get('cores'):
+        title += f" | Núcleos: {len(result['cores'])}"
+    metrics = f"Tt = {result['turnaround_time']:.2f} s | Tw = {result['waiting_time']:.2f} s"
+    if result.get('response_time') is not None:
+        metrics += f" | Tr = {result['response_time']:.2f} s | Eficiência = {result['efficiency']:.1%}"
+    return [title, metrics]
+
+
+def task_values(task: dict) -> list[str]:
+    """Valores da linha da tarefa (mesma ordem de TASK_COLUMNS, sem a cor)"""
+    stop = task['stop']
+    return [
+        task['id'], str(task['start']), str(task['duration']), str(task['priority']),
+        '-' if stop is None else str(stop),
+        '-' if stop is None else str(stop - task['start']),
+        str(task['waiting_time'])
+    ]
+
+
+def write_svg(result: dict, output, width: int = DEFAULT_WIDTH, lanes: bool = False, standalone: bool = True, table: bool = True):
+    """Escreve o SVG do gráfico, das métricas e (com 'table') da tabela de tarefas"""
+    rows = chart_rows(result, lanes)
+    tasks = result['tasks'] if table else []
+    length = max(1, result['time'])
+    scale = width / length
+
+    label_width = CHAR_WIDTH * (max((len(row_label(row_id)) for row_id in rows), default=1) + 1)
+    chart_left = MARGIN + label_width
+    chart_top = MARGIN + TITLE_HEIGHT
+    chart_height = len(rows) * ROW_HEIGHT
+    table_top = chart_top + chart_height + AXIS_HEIGHT + MARGIN
+    total_width = max(chart_left + width + MARGIN, MARGIN * 2 + CHAR_WIDTH * 12 * len(TASK_COLUMNS))
+    total_height = table_top + ((len(tasks) + 1) * TABLE_ROW_HEIGHT + MARGIN if table else 0)
+
+    if standalone:
+        output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    output.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{total_width}" height="{total_height}" '
+                 f'viewBox="0 0 {total_width} {total_height}" font-family="sans-serif" font-size="11">\n')
+    output.write(f'<rect width="{total_width}" height="{total_height}" fill="white"/>\n')
+
+    title, metrics = title_lines(result)
+    output.write(f'<text x="{total_width / 2}" y="{MARGIN + 14}" text-anchor="middle" font-weight="bold" font-size="13">{escape(title)}</text>\n')
+    output.write(f'<text x="{total_width / 2}" y="{MARGIN + 32}" text-anchor="middle">{escape(metrics)}</text>\n')
+
+    # eixo x: linhas de grade e rótulos
+    step = nice_step(length, width)
+    output.write('<g stroke="#e0e0e0">\n')
+    for tick in range(0, length + 1, step):
+        x = chart_left + tick * scale
+        output.write(f'<line x1="{x:.1f}" y1="{chart_top}" x2="{x:.1f}" y2="{chart_top + chart_height}"/>\n')
+    output.write('</g>\n<g text-anchor="middle">\n')
+    for tick in range(0, length + 1, step):
+        output.write(f'<text x="{chart_left + tick * scale:.1f}" y="{chart_top + chart_height + 14}">{tick}</text>\n')
+    output.write(f'</g>\n<text x="{chart_left + width / 2}" y="{chart_top + chart_height + AXIS_HEIGHT - 2}" text-anchor="middle">Tempo</text>\n')
+
+    # uma linha por tarefa, com os trechos já reduzidos à resolução
+    offset = (ROW_HEIGHT - BAR_HEIGHT) / 2
+    for number, (row_id, runs) in enumerate(rows.items()):
+        y = chart_top + number * ROW_HEIGHT
+        output.write(f'<g><title>{escape(row_label(row_id))}</title>'
+                     f'<text x="{chart_left - 4}" y="{y + ROW_HEIGHT - 4}" text-anchor="end">{escape(row_label(row_id))}</text>\n')
+        for x0, x1, state in pixel_runs(runs, width, length):
+            color = state_color(state)
+            if color is not None:
+                output.write(f'<rect x="{chart_left + x0}" y="{y + offset}" width="{x1 - x0}" height="{BAR_HEIGHT}" fill="{escape(color)}"/>\n')
+        output.write('</g>\n')
+    output.write(f'<rect x="{chart_left}" y="{chart_top}" width="{width}" height="{chart_height}" fill="none" stroke="black"/>\n')
+
+    # tabela de tarefas
+    if table:
+        column_width = (total_width - 2 * MARGIN) / len(TASK_COLUMNS)
+        output.write('<g text-anchor="middle">\n')
+        y = table_top + TABLE_ROW_HEIGHT - 5
+        output.write(''.join(f'<text x="{MARGIN + (index + 0.5) * column_width:.1f}" y="{y}" font-weight="bold">{escape(name)}</text>'
+                             for index, name in enumerate(TASK_COLUMNS)) + '\n')
+        for number, task in enumerate(tasks, start=1):
+            y = table_top + number * TABLE_ROW_HEIGHT
+            values = task_values(task)
+            cells = [f'<rect x="{MARGIN + column_width + 4:.1f}" y="{y + 3}" width="{column_width - 8:.1f}" height="{TABLE_ROW_HEIGHT - 6}" '
+                     f'fill="{escape(state_color(task["color"]) or "white")}"/>']
+            for index, value in enumerate(values[:1] + [None] + values[1:]):
+                if value is not None:
+                    cells.append(f'<text x="{MARGIN + (index + 0.5) * column_width:.1f}" y="{y + TABLE_ROW_HEIGHT - 5}">{escape(value)}</text>')
+            output.write(''.join(cells) + '\n')
+        output.write('</g>\n')
+    output.write('</svg>\n')
+
+
+def write_html(result: dict, output, width: int = DEFAULT_WIDTH, lanes: bool = False):
+    """Página com o SVG do gráfico e tabelas HTML com as métricas e as tarefas"""
+    title, metrics = title_lines(result)
+    output.write('<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+                 f'<title>{escape(title)}</title>\n<style>\n'
+                 'body { font-family: sans-serif; margin: 16px; }\n'
+                 '.chart { overflow-x: auto; }\n'
+                 'table { border-collapse: collapse; margin-top: 12px; }\n'
+                 'th, td { border: 1px solid #ccc; padding: 2px 8px; text-align: center; font-size: 12px; }\n'
+                 '</style>\n</head>\n<body>\n'
+                 f'<h3>{escape(title)}</h3>\n<p>{escape(metrics)}</p>\n<div class="chart">\n')
+
+    # o SVG vai sem a tabela de tarefas (as tabelas HTML abaixo a substituem)
+    write_svg(result, output, width, lanes, standalone=False, table=False)
+    output.write('</div>\n')
+
+    statistics = result.get('statistics')
+    if statistics:
+        output.write('<table>\n<tr><th>Métrica</th><th>média</th><th>desvio</th><th>mín</th><th>p50</th><th>p95</th><th>p99</th><th>máx</th></tr>\n')
+        for name in ('turnaround_time', 'waiting_time', 'response_time'):
+            summary = statistics.get(name)
+            if not summary or not summary['count']:
+                continue
+            values = [summary[key] for key in ('mean', 'std', 'min', 'p50', 'p95', 'p99', 'max')]
+            output.write(f'<tr><td>{name}</td>' + ''.join(f'<td>{value:.2f}</td>' for value in values) + '</tr>\n')
+        output.write(f'<tr><td>utilization</td><td colspan="7">{statistics["utilization"]:.1%}</td></tr>\n'
+                     f'<tr><td>throughput</td><td colspan="7">{statistics["throughput"]:.4f}</td></tr>\n</table>\n')
+
+    output.write('<table>\n<tr>' + ''.join(f'<th>{escape(name)}</th>' for name in TASK_COLUMNS) + '</tr>\n')
+    for task in result['tasks']:
+        values = task_values(task)
+        color = escape(state_color(task['color']) or 'white')
+        output.write(f'<tr><td>{escape(values[0])}</td><td style="background: {color}"></td>'
+                     + ''.join(f'<td>{escape(value)}</td>' for value in values[1:]) + '</tr>\n')
+    output.write('</table>\n</body>\n</html>\n')
+
+
+def write_gantt(result: dict, path: str, width: int = DEFAULT_WIDTH, lanes: bool = False):
+    """Grava em SVG ou, se o arquivo terminar em .html/.htm, em HTML"""
+    if not result.get('timeline'):
+        raise ValueError('o resultado não tem a linha do tempo')
+    write = write_html if path.lower().endswith(('.html', '.htm')) else write_svg
+    with open(path, 'w', encoding='utf-8') as output:
+        write(result, output, width, lanes)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Exporta o gráfico de Gantt de um resultado do headless.py em SVG ou HTML')
+    parser.add_argument('input', help='resultado em json do headless.py (com a linha do tempo)')
+    parser.add_argument('-o', '--output', required=True, help='arquivo .svg ou .html')
+    parser.add_argument('-w', '--width', type=int, default=DEFAULT_WIDTH, help=f'largura do gráfico em pixels (padrão: {DEFAULT_WIDTH})')
+    parser.add_argument('--lanes', action='store_true', help='com vários núcleos, uma linha por núcleo em vez de por tarefa')
+    args = parser.parse_args(argv)
+
+    if args.width < 1:
+        print('ERRO | a largura deve ser ao menos 1 pixel', file=sys.stderr)
+        return 1
+
+    try:
+        with open(args.input, 'r', encoding='utf-8') as file:
+            result = json.load(file)
+        write_gantt(result, args.output, args.width, args.lanes)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {error}', file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
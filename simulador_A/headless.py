@@ -0,0 +1,234 @@
+import argparse, csv, json, sys
+from taskFile import stream_file
+from workloadFile import is_binary, load_workload
+from schedulingPolicy import policy_names
+from engine import simulate
+from smpScheduler import SMPScheduler, MigrationPolicy, StealPolicy
+from taskTable import TaskTable, NO_STOP
+from timeline import Timeline
+from hooks import Counters, Trace
+from traceFile import TraceRecorder
+from resultCache import ResultCache
+from ganttExport import write_gantt
+
+# Execução sem interface gráfica: não importa o matplotlib, então pode ser
+# chamada em lote a partir de scripts.
+#
+# Exemplo:
+#   python headless.py tarefas.txt --algorithm SRTF --quantum 2 --format csv -o saida.csv
+#   python headless.py tarefas.txt --gantt gantt.html
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Simulador de escalonamento sem interface gráfica')
+    parser.add_argument('file', help='arquivo .txt com o cabeçalho (algoritmo;quantum;alpha) e as tarefas, ou arquivo binário (workloadFile.py)')
+    parser.add_argument('-a', '--algorithm', type=str.upper, choices=policy_names(), help='substitui o algoritmo do arquivo')
+    parser.add_argument('-q', '--quantum', type=int, help='substitui o quantum do arquivo')
+    parser.add_argument('--alpha', type=int, help='substitui o alpha do arquivo')
+    parser.add_argument('-f', '--format', choices=['json', 'csv'], default='json', help='formato da saída (padrão: json; as métricas por núcleo só saem no json)')
+    parser.add_argument('-o', '--output', help='arquivo de saída (padrão: saída padrão)')
+    parser.add_argument('--ticks', action='store_true', help='usa o laço tick a tick em vez do motor por eventos')
+    parser.add_argument('--compact', action='store_true', help='executa sobre a tabela compacta de tarefas (TaskTable)')
+    parser.add_argument('--semaphore', type=parse_semaphore, action='append', default=[], metavar='ID=N',
+                        help='valor inicial do semáforo ID (eventos SWID/SSID; padrão: 1), pode ser repetido')
+    parser.add_argument('-c', '--cores', type=int, default=1, help='quantidade de núcleos (padrão: 1)')
+    parser.add_argument('--migration', type=str.upper, choices=[item.name for item in MigrationPolicy], default='FIXED',
+                        help='com vários núcleos: FIXED mantém a tarefa no núcleo, WAKE migra ao acordar (padrão: FIXED)')
+    parser.add_argument('--steal', type=str.upper, choices=[item.name for item in StealPolicy], default='NONE',
+                        help='com vários núcleos: IDLE deixa núcleos ociosos roubarem tarefas prontas (padrão: NONE)')
+    parser.add_argument('--counters', action='store_true', help='inclui no json os contadores (trocas de contexto, preempções, disputa por locks, tempo de cada executor)')
+    parser.add_argument('--trace', action='store_true', help='escreve as mensagens do mutex e dos semáforos na saída de erro')
+    parser.add_argument('--record', metavar='ARQUIVO', help='grava o rastro binário da simulação (analisado com traceFile.py)')
+    parser.add_argument('--gantt', metavar='ARQUIVO', help='grava o gráfico de Gantt em SVG (ou HTML, se ARQUIVO terminar em .html), sem o matplotlib')
+    parser.add_argument('--no-timeline', dest='timeline', action='store_false', help='descarta a linha do tempo (apenas métricas; o csv fica sem a coluna preenchida)')
+    parser.add_argument('--cache', action='store_true', help='consulta e grava o cache de resultados (resultCache.py); sem a opção sempre simula')
+    parser.add_argument('--cache-dir', help='diretório do cache de resultados, implica --cache (padrão: $ESCALONADOR_CACHE ou ~/.cache/escalonador)')
+    return parser
+
+
+def parse_semaphore(value: str) -> tuple[str, int]:
+    """'buffer=3' -> ('buffer', 3)"""
+    id, separator, count = value.partition('=')
+    if not separator or int(count) < 0:
+        raise argparse.ArgumentTypeError(f'semáforo inválido: {value} (use ID=N, com N >= 0)')
+    return id, int(count)
+
+
+def task_rows(process) -> list[dict]:
+    """Resultado por tarefa, na ordem de ingresso"""
+    if process.table is None:
+        return [
+            {
+                'id': task.id,
+                'color': task.color,
+                'start': task.start,
+                'stop': task.stop,
+                'duration': task.duration,
+                'priority': task.priority_init,
+                'waiting_time': task.total_waiting_time
+            }
+            for task in process.tasks
+        ]
+
+    table: TaskTable = process.table
+    return [
+        {
+            'id': table.ids[row],
+            'color': table.colors[row],
+            'start': table.start[row],
+            'stop': table.stop[row] if table.stop[row] != NO_STOP else None,
+            'duration': table.duration[row],
+            'priority': table.priority_init[row],
+            'waiting_time': table.total_waiting_time[row]
+        }
+        for row in process.order
+    ]
+
+
+def build_result(algorithm: str, quantum: int, alpha: int, process, task_scheduler, time: int, timeline: Timeline) -> dict:
+    """Métricas, tarefas e linha do tempo da simulação"""
+    return {
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'alpha': alpha,
+        'time': time,
+        'turnaround_time': task_scheduler.turnaround_time,
+        'waiting_time': task_scheduler.waiting_time,
+        'response_time': task_scheduler.response_time,
+        'efficiency': task_scheduler.efficiency,
+        'statistics': task_scheduler.metrics.summary() if task_scheduler.metrics else None,
+        'tasks': task_rows(process),
+        'timeline': dict(timeline.items()),
+        **core_result(task_scheduler)
+    }
+
+
+def core_result(task_scheduler) -> dict:
+    """Com vários núcleos: métricas e linha do tempo de cada núcleo"""
+    if not isinstance(task_scheduler, SMPScheduler):
+        return {}
+    return {
+        'cores': task_scheduler.core_metrics(),
+        'core_timeline': dict(task_scheduler.lanes.items())
+    }
+
+
+def write_json(result: dict, output):
+    json.dump(result, output, ensure_ascii=False)
+    output.write('\n')
+
+
+def write_csv(result: dict, output):
+    """Uma linha por tarefa; a linha do tempo é a lista de trechos 'início-fim:estado' separados por '|'"""
+    writer = csv.writer(output)
+    writer.writerow(['id', 'color', 'start', 'stop', 'duration', 'priority', 'turnaround_time', 'waiting_time', 'timeline'])
+
+    for task in result['tasks']:
+        writer.writerow([
+            task['id'],
+            task['color'],
+            task['start'],
+            task['stop'],
+            task['duration'],
+            task['priority'],
+            task['stop'] - task['start'] if task['stop'] is not None else '',
+            task['waiting_time'],
+            '|'.join(f'{start}-{end}:{state}' for start, end, state in result['timeline'].get(task['id'], ()))
+        ])
+
+    writer.writerow(['media', '', '', result['time'], '', '', result['turnaround_time'], result['waiting_time'], ''])
+
+
+def run_simulation(args, algorithm: str, quantum: int, alpha: int, tasks, listeners: list) -> dict:
+    process, task_scheduler, time, timeline = simulate(algorithm, quantum, alpha, tasks, events=not args.ticks, semaphores=dict(args.semaphore),
+                                                       cores=args.cores, migration=args.migration, steal=args.steal, listeners=listeners,
+                                                       keep_timeline=args.timeline)
+    return build_result(algorithm, quantum, alpha, process, task_scheduler, time, timeline)
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.cores < 1:
+        print('ERRO | a quantidade de núcleos deve ser ao menos 1', file=sys.stderr)
+        return 1
+    if args.gantt and not args.timeline:
+        print('ERRO | --gantt precisa da linha do tempo (não use --no-timeline)', file=sys.stderr)
+        return 1
+
+    try:
+        # arquivos binários (e --compact) usam a tabela compacta direto
+        if args.compact or is_binary(args.file):
+            algorithm, quantum, alpha, tasks = load_workload(args.file)
+        else:
+            algorithm, quantum, alpha, tasks = stream_file(args.file)
+            tasks = list(tasks)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {args.file}: {error}', file=sys.stderr)
+        return 1
+
+    algorithm = args.algorithm or algorithm
+    if algorithm.upper() not in policy_names():
+        print(f'ERRO | {args.file}: algoritmo desconhecido: {algorithm}', file=sys.stderr)
+        return 1
+    quantum = args.quantum if args.quantum is not None else quantum
+    alpha = args.alpha if args.alpha is not None else alpha
+
+    # contadores, mensagens e rastro são efeitos da execução: não vêm do cache
+    use_cache = args.cache or args.cache_dir is not None
+    cache = ResultCache(args.cache_dir) if use_cache and not (args.counters or args.trace or args.record) else None
+    if cache:
+        key = cache.key(tasks, algorithm, quantum, alpha, args.cores, args.migration, args.steal, dict(args.semaphore), args.timeline)
+        result = cache.get(key)
+        if result is None:
+            try:
+                result = run_simulation(args, algorithm, quantum, alpha, tasks, [])
+            except RuntimeError as error:
+                print(f'ERRO | {args.file}: {error}', file=sys.stderr)
+                return 1
+            cache.put(key, result)
+    else:
+        counters = Counters() if args.counters else None
+        # as mensagens do mutex e dos semáforos vão para stderr para não misturar com a saída
+        listeners = [listener for listener in (counters, Trace(sys.stderr) if args.trace else None) if listener]
+
+        try:
+            recorder = TraceRecorder(args.record) if args.record else None
+        except OSError as error:
+            print(f'ERRO | {args.record}: {error}', file=sys.stderr)
+            return 1
+        if recorder:
+            listeners.append(recorder)
+
+        try:
+            result = run_simulation(args, algorithm, quantum, alpha, tasks, listeners)
+        except RuntimeError as error:
+            # tarefas que se esperam mutuamente: o motor por eventos detecta e interrompe
+            print(f'ERRO | {args.file}: {error}', file=sys.stderr)
+            return 1
+        finally:
+            if recorder:
+                recorder.close()
+        if counters:
+            result['counters'] = counters.metrics()
+
+    if args.gantt:
+        try:
+            write_gantt(result, args.gantt)
+        except (OSError, ValueError) as error:
+            print(f'ERRO | {args.gantt}: {error}', file=sys.stderr)
+            return 1
+
+    write = write_json if args.format == 'json' else write_csv
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as output:
+            write(result, output)
+    else:
+        write(result, sys.stdout)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+from bisect import bisect_right
+from tcb import TCB
+from process import Process
+from taskScheduler import TaskScheduler
+from smpScheduler import SMPScheduler
+from mutex import Synchronization
+from engine import tick
+from timeline import Timeline
+from taskFile import stream_file
+
+CHECKPOINT_INTERVAL = 64
+
+# Histórico do modo passo-a-passo. Em vez de copiar todo o processo, os mutexes e a
+# linha do tempo a cada tick, guarda apenas o que mudou em cada tick (log de
+# desfazer) e, a cada CHECKPOINT_INTERVAL ticks, um contexto completo.
+#
+# - rewind: desfaz o último tick aplicando a sua diferença
+# - seek: restaura o checkpoint mais próximo (busca binária) e simula até o instante
+
+
+class History:
+    def __init__(self, process: Process, task_scheduler: TaskScheduler, sync: Synchronization, timeline: Timeline, checkpoint_interval: int = CHECKPOINT_INTERVAL):
+        self.process = process
+        self.task_scheduler = task_scheduler
+        self.sync = sync
+        self.timeline = timeline
+        self.checkpoint_interval = checkpoint_interval
+        self.finished = False
+
+        # no modo tabela as tarefas entram e saem de process.tasks durante a simulação
+        if process.table is not None:
+            raise ValueError('O histórico requer o processo com a lista completa de tarefas')
+
+        # com vários núcleos as tarefas migram entre as listas dos núcleos
+        if isinstance(task_scheduler, SMPScheduler):
+            raise ValueError('O histórico requer o escalonador de um núcleo')
+
+        # garante a posição (task.index) de cada tarefa
+        task_scheduler.attach(process)
+
+        self.shadow: list[tuple] = [task.get_context() for task in process.tasks]
+        self.sync_shadow: tuple = self.sync.get_context()
+        self.deltas: list[tuple] = []
+        self.checkpoints: list[tuple] = []
+        self.checkpoint_ticks: list[int] = []
+        self.save_checkpoint()
+
+
+    @property
+    def ticks(self) -> int:
+        """Quantidade de ticks executados"""
+        return len(self.deltas)
+
+
+    def get_current(self) -> int:
+        task: TCB = self.process.task_current
+        return task.index if task else None
+
+
+    def set_current(self, index: int):
+        self.process.task_current = self.process.tasks[index] if index is not None else None
+
+
+    def truncate_timeline(self, length: int):
+        self.timeline.truncate(length)
+
+
+    def save_checkpoint(self):
+        """Contexto completo após o tick atual"""
+        self.checkpoint_ticks.append(self.ticks)
+        self.checkpoints.append((
+            tuple(self.shadow),
+            self.sync_shadow,
+            self.get_current(),
+            self.task_scheduler.get_context()
+        ))
+
+
+    def record(self, current: int, scheduler_context: tuple):
+        """Guarda o que mudou no último tick (valores anteriores)"""
+        changed = []
+        for index, task in enumerate(self.process.tasks):
+            context = task.get_context()
+            if context != self.shadow[index]:
+                changed.append((index, self.shadow[index]))
+                self.shadow[index] = context
+
+        sync_context = self.sync.get_context()
+        sync_changed = self.sync_shadow if sync_context != self.sync_shadow else None
+        self.sync_shadow = sync_context
+
+        self.deltas.append((changed, sync_changed, current, scheduler_context))
+
+        if self.ticks % self.checkpoint_interval == 0:
+            self.save_checkpoint()
+
+
+    def advance(self, time: int) -> bool:
+        """Executa o tick 'time' e registra a diferença; retorna False quando a simulação termina"""
+        current = self.get_current()
+        scheduler_context = self.task_scheduler.get_context()
+
+        if not tick(time, self.process, self.task_scheduler, self.sync, self.timeline):
+            self.finished = True
+            return False
+
+        self.record(current, scheduler_context)
+        return True
+
+
+    def rewind(self) -> bool:
+        """Desfaz o último tick; retorna False se não houver tick para desfazer"""
+        if not self.deltas:
+            return False
+
+        changed, sync_context, current, scheduler_context = self.deltas.pop()
+        tasks: list[TCB] = self.process.tasks
+
+        # o algoritmo antes das tarefas: a fila de prontas recalcula as chaves ao restaurá-las
+        self.task_scheduler.set_context(scheduler_context)
+
+        for index, context in changed:
+            tasks[index].set_context(context)
+            self.shadow[index] = context
+
+        if sync_context is not None:
+            self.sync.set_context(sync_context, self.process.tasks)
+            self.sync_shadow = sync_context
+
+        self.set_current(current)
+        self.truncate_timeline(self.ticks)
+        self.finished = False
+
+        if self.checkpoint_ticks[-1] > self.ticks:
+            self.checkpoint_ticks.pop()
+            self.checkpoints.pop()
+
+        return True
+
+
+    def restore_checkpoint(self, ticks: int):
+        """Volta para o checkpoint mais próximo antes de 'ticks' ticks executados"""
+        position = bisect_right(self.checkpoint_ticks, ticks) - 1
+        checkpoint_ticks = self.checkpoint_ticks[position]
+        contexts, sync_context, current, scheduler_context = self.checkpoints[position]
+
+        self.task_scheduler.set_context(scheduler_context)
+
+        for task, context in zip(self.process.tasks, contexts):
+            task.set_context(context)
+
+        self.shadow = list(contexts)
+        self.sync.set_context(sync_context, self.process.tasks)
+        self.sync_shadow = sync_context
+        self.set_current(current)
+
+        del self.deltas[checkpoint_ticks:]
+        del self.checkpoint_ticks[position + 1:]
+        del self.checkpoints[position + 1:]
+        self.truncate_timeline(checkpoint_ticks)
+        self.finished = False
+
+
+    def seek(self, time: int) -> int:
+        """Vai até o estado após o tick 'time' e retorna o instante alcançado"""
+        ticks = max(0, time + 1)
+
+        if ticks < self.ticks:
+            self.restore_checkpoint(ticks)
+
+        while self.ticks < ticks:
+            if not self.advance(self.ticks):
+                # a simulação terminou antes do instante pedido
+                return self.ticks
+
+        return self.ticks - 1
+
+
+def load_history(path: str, algorithm: str = None, quantum: int = None, alpha: int = None) -> tuple[History, list[TCB]]:
+    """Modo passo-a-passo para a carga do arquivo .txt (os argumentos informados substituem o cabeçalho); retorna o histórico e as tarefas"""
+    file_algorithm, file_quantum, file_alpha, tasks = stream_file(path)
+    tasks = list(tasks)
+
+    process = Process()
+    for task in tasks:
+        process.add_task(task)
+    process.sort_ready()
+
+    task_scheduler = TaskScheduler(algorithm or file_algorithm, quantum if quantum is not None else file_quantum,
+                                   alpha if alpha is not None else file_alpha)
+    timeline = Timeline(task.id for task in tasks)
+    return History(process, task_scheduler, Synchronization(), timeline), tasks
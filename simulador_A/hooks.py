@@ -0,0 +1,181 @@
+import sys
+
+# Ganchos de instrumentação da simulação. O registro (Hooks) fica em
+# Synchronization.hooks, que acompanha a tarefa, o escalonador e o tick em
+# todos os pontos da simulação. Cada gancho é um atributo que vale None
+# enquanto ninguém se inscreve, então o custo sem ganchos é um teste por ponto:
+#
+#   on_tick(time, ticks)            início de um tick (ou de 'ticks' ticks saltados pelo motor por eventos)
+#   on_arrive(task)                 a tarefa ingressa (NEW -> READY)
+#   on_dispatch(task)               a tarefa passa a ocupar a CPU por decisão do escalonador
+#   on_preempt(task)                o escalonador tira da CPU a tarefa que ainda não terminou
+#   on_block(task, primitive)       a tarefa em execução é suspensa (IO: primitive None) ou entra na fila de espera do mutex/semáforo
+#   on_wake(task, primitive)        a tarefa suspensa volta a ficar pronta (primitive: quem a acordou, ou None)
+#   on_lock(task, primitive)        mutex adquirido ou passagem pelo semáforo
+#   on_unlock(task, primitive)      mutex liberado ou sinal no semáforo
+#   on_terminate(task)              a tarefa termina
+#   on_execute(name, seconds)       tempo real gasto em cada chamada de __execute_*
+#
+# Os ganchos acontecem dentro do tick aberto pelo último on_tick.
+#
+# Exemplo:
+#   counters = Counters()
+#   sync = Synchronization()
+#   sync.hooks.subscribe(counters)
+#   ...
+#   counters.metrics()
+
+HOOKS = ('on_tick', 'on_arrive', 'on_dispatch', 'on_preempt', 'on_block', 'on_wake', 'on_lock', 'on_unlock', 'on_terminate', 'on_execute')
+
+
+def fan_out(callbacks: tuple):
+    """Gancho que chama todos os inscritos, na ordem de inscrição"""
+    def call(*args):
+        for callback in callbacks:
+            callback(*args)
+    return call
+
+
+class Hooks:
+    def __init__(self):
+        self.callbacks: dict[str, list] = {name: [] for name in HOOKS}
+        for name in HOOKS:
+            setattr(self, name, None)
+
+
+    def register(self, name: str, callback):
+        """Inscreve 'callback' no gancho 'name'"""
+        if name not in self.callbacks:
+            raise ValueError(f'gancho desconhecido: {name}')
+        self.callbacks[name].append(callback)
+        self.refresh(name)
+
+
+    def unregister(self, name: str, callback):
+        self.callbacks[name].remove(callback)
+        self.refresh(name)
+
+
+    def subscribe(self, listener):
+        """Inscreve os métodos on_* do objeto (apenas os que ele define)"""
+        for name in HOOKS:
+            callback = getattr(listener, name, None)
+            if callback is not None:
+                self.register(name, callback)
+
+
+    def refresh(self, name: str):
+        """Atualiza o atributo do gancho: None, o único inscrito ou um que chama todos"""
+        callbacks = self.callbacks[name]
+        if not callbacks:
+            setattr(self, name, None)
+        elif len(callbacks) == 1:
+            setattr(self, name, callbacks[0])
+        else:
+            setattr(self, name, fan_out(tuple(callbacks)))
+
+
+class Counters:
+    """Contadores prontos: trocas de contexto, preempções, disputa por locks e tempo de cada executor"""
+
+    def __init__(self):
+        self.ticks = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.blocks = 0
+        self.wakes = 0
+        self.terminations = 0
+        self.locks = 0
+        self.unlocks = 0
+        self.contention = 0                             # bloqueios em um mutex/semáforo ocupado
+        self.contention_by_lock: dict[str, int] = {}    # 'mutex:id' / 'semaphore:id' -> bloqueios
+        self.executor_calls: dict[str, int] = {}
+        self.executor_time: dict[str, float] = {}
+
+
+    def on_tick(self, time: int, ticks: int):
+        self.ticks += ticks
+
+
+    def on_dispatch(self, task):
+        self.context_switches += 1
+
+
+    def on_preempt(self, task):
+        self.preemptions += 1
+
+
+    def on_block(self, task, primitive):
+        self.blocks += 1
+        if primitive is not None:
+            self.contention += 1
+            key = f'{primitive.kind}:{primitive.id}'
+            self.contention_by_lock[key] = self.contention_by_lock.get(key, 0) + 1
+
+
+    def on_wake(self, task, primitive):
+        self.wakes += 1
+
+
+    def on_lock(self, task, primitive):
+        self.locks += 1
+
+
+    def on_unlock(self, task, primitive):
+        self.unlocks += 1
+
+
+    def on_terminate(self, task):
+        self.terminations += 1
+
+
+    def on_execute(self, name: str, seconds: float):
+        self.executor_calls[name] = self.executor_calls.get(name, 0) + 1
+        self.executor_time[name] = self.executor_time.get(name, 0.0) + seconds
+
+
+    def metrics(self) -> dict:
+        return {
+            'ticks': self.ticks,
+            'context_switches': self.context_switches,
+            'preemptions': self.preemptions,
+            'blocks': self.blocks,
+            'wakes': self.wakes,
+            'terminations': self.terminations,
+            'locks': self.locks,
+            'unlocks': self.unlocks,
+            'contention': self.contention,
+            'contention_by_lock': dict(self.contention_by_lock),
+            'executor_calls': dict(self.executor_calls),
+            'executor_time': {name: round(seconds, 6) for name, seconds in self.executor_time.items()}
+        }
+
+
+# Mensagens do Trace por tipo de primitiva
+LOCK_MESSAGES = {'mutex': 'adquiriu o mutex', 'semaphore': 'passou pelo semáforo'}
+UNLOCK_MESSAGES = {'mutex': 'liberou o mutex', 'semaphore': 'sinalizou o semáforo'}
+WAKE_MESSAGES = {'mutex': 'acordou (mutex disponível)', 'semaphore': 'acordou (semáforo disponível)'}
+
+
+class Trace:
+    """Mensagens do mutex e dos semáforos (o que TCB.update_events imprimia)"""
+
+    def __init__(self, output=None):
+        self.output = output
+
+
+    def write(self, message: str):
+        print(message, file=self.output or sys.stdout)
+
+
+    def on_lock(self, task, primitive):
+        self.write(f"[t] {task.id} {LOCK_MESSAGES[primitive.kind]} {primitive.id}")
+
+
+    def on_unlock(self, task, primitive):
+        self.write(f"[t] {task.id} {UNLOCK_MESSAGES[primitive.kind]} {primitive.id}")
+
+
+    def on_wake(self, task, primitive):
+        if primitive is not None:
+            self.write(f"[t] {task.id} {WAKE_MESSAGES[primitive.kind]}")
@@ -0,0 +1,367 @@
+import argparse, asyncio, base64, hashlib, json, struct, sys
+from schedulingPolicy import policy_names
+from timeline import Timeline
+from history import History, load_history
+from renderWorker import Frame
+
+# Simulação ao vivo no navegador, sem matplotlib e sem input(). Um servidor
+# HTTP/WebSocket local (asyncio, só biblioteca padrão) executa o modo
+# passo-a-passo (History) e envia a cada passo apenas os trechos da linha do
+# tempo que mudaram. Os comandos do navegador usam o mesmo histórico do main.py:
+#
+#   {"command": "step"}             avança um tick
+#   {"command": "back"}             desfaz o último tick (History.rewind)
+#   {"command": "seek", "time": t}  vai até o tick t (History.seek)
+#   {"command": "play"} / {"command": "pause"}
+#
+# Vários navegadores podem acompanhar a mesma simulação. A simulação nunca
+# espera por eles: cada um tem um quadro pendente, e os passos que chegam
+# enquanto o anterior ainda está sendo enviado são juntados a ele (Frame.merge),
+# então um navegador lento recebe menos mensagens, maiores.
+#
+# Exemplo:
+#   python liveServer.py tarefas.txt --port 8765
+#   (abra http://127.0.0.1:8765 no navegador)
+
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+PLAY_INTERVAL = 0.1     # segundos entre os ticks no modo play
+
+# códigos dos quadros WebSocket (RFC 6455)
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Lê um quadro do cliente (sempre mascarado); retorna (código, conteúdo)"""
+    first, second = await reader.readexactly(2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', await reader.readexactly(8))[0]
+
+    mask = await reader.readexactly(4) if second & 0x80 else bytes(4)
+    payload = await reader.readexactly(length)
+    return opcode, bytes(byte ^ mask[index % 4] for index, byte in enumerate(payload))
+
+
+def encode_frame(payload: bytes, opcode: int = OP_TEXT) -> bytes:
+    """Quadro do servidor (sem máscara, em uma única parte)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class Viewer:
+    """Navegador conectado: guarda o quadro ainda não enviado e o estado mais recente"""
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.pending: Frame = None
+        self.status: dict = None
+        self.ready = asyncio.Event()
+
+
+    def push(self, frame: Frame, status: dict):
+        """Não bloqueia: junta o quadro ao pendente e acorda o envio"""
+        self.pending = frame if self.pending is None else self.pending.merge(frame)
+        self.status = status
+        self.ready.set()
+
+
+    async def send_loop(self, colors: dict):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            frame, self.pending = self.pending, None
+
+            message = {
+                **self.status,
+                'ids': frame.ids,
+                'colors': colors,
+                'changes': {task_id: [position, runs] for task_id, (position, runs) in frame.changes.items()}
+            }
+            self.writer.write(encode_frame(json.dumps(message, ensure_ascii=False).encode('utf-8')))
+            await self.writer.drain()
+
+
+class LiveSimulation:
+    def __init__(self, history: History, timeline: Timeline, colors: dict, interval: float = PLAY_INTERVAL):
+        self.history = history
+        self.timeline = timeline
+        self.colors = colors            # id -> cor (fixas, enviadas com cada quadro)
+        self.interval = interval
+        self.viewers: set[Viewer] = set()
+        self.playing = False
+        self.player: asyncio.Task = None
+
+        timeline.watch()
+        timeline.take_changes()
+
+
+    def status(self) -> dict:
+        return {'time': self.history.ticks, 'playing': self.playing, 'finished': self.history.finished}
+
+
+    def snapshot(self) -> Frame:
+        """Linha do tempo inteira, para quem acabou de se conectar"""
+        changes = {task_id: (0, tuple(tuple(run) for run in runs)) for task_id, runs in self.timeline.items()}
+        return Frame(tuple(self.timeline.keys()), changes, (), (), '')
+
+
+    def broadcast(self):
+        """Envia os trechos alterados desde o último passo para todos os navegadores"""
+        runs = self.timeline.runs
+        changes = {
+            task_id: (position, tuple(tuple(run) for run in runs[task_id][position:]))
+            for task_id, position in self.timeline.take_changes().items()
+        }
+        frame = Frame(tuple(self.timeline.keys()), changes, (), (), '')
+        status = self.status()
+        for viewer in self.viewers:
+            viewer.push(frame, status)
+
+
+    def step(self):
+        if not self.history.finished:
+            self.history.advance(self.history.ticks)
+        if self.history.finished:
+            self.playing = False
+        self.broadcast()
+
+
+    def back(self):
+        self.history.rewind()
+        self.broadcast()
+
+
+    def seek(self, time: int):
+        self.history.seek(time)
+        if self.history.finished:
+            self.playing = False
+        self.broadcast()
+
+
+    def play(self):
+        if self.playing or self.history.finished:
+            return
+        self.playing = True
+        self.player = asyncio.ensure_future(self.play_loop())
+        self.broadcast()
+
+
+    def pause(self):
+        self.playing = False
+        self.broadcast()
+
+
+    async def play_loop(self):
+        while self.playing:
+            self.step()
+            await asyncio.sleep(self.interval)
+
+
+    def command(self, message: dict):
+        command = message.get('command')
+        if command == 'step':
+            self.playing = False
+            self.step()
+        elif command == 'back':
+            self.playing = False
+            self.back()
+        elif command == 'seek':
+            self.playing = False
+            self.seek(int(message['time']))
+        elif command == 'play':
+            self.play()
+        elif command == 'pause':
+            self.pause()
+
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Conexão HTTP: a página em '/' e o WebSocket em '/ws'"""
+        try:
+            request = await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            writer.close()
+            return
+
+        lines = request.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        path = parts[1] if len(parts) > 1 else '/'
+        headers = {name.strip().lower(): value.strip() for name, _, value in (line.partition(':') for line in lines[1:] if line)}
+
+        if path == '/ws' and headers.get('upgrade', '').lower() == 'websocket':
+            await self.websocket(reader, writer, headers)
+            return
+
+        if path == '/':
+            body, status = PAGE.encode('utf-8'), '200 OK'
+        else:
+            body, status = b'nao encontrado', '404 Not Found'
+        content_type = 'text/html; charset=utf-8' if status.startswith('200') else 'text/plain'
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body)
+        await writer.drain()
+        writer.close()
+
+
+    async def websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: dict):
+        accept = base64.b64encode(hashlib.sha1((headers.get('sec-websocket-key', '') + WEBSOCKET_GUID).encode('ascii')).digest()).decode('ascii')
+        writer.write((
+            'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+            f'Sec-WebSocket-Accept: {accept}\r\n\r\n'
+        ).encode('latin-1'))
+
+        viewer = Viewer(writer)
+        viewer.push(self.snapshot(), self.status())
+        self.viewers.add(viewer)
+        sender = asyncio.ensure_future(viewer.send_loop(self.colors))
+
+        try:
+            while not sender.done():
+                opcode, payload = await read_frame(reader)
+                if opcode == OP_CLOSE:
+                    writer.write(encode_frame(b'', OP_CLOSE))
+                    break
+                if opcode == OP_PING:
+                    writer.write(encode_frame(payload, OP_PONG))
+                elif opcode == OP_TEXT:
+                    try:
+                        self.command(json.loads(payload))
+                    except (ValueError, KeyError, TypeError):
+                        pass
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.viewers.discard(viewer)
+            sender.cancel()
+            writer.close()
+
+
+def build_simulation(path: str, algorithm: str = None, quantum: int = None, alpha: int = None, interval: float = PLAY_INTERVAL) -> LiveSimulation:
+    """Prepara o modo passo-a-passo para a carga do arquivo .txt"""
+    history, tasks = load_history(path, algorithm, quantum, alpha)
+    return LiveSimulation(history, history.timeline, {task.id: task.color for task in tasks}, interval)
+
+
+async def serve(simulation: LiveSimulation, host: str, port: int):
+    server = await asyncio.start_server(simulation.handle, host, port)
+    print(f'Simulação em http://{host}:{port}', file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Simulação passo-a-passo ao vivo no navegador')
+    parser.add_argument('file', help='arquivo .txt com o cabeçalho (algoritmo;quantum;alpha) e as tarefas')
+    parser.add_argument('-a', '--algorithm', type=str.upper, choices=policy_names(), help='substitui o algoritmo do arquivo')
+    parser.add_argument('-q', '--quantum', type=int, help='substitui o quantum do arquivo')
+    parser.add_argument('--alpha', type=int, help='substitui o alpha do arquivo')
+    parser.add_argument('--host', default='127.0.0.1', help='endereço do servidor (padrão: 127.0.0.1, apenas local)')
+    parser.add_argument('-p', '--port', type=int, default=8765, help='porta do servidor (padrão: 8765)')
+    parser.add_argument('--interval', type=float, default=PLAY_INTERVAL, help=f'segundos entre os ticks no modo play (padrão: {PLAY_INTERVAL})')
+    args = parser.parse_args(argv)
+
+    try:
+        simulation = build_simulation(args.file, args.algorithm, args.quantum, args.alpha, args.interval)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {args.file}: {error}', file=sys.stderr)
+        return 1
+
+    try:
+        asyncio.run(serve(simulation, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# Página do navegador: mantém a própria cópia dos trechos e aplica as mudanças recebidas
+PAGE = '''<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>Escalonador</title>
+<style>
+  body { font-family: sans-serif; margin: 16px; }
+  button { margin-right: 4px; }
+  canvas { display: block; margin-top: 12px; border: 1px solid #ccc; }
+</style>
+</head>
+<body>
+<div>
+  <button data-command="back">&#9664; Voltar</button>
+  <button data-command="step">Avançar &#9654;</button>
+  <button data-command="play">Play</button>
+  <button data-command="pause">Pause</button>
+  <input id="seek" type="number" min="0" style="width: 6em"> <button id="go">Ir até</button>
+  <span id="status"></span>
+</div>
+<canvas id="gantt" width="1200" height="200"></canvas>
+<script>
+const runs = {};
+let ids = [], colors = {}, time = 0;
+const socket = new WebSocket(`ws://${location.host}/ws`);
+const send = message => socket.send(JSON.stringify(message));
+
+document.querySelectorAll('[data-command]').forEach(button => button.onclick = () => send({command: button.dataset.command}));
+document.getElementById('go').onclick = () => send({command: 'seek', time: Number(document.getElementById('seek').value)});
+
+socket.onmessage = event => {
+  const message = JSON.parse(event.data);
+  ids = message.ids;
+  colors = message.colors;
+  time = message.time;
+  for (const [id, [position, changed]] of Object.entries(message.changes)) {
+    runs[id] = (runs[id] || []).slice(0, position).concat(changed);
+  }
+  document.getElementById('status').textContent =
+    `tick ${time}` + (message.playing ? ' (play)' : '') + (message.finished ? ' (fim)' : '');
+  requestAnimationFrame(draw);
+};
+
+function draw() {
+  const canvas = document.getElementById('gantt');
+  const rowHeight = 24, left = 60;
+  const width = Math.max(time, 1);
+  canvas.height = ids.length * rowHeight + 20;
+  const scale = (canvas.width - left - 10) / width;
+  const context = canvas.getContext('2d');
+  context.clearRect(0, 0, canvas.width, canvas.height);
+  context.font = '12px sans-serif';
+
+  ids.forEach((id, row) => {
+    const y = row * rowHeight;
+    context.fillStyle = '#000';
+    context.fillText(id, 4, y + 16);
+    for (const [start, end, state] of runs[id] || []) {
+      if (state === 'n') continue;
+      const x = left + start * scale, w = Math.max((end - start) * scale, 1);
+      if (state === ' ') {
+        context.strokeStyle = '#bbb';
+        context.strokeRect(x, y + 6, w, rowHeight - 12);
+      } else {
+        context.fillStyle = state;
+        context.fillRect(x, y + 4, w, rowHeight - 8);
+      }
+    }
+  });
+  context.fillStyle = '#000';
+  context.fillText(`0`, left, canvas.height - 4);
+  context.fillText(`${time}`, canvas.width - 40, canvas.height - 4);
+}
+</script>
+</body>
+</html>
+'''
+
+
+if __name__ == '__main__':
+    sys.exit(main())
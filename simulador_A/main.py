@@ -1,14 +1,22 @@
 from tcb import TCB, State
 from process import Process
 from taskScheduler import TaskScheduler
-import os, matplotlib.pyplot as plt
-from matplotlib.gridspec import GridSpec
-from mutex import Mutex
-import random, copy
-
-DEFAULT_ALGORITHM = "FCFS"
-DEFAULT_QUANTUM = 2
-DEFAULT_ALPHA = 1
+from schedulingPolicy import get_policy, policy_names
+from smpScheduler import SMPScheduler, MigrationPolicy, StealPolicy
+from engine import EventEngine
+from history import History
+from timeline import Timeline
+from renderWorker import RenderWorker
+import argparse
+import os
+from mutex import Synchronization
+from hooks import Trace
+from metrics import StreamingMetrics
+from taskFile import parse_lines, RANDOM_INIT, RANDOM_END
+from resultCache import ResultCache
+from headless import build_result
+from ganttExport import write_gantt
+import random
 
 ALGORITHMS = ['FCFS', 'SRTF', 'PRIOP', 'PRIOPEnv']
 ALGORITHMS_ENV = ['PRIOPEnv']
@@ -21,79 +29,12 @@ t04;#d62728;5;6;9;ML:1;IO:2-1;MU:3\n
 t05;#9467bd;7;4;6;ML:1;IO:2-1;MU:3
 """
 
-RANDOM_INIT = 0
-RANDOM_END = 10
-
-TASKS_CONTEXT = []
-
-def plot_timeline(timeline_dict: dict, tasks: list[TCB], ax_graph, ax_table, algoritmo: str, quantum: int, save=True):
-    """Atualiza a interface gráfica do usuário"""
-    ax_graph.clear()
-    ax_table.clear()
-
-    # --- Gráfico ---
-    for i, (task_id, timeline) in enumerate(timeline_dict.items(), start=1):
-        for t, state in enumerate(timeline):
-            if state == ' ':          # READY
-                color = "lightgray"
-            elif state == 'n':        # NOT_STARTED / PRONTA
-                color = "white"
-            else:                     # RUNNING
-                color = state
-
-            ax_graph.broken_barh([(t, 1)], (i - 0.4, 0.8), facecolors=color)
-
-    ax_graph.set_xlabel("Tempo")
-    ax_graph.set_ylabel("Tarefas")
-    ax_graph.set_yticks(range(1, len(timeline_dict) + 1))
-    ax_graph.set_yticklabels([f"P{tid}" for tid in timeline_dict.keys()])
-    ax_graph.set_xticks(range(len(next(iter(timeline_dict.values())))))
-
-    # --- Legenda com o algoritmo e quantum ---
-    ax_graph.text(
-        0.5, 1.05, 
-        f"Algoritmo: {algoritmo} | Quantum: {QUANTUM} | ALPHA : {ALPHA} | Running: {quantum}", 
-        ha='center', va='bottom', transform=ax_graph.transAxes,
-        fontsize=10, fontweight='bold'
-    )
-
-    # --- Tabela ---
-    ax_table.axis('off')
-    table_data = [
-        [
-            task.id, 
-            task.color, 
-            task.start, 
-            f"{task.duration_current}/{task.duration}", 
-            task.priority_current,
-            ", ".join([f'{event["start"]}/{event["duration"]}/{event["duration_current"]}' for event in task.events if 'IO' in event['type']]), 
-            ", ".join([f'{event["type"]}:{event["start"]}' for event in task.events if event['type'] in ['ML', 'MU']]),
-            "1" if MUTEX.owner and task.id == MUTEX.owner.id else "0",
-            task.state.name
-        ] 
-        for task in tasks
-    ]
-    col_labels = ["ID", "Cor", "Início", "Duração", "Prioridade", "IO", "ML/MU", "Lock", "Estado"]
-
-    cell_colors = []
-    for task in tasks:
-        row_colors = ['white'] * len(col_labels)
-        row_colors[1] = task.color
-        cell_colors.append(row_colors)
-
-    ax_table.table(
-        cellText=table_data, 
-        colLabels=col_labels, 
-        cellLoc='center', 
-        colLoc='center', 
-        loc='center', 
-        cellColours=cell_colors
-    )
-
-    plt.draw()
-    plt.pause(0.01)
-    if save:
-        plt.savefig('./plt.png', dpi=300, bbox_inches="tight")
+def plot_timeline(renderer: RenderWorker, timeline: Timeline, tasks: list[TCB], algoritmo: str, quantum: int, save=True):
+    """Envia o passo atual para o processo que desenha a interface gráfica do usuário (não bloqueia)"""
+    title = f"Algoritmo: {algoritmo} | Quantum: {QUANTUM} | ALPHA : {ALPHA} | Running: {quantum}"
+    if CORES > 1:
+        title += f" | Núcleos: {CORES}"
+    renderer.submit(timeline, tasks, SYNC, title, save=save)
 
 
 # def print_gantt(timeline_dict: dict, time: int):
@@ -106,6 +47,25 @@ def plot_timeline(timeline_dict: dict, tasks: list[TCB], ax_graph, ax_table, alg
 #         print(f"{key}      " + "   ".join(status for status in timeline_dict[key][:-1]))
 
 
+def restore_result(result: dict, process: Process, timeline: Timeline, task_scheduler: TaskScheduler):
+    """Resultado do cache: deixa a linha do tempo, as tarefas e as métricas como ao fim da simulação"""
+    for task_id, runs in result['timeline'].items():
+        timeline.replace(task_id, 0, runs)
+    for lane, runs in result.get('core_timeline', {}).items():
+        task_scheduler.lanes.replace(lane, 0, runs)
+
+    rows = {row['id']: row for row in result['tasks']}
+    for task in process.tasks:
+        row = rows[task.id]
+        task.stop = row['stop']
+        task.total_waiting_time = row['waiting_time']
+        task.duration_current = task.duration
+        task.state = State.TERMINATED
+
+    task_scheduler.response_time = result['response_time']
+    task_scheduler.efficiency = result['efficiency']
+
+
 def initialize() -> tuple[int, int, int, list[TCB]]:
     """Obtém o algoritmo, o valor do quantum e inicializa a lista de tarefas definida no arquivo .txt"""
 
@@ -125,15 +85,12 @@ def initialize() -> tuple[int, int, int, list[TCB]]:
                 lines = file.readlines()
 
         else:
-            algorithm = input('Deseja escolher qual algoritmo?\n\n1 - FCFS\n2 - SRTF\n3 - PRIOP\n4 - PRIOPEnv\n\nResposta: ')
-            if '1' in algorithm:
-                algorithm = 'FCFS'
-            elif '2' in algorithm:
-                algorithm = 'SRTF'
-            elif '3' in algorithm:
-                algorithm = 'PRIOP'
-            elif '4' in algorithm:
-                algorithm = 'PRIOPEnv'
+            # opções na ordem do registro de algoritmos (schedulingPolicy.py)
+            algorithms = [get_policy(name).name for name in policy_names()]
+            menu = ''.join(f'{number} - {name}\n' for number, name in enumerate(algorithms, start=1))
+            algorithm = input(f'Deseja escolher qual algoritmo?\n\n{menu}\nResposta: ').strip()
+            if algorithm.isdigit() and 1 <= int(algorithm) <= len(algorithms):
+                algorithm = algorithms[int(algorithm) - 1]
             else:
                 print('Não existe este algoritmo')
                 exit(1)
@@ -168,103 +125,11 @@ def initialize() -> tuple[int, int, int, list[TCB]]:
         with open(file, 'r', encoding="utf-8") as file:
             lines = file.readlines()
     
-    # lê a primeira linha com o tipo do algoritmo e o valor do quantum
-    items = lines[0].strip().split(';')
-    algorithm = items[0].upper() if items[0] else DEFAULT_ALGORITHM
-    quantum = int(items[1]) if items[1] else DEFAULT_QUANTUM
-    alpha = int(items[2]) if len(items) >= 2 else DEFAULT_ALPHA
+    return parse_lines(lines)
 
-    tasks: list[TCB] = []
 
-    # inicializa as tarefas e adiciona dentro do processo
-    try:
-
-        for task in lines[1:]:
-
-            if not task and not task.strip():
-                continue
-
-            items: list[str] = [item.strip() for item in task.strip().split(';')]
-
-            events: list[dict] = []
-            
-            for item in items[5:]:
-                if not item:
-                    continue
-                event_type, time_event = item.split(':')
-                if 'IO' in event_type:
-                    start_s, dur_s = time_event.split('-')
-                    events.append({
-                        'type': event_type,
-                        'start': int(start_s),
-                        'duration': int(dur_s),
-                        'duration_current': 0
-                    })
-                else:  # ML ou MU
-                    events.append({
-                        'type': 'ML' if 'ML' in event_type else 'MU',
-                        'start': int(time_event),
-                        'duration': 1,               # opcional — para marcar ocorrência
-                        'duration_current': 0
-                    })
-
-            try:
-                if len(items) == 3:
-                    # significa que o usuário não adicionou uma cor
-                    if '#' not in items[1]:
-                        tcb: TCB = TCB(
-                            items[0],       # pid
-                            "#{:06x}".format(random.randint(0, 0xFFFFFF)),       # color
-                            int(items[1]),  # ingresso
-                            int(items[2]),  # duração
-                            int(items[3]),  # prioridade
-                            events
-                        )
-                else:            
-                    tcb: TCB = TCB(
-                        items[0],       # pid
-                        "#" + items[1],       # color
-                        int(items[2]),  # ingresso
-                        int(items[3]),  # duração
-                        int(items[4]),  # prioridade
-                        events
-                    )
-
-            except Exception as e:
-                print(f'ERRO | def initialize | {e}')
-                tcb: TCB = TCB(
-                    f"t{len(tasks) + 1:02d}",                       # pid
-                    "#{:06x}".format(random.randint(0, 0xFFFFFF)),  # color
-                    random.randint(RANDOM_INIT, RANDOM_END),        # ingresso
-                    random.randint(RANDOM_INIT, RANDOM_END),        # duração
-                    random.randint(RANDOM_INIT, RANDOM_END),        # prioridade
-                    events
-                )
-
-
-            tasks.append(tcb)
-
-    except Exception as e:
-        print(f'ERRO | def initialize | {e}')
-        return
-
-    return algorithm, quantum, alpha, tasks
-
-
-def save_timeline(timeline_dict: dict, tasks: list[TCB]) -> dict:
-    """Salva os estados das tarefas"""
-    for task in tasks:
-        timeline_dict[task.id].append(
-            ' ' if task.state == State.READY else 
-            task.color if task.state == State.RUNNING else 
-            ' ' if task.state == State.SUSPENDED else
-            't' if task.start == State.TERMINATED else 'n'
-        )
-
-    return timeline_dict
-
-def run():
-    global MUTEX, QUANTUM, ALPHA
+def run(cores: int = 1, migration: str = 'FIXED', steal: str = 'NONE', cache: ResultCache = None, gantt: str = None):
+    global SYNC, QUANTUM, ALPHA, CORES
 
     algorithm, QUANTUM, ALPHA, tasks = initialize()
 
@@ -274,10 +139,14 @@ def run():
 
     process.sort_ready() # ordena as tarefas por ordem de ingresso
 
-    task_scheduler = TaskScheduler(algorithm, QUANTUM, ALPHA)
+    CORES = cores
+    if cores > 1:
+        task_scheduler = SMPScheduler(algorithm, QUANTUM, ALPHA, cores, migration, steal)
+    else:
+        task_scheduler = TaskScheduler(algorithm, QUANTUM, ALPHA)
 
     time = 0
-    timeline_dict = {task.id: [] for task in tasks}
+    timeline = Timeline(task.id for task in tasks)
 
     opcao = input('Execução das tarefas:\n\nA: Passo-a-passo\nB: Completa\n\nResposta: ')
     opcao = opcao.lower()
@@ -286,89 +155,128 @@ def run():
         print('Resposta incorreta')
         exit(1)
 
+    if cores > 1 and 'a' in opcao:
+        print('O modo passo-a-passo não suporta vários núcleos; executando a simulação completa')
+        opcao = 'b'
 
-    plt.ion()
-    fig = plt.figure(figsize=(14, 6))
-    gs = GridSpec(2, 1, height_ratios=[3, 1], figure=fig)
-    ax_graph = fig.add_subplot(gs[0])
-    ax_table = fig.add_subplot(gs[1])
+    # o gráfico é desenhado em outro processo; cada passo envia apenas o que mudou
+    renderer = RenderWorker()
+    # com vários núcleos o gráfico mostra uma linha por núcleo
+    chart = task_scheduler.lanes if cores > 1 else timeline
+    chart.watch()
 
-    MUTEX = Mutex()
+    SYNC = Synchronization()
+    SYNC.hooks.subscribe(Trace())  # mensagens do mutex e dos semáforos no terminal
 
     ap_env = ALPHA if any(alg for alg in ALGORITHMS if alg in ALGORITHMS_ENV) else 0
 
-    update = True
-    TASKS_CONTEXT.append({'process': copy.deepcopy(process), 'mutex': copy.deepcopy(MUTEX), 'timeline_dict': timeline_dict})
-
-    while True: 
+    # execução completa já simulada com a mesma carga e configuração: vem do cache
+    result = None
+    if cache and 'a' not in opcao:
+        key = cache.key(tasks, algorithm, QUANTUM, ALPHA, cores, migration, steal)
+        result = cache.get(key)
 
-        #print(f'================================================= TIME: {time} =================================================\n')
+    if result is not None:
+        restore_result(result, process, timeline, task_scheduler)
+        time = result['time']
+        tasks = process.tasks
 
-        tasks: list[TCB] = process.tasks
+    elif 'a' not in opcao:
+        # execução completa: salta direto entre os eventos da simulação
+        # estatísticas incrementais (o passo-a-passo retrocede, então só na execução completa)
+        task_scheduler.metrics = StreamingMetrics(cores)
+        SYNC.hooks.subscribe(task_scheduler.metrics)
 
+        engine = EventEngine(process, task_scheduler, SYNC)
+        time = engine.run(timeline)
+        tasks = process.tasks
 
-        if update:
+    else:
+        # histórico de desfazer para o retrocesso e salto no modo passo-a-passo
+        history = History(process, task_scheduler, SYNC, timeline)
+        update = True
 
+        while True: 
 
-            # inicializa o estado das tarefas
-            for task in tasks:
-                task.update_state(time, MUTEX)
+            #print(f'================================================= TIME: {time} =================================================\n')
 
-            # se não tiver tarefa no process, finaliza o processo
-            if not process.has_task():
-                break
+            tasks: list[TCB] = process.tasks
 
-            # chama o escalonador para decidir qual tarefa deve rodar
-            task_scheduler.execute(process, MUTEX)
 
-            timeline_dict = save_timeline(timeline_dict, tasks)
+            if update:
 
-            TASKS_CONTEXT.append({
-                    'process': copy.deepcopy(process),
-                    'mutex': copy.deepcopy(MUTEX),
-                    'timeline_dict': copy.deepcopy(timeline_dict)
-                })
+                # executa o tick e registra apenas o que mudou
+                if not history.advance(time):
+                    break
 
 
-        if 'a' in opcao:
-            plot_timeline(timeline_dict, tasks, ax_graph, ax_table, algoritmo=algorithm, quantum=task_scheduler.remaining_quantum_time)
+            plot_timeline(renderer, chart, tasks, algoritmo=algorithm, quantum=task_scheduler.remaining_quantum_time, save=False)
 
-            option = input('Pressione "0" para VOLTAR ou "1" para AVANÇAR\n\nResposta: ')
-            while option not in ['0', '1']:
-                option = input('Pressione "0" para VOLTAR ou "1" para AVANÇAR\n\nResposta: ')
+            option = input('Pressione "0" para VOLTAR, "1" para AVANÇAR ou "2" para IR ATÉ um instante\n\nResposta: ')
+            while option not in ['0', '1', '2']:
+                option = input('Pressione "0" para VOLTAR, "1" para AVANÇAR ou "2" para IR ATÉ um instante\n\nResposta: ')
 
             if '1' in option:
                 time += 1
                 update = True
 
+            elif '2' in option:
+                update = False
+                try:
+                    instant = int(input('Instante: '))
+                except ValueError:
+                    print('Instante inválido')
+                    continue
+
+                time = history.seek(instant)
+                if history.finished:
+                    break
+
             else: 
                 # retrocede
                 update = False
-                if len(TASKS_CONTEXT) > 1:
-                    TASKS_CONTEXT.pop()
-                    context = TASKS_CONTEXT[-1]
-                    process = context['process']
-                    MUTEX = context['mutex']
-                    timeline_dict = context['timeline_dict']
+                if history.rewind():
                     time -= 1
-        else:
-
-            time += 1
 
-        #print(f"ID: {task.id}  ###  Cor: {task.color}  ###  Início: {task.start}  ###  Duration: {task.duration_current}/{task.duration}  ###  Prioridade: {task.priority_init}  ###  State: {task.state}")
+            #print(f"ID: {task.id}  ###  Cor: {task.color}  ###  Início: {task.start}  ###  Duration: {task.duration_current}/{task.duration}  ###  Prioridade: {task.priority_init}  ###  State: {task.state}")
 
 
 
-    process.task_current.stop = time
+    for task in task_scheduler.running(process):
+        task.stop = time
     task_scheduler.update_metrics(process)
 
+    store = cache and result is None and 'a' not in opcao
+    if store or gantt:
+        final = build_result(algorithm, QUANTUM, ALPHA, process, task_scheduler, time, timeline)
+        if store:
+            cache.put(key, final)
+        if gantt:
+            # gráfico estático sem o matplotlib (com vários núcleos, uma linha por núcleo, como na interface)
+            write_gantt(final, gantt, lanes=cores > 1)
+
     print(f'\nTt = {task_scheduler.turnaround_time} s')
     print(f'Tw = {task_scheduler.waiting_time} s')
+    if task_scheduler.response_time is not None:
+        print(f'Tr = {task_scheduler.response_time} s')
+        print(f'Eficiência = {task_scheduler.efficiency:.1%}')
 
 
-    plot_timeline(timeline_dict, tasks, ax_graph, ax_table, algoritmo=algorithm, quantum=task_scheduler.remaining_quantum_time)
+    plot_timeline(renderer, chart, tasks, algoritmo=algorithm, quantum=task_scheduler.remaining_quantum_time)
 
     input('pressione ENTER para continuar')
+    renderer.close()
 
 if __name__ == '__main__':
-    run()
+    parser = argparse.ArgumentParser(description='Simulador de escalonamento com interface gráfica')
+    parser.add_argument('-c', '--cores', type=int, default=1, help='quantidade de núcleos (padrão: 1)')
+    parser.add_argument('--migration', type=str.upper, choices=[item.name for item in MigrationPolicy], default='FIXED', help='política de migração com vários núcleos')
+    parser.add_argument('--steal', type=str.upper, choices=[item.name for item in StealPolicy], default='NONE', help='roubo de tarefas com vários núcleos')
+    parser.add_argument('--cache', action='store_true', help='na execução completa, consulta e grava o cache de resultados (resultCache.py)')
+    parser.add_argument('--gantt', metavar='ARQUIVO', help='ao fim, grava também o gráfico de Gantt em SVG (ou HTML, se ARQUIVO terminar em .html)')
+    args = parser.parse_args()
+
+    if args.cores < 1:
+        parser.error('a quantidade de núcleos deve ser ao menos 1')
+
+    run(args.cores, args.migration, args.steal, ResultCache() if args.cache else None, args.gantt)
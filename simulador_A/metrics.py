@@ -0,0 +1,260 @@
+from bisect import bisect_right, insort
+from copy import deepcopy
+from math import sqrt
+from tcb import State
+
+# Métricas calculadas durante a simulação, a partir dos ganchos (hooks.py):
+# cada tarefa entra nas estatísticas ao ser despachada pela primeira vez
+# (tempo de resposta) e ao terminar (turnaround e espera), então nada precisa
+# ser guardado depois que ela termina, nem a linha do tempo. A exceção é a
+# tarefa que termina ainda na fila de espera de um mutex/semáforo: ela pode ser
+# acordada e terminar de novo, então a amostra só entra quando sai da fila (ou
+# no resumo), e cada tarefa conta uma vez.
+#
+# - média e variância pelo método de Welford
+# - percentis p50/p95/p99 pelo algoritmo P² (Jain e Chlamtac): cinco marcadores
+#   por percentil, ajustados a cada amostra com interpolação parabólica
+# - utilização: ticks em execução (de on_dispatch/on_wake a on_preempt/on_block/on_terminate)
+#   / (tempo x núcleos); vazão: tarefas por tick
+#
+# Exemplo:
+#   _, task_scheduler, _, _ = simulate(algorithm, quantum, alpha, table, keep_timeline=False)
+#   task_scheduler.metrics.summary()
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RunningStats:
+    """Quantidade, média, variância, mínimo e máximo em O(1) por amostra"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+
+    @property
+    def variance(self) -> float:
+        """Variância populacional"""
+        return self.m2 / self.count if self.count else 0.0
+
+
+class P2Quantile:
+    """Estimativa do percentil 'p' sem guardar as amostras (algoritmo P²)"""
+
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self.heights: list[float] = []                      # alturas dos marcadores
+        self.positions = [1, 2, 3, 4, 5]                    # posições reais
+        self.increments = (0, p / 2, p, (1 + p) / 2, 1)     # a posição desejada do marcador é 1 + (count - 1) * incremento
+
+
+    def add(self, value: float):
+        heights = self.heights
+        self.count += 1
+
+        # até cinco amostras: os marcadores são as próprias amostras
+        if self.count <= 5:
+            insort(heights, value)
+            return
+
+        positions = self.positions
+
+        # célula da amostra (os extremos acompanham mínimo e máximo)
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = bisect_right(heights, value) - 1
+
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+
+        # ajusta os marcadores centrais que se afastaram da posição desejada
+        scale = self.count - 1
+        for index in (1, 2, 3):
+            position = positions[index]
+            offset = 1 + scale * self.increments[index] - position
+            if (offset >= 1 and positions[index + 1] - position > 1) or (offset <= -1 and positions[index - 1] - position < -1):
+                step = 1 if offset > 0 else -1
+                height = self.parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = self.linear(index, step)
+                heights[index] = height
+                positions[index] += step
+
+
+    def parabolic(self, index: int, step: int) -> float:
+        heights, positions = self.heights, self.positions
+        return heights[index] + step / (positions[index + 1] - positions[index - 1]) * (
+            (positions[index] - positions[index - 1] + step) * (heights[index + 1] - heights[index]) / (positions[index + 1] - positions[index]) +
+            (positions[index + 1] - positions[index] - step) * (heights[index] - heights[index - 1]) / (positions[index] - positions[index - 1])
+        )
+
+
+    def linear(self, index: int, step: int) -> float:
+        heights, positions = self.heights, self.positions
+        return heights[index] + step * (heights[index + step] - heights[index]) / (positions[index + step] - positions[index])
+
+
+    def value(self) -> float:
+        heights = self.heights
+        if not heights:
+            return None
+        if self.count <= 5:
+            # poucas amostras: percentil exato com interpolação linear
+            rank = self.p * (len(heights) - 1)
+            low = int(rank)
+            high = min(low + 1, len(heights) - 1)
+            return heights[low] + (heights[high] - heights[low]) * (rank - low)
+        return heights[2]
+
+
+class Distribution:
+    """Estatísticas de uma métrica: média, variância, extremos e percentis"""
+
+    def __init__(self, quantiles: tuple = QUANTILES):
+        self.stats = RunningStats()
+        self.quantiles = [P2Quantile(p) for p in quantiles]
+
+
+    def add(self, value: float):
+        self.stats.add(value)
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+
+    def summary(self) -> dict:
+        stats = self.stats
+        summary = {
+            'count': stats.count,
+            'mean': stats.mean,
+            'variance': stats.variance,
+            'std': sqrt(stats.variance),
+            'min': stats.min,
+            'max': stats.max
+        }
+        for quantile in self.quantiles:
+            summary[f'p{round(quantile.p * 100)}'] = quantile.value()
+        return summary
+
+
+class StreamingMetrics:
+    """Ouvinte dos ganchos que acumula as métricas das tarefas à medida que respondem e terminam"""
+
+    def __init__(self, cores: int = 1):
+        self.cores = cores
+        self.time = 0                   # tick atual (último on_tick)
+        self.turnaround = Distribution()
+        self.waiting = Distribution()
+        self.response = Distribution()
+        self.busy_ticks = 0             # ticks de CPU das execuções já encerradas
+        self.running = {}               # tarefa em execução -> tick em que passou a ocupar a CPU
+        self.started = set()            # tarefas vivas que já foram despachadas
+        self.queued = set()             # tarefas na fila de espera de um mutex/semáforo
+        self.pending = {}               # terminadas ainda na fila (podem voltar a rodar) -> (turnaround, espera)
+
+
+    def on_tick(self, time: int, ticks: int):
+        self.time = time
+
+
+    def on_dispatch(self, task):
+        if task not in self.started:
+            self.started.add(task)
+            self.response.add(self.time - task.start)
+        self.running.setdefault(task, self.time)
+
+
+    def on_preempt(self, task):
+        self.stop(task)
+
+
+    def on_block(self, task, primitive):
+        self.stop(task)
+        if primitive is not None:
+            self.queued.add(task)
+
+
+    def on_wake(self, task, primitive):
+        if primitive is not None:
+            self.queued.discard(task)
+            # terminada e acordada: vai terminar de novo, só a última vez conta
+            self.pending.pop(task, None)
+        # acordada direto em execução (segura um mutex), ou tirada da CPU pelo sinal do semáforo
+        if task.state == State.RUNNING:
+            self.running.setdefault(task, self.time)
+        else:
+            self.stop(task)
+
+
+    def on_terminate(self, task):
+        self.stop(task)
+        if task in self.queued:
+            self.pending[task] = (self.time - task.start, task.total_waiting_time)
+            return
+        self.started.discard(task)
+        self.turnaround.add(self.time - task.start)
+        self.waiting.add(task.total_waiting_time)
+
+
+    def stop(self, task):
+        """A tarefa deixa a CPU: credita o tempo de execução"""
+        since = self.running.pop(task, None)
+        if since is not None:
+            self.busy_ticks += self.time - since
+
+
+    def completed(self) -> tuple[Distribution, Distribution]:
+        """Turnaround e espera incluindo as terminadas que ainda estão numa fila de espera"""
+        if not self.pending:
+            return self.turnaround, self.waiting
+        turnaround, waiting = deepcopy(self.turnaround), deepcopy(self.waiting)
+        for task_turnaround, task_waiting in self.pending.values():
+            turnaround.add(task_turnaround)
+            waiting.add(task_waiting)
+        return turnaround, waiting
+
+
+    def utilization(self) -> float:
+        """Fração da capacidade (tempo x núcleos) em que as tarefas ocuparam a CPU"""
+        capacity = self.time * self.cores
+        busy = self.busy_ticks + sum(self.time - since for since in self.running.values())
+        return busy / capacity if capacity else 0.0
+
+
+    def throughput(self) -> float:
+        """Tarefas terminadas por tick"""
+        count = self.turnaround.stats.count + len(self.pending)
+        return count / self.time if self.time else 0.0
+
+
+    def summary(self) -> dict:
+        turnaround, waiting = self.completed()
+        return {
+            'time': self.time,
+            'completed': turnaround.stats.count,
+            'utilization': self.utilization(),
+            'throughput': self.throughput(),
+            'turnaround_time': turnaround.summary(),
+            'waiting_time': waiting.summary(),
+            'response_time': self.response.summary()
+        }
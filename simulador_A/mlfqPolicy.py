@@ -0,0 +1,141 @@
+from process import Process
+from readyQueue import ReadyQueue
+from tcb import TCB, State
+from mutex import Synchronization
+from schedulingPolicy import PreemptivePolicy, register_policy
+
+# Multi-level feedback queue: MLFQ_LEVELS filas round robin; o nível 0 tem a
+# maior prioridade e o quantum do nível n é quantum x 2^n.
+#
+# - a tarefa que usa todo o quantum do nível desce um nível; a que cede a CPU
+#   antes (IO, ML, SW) continua no mesmo nível
+# - uma tarefa pronta de nível mais alto preempta a atual
+# - a cada MLFQ_BOOST quanta todas as tarefas voltam ao nível 0 (evita inanição)
+#
+# Cada fila é uma faixa da fila de prontas com chave (nível, ordem de entrada),
+# então a escolha continua O(log n); o boost percorre as tarefas do processo.
+#
+# policy_data: (nível, posição na fila ou None enquanto a tarefa não está nela)
+
+MLFQ_LEVELS = 3
+MLFQ_BOOST = 16
+
+
+def level(task: TCB) -> int:
+    return task.policy_data[0] if task.policy_data else 0
+
+
+def queue_key(task: TCB) -> tuple[int, int]:
+    return task.policy_data
+
+
+@register_policy
+class MLFQPolicy(PreemptivePolicy):
+    name = 'MLFQ'
+
+    def __init__(self, scheduler):
+        super().__init__(scheduler)
+        self.clock = 0                  # ticks decididos (executados ou saltados)
+        self.next_boost = self.boost_interval()
+        self.order = 0                  # última posição distribuída nas filas
+
+
+    def boost_interval(self) -> int:
+        return MLFQ_BOOST * (self.scheduler.quantum or 1)
+
+
+    def slice(self, level: int) -> int:
+        return self.scheduler.quantum << level
+
+
+    def ready_key(self):
+        return queue_key
+
+
+    def on_enqueue(self, task: TCB):
+        data = task.policy_data
+        if data is None or data[1] is None:
+            self.order += 1
+            task.policy_data = (level(task), self.order)
+
+
+    def dispatched(self, task: TCB):
+        task.policy_data = (level(task), None)
+
+
+    def boost(self, process: Process):
+        """Todas as tarefas voltam ao nível 0; as prontas entram de novo na fila com a chave nova"""
+        queue: ReadyQueue = process.ready_queue
+        for task in process.tasks:
+            if task.policy_data and task.policy_data[0]:
+                task.policy_data = (0, task.policy_data[1])
+                if task.state == State.READY:
+                    queue.push(task)
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization) -> bool:
+        self.clock += 1
+        if self.clock >= self.next_boost:
+            self.next_boost += self.boost_interval()
+            self.boost(process)
+
+        return super().execute(process, tasks, sync)
+
+
+    def choose(self, queue: ReadyQueue, running: TCB) -> TCB:
+        if running is None:
+            return queue.first_ready()
+
+        current = level(running)
+        entry = queue.peek()
+
+        if self.scheduler.remaining_quantum_time >= self.slice(current):
+            # usou todo o quantum: desce um nível e vai para o fim da fila, se houver outra tarefa no nível (ou acima)
+            current = min(current + 1, MLFQ_LEVELS - 1)
+            running.policy_data = (current, None)
+            if entry and entry[0][0] <= current:
+                return entry[3]
+
+            # continua sozinha no nível, com um quantum novo
+            self.scheduler.remaining_quantum_time = 0
+            return running
+
+        if entry and entry[0][0] < current:
+            return entry[3]
+        return running
+
+
+    def window(self, queue: ReadyQueue, running: TCB) -> tuple[int, callable]:
+        remaining = self.scheduler.remaining_quantum_time
+        current_slice = self.slice(level(running))
+        entry = queue.peek()
+
+        if remaining >= current_slice or (entry and entry[0][0] < level(running)):
+            return 0, None
+
+        # até estourar o quantum do nível
+        return current_slice - remaining, self.step_increment
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        ticks, step = super().steady(process, tasks, sync)
+        # o tick do boost é sempre executado
+        return min(ticks, self.next_boost - self.clock - 1), step
+
+
+    def skip(self, ticks: int):
+        self.clock += ticks
+
+
+    def migrate(self, task: TCB, target: "MLFQPolicy"):
+        # mantém o nível e entra no fim da fila do outro núcleo
+        if task.policy_data:
+            task.policy_data = (task.policy_data[0], None)
+
+
+    def get_context(self):
+        return self.clock, self.next_boost, self.order
+
+
+    def set_context(self, context):
+        self.clock, self.next_boost, self.order = context
@@ -1,5 +1,182 @@
-class Mutex:
+from collections import deque
+from hooks import Hooks
+
+# Primitivas de sincronização identificadas pelo id usado no arquivo de tarefas
+# (MLxx/MUxx para mutex, SWxx/SSxx para semáforo; sem id, o mutex global '').
+#
+# Cada primitiva tem a fila de espera em um deque e um conjunto com as mesmas
+# tarefas, então entrar, sair e testar se a tarefa já espera custam O(1).
+# O registro (Synchronization) conta quantos mutexes cada tarefa possui, o que
+# responde em O(1) se a tarefa está em seção crítica. O registro também leva os
+# ganchos de instrumentação (hooks.py), pois acompanha toda a simulação.
+
+
+class WaitQueue:
     def __init__(self):
+        self.queue = deque()
+        self.members = set()
+
+
+    def __contains__(self, task) -> bool:
+        return task in self.members
+
+
+    def __len__(self) -> int:
+        return len(self.queue)
+
+
+    def __iter__(self):
+        return iter(self.queue)
+
+
+    def append(self, task) -> bool:
+        """Entra no fim da fila (se ainda não estiver nela); retorna se entrou agora"""
+        if task in self.members:
+            return False
+        self.members.add(task)
+        self.queue.append(task)
+        return True
+
+
+    def pop(self):
+        """Retira a primeira tarefa da fila"""
+        task = self.queue.popleft()
+        self.members.discard(task)
+        return task
+
+
+    def replace(self, tasks):
+        self.queue = deque(tasks)
+        self.members = set(self.queue)
+
+
+class Mutex:
+    kind = 'mutex'
+
+    def __init__(self, id: str = ''):
+        self.id = id
         self.locked = False
         self.owner = None
-        self.waiting_queue = []
\ No newline at end of file
+        self.waiting_queue = WaitQueue()
+
+
+class Semaphore:
+    kind = 'semaphore'
+
+    def __init__(self, id: str, count: int = 1):
+        self.id = id
+        self.initial = count
+        self.count = count
+        self.waiting_queue = WaitQueue()
+
+
+class Synchronization:
+    def __init__(self, semaphores: dict[str, int] = None):
+        self.mutexes: dict[str, Mutex] = {}
+        self.semaphores: dict[str, Semaphore] = {}
+        self.held: dict = {}        # tarefa -> quantidade de mutexes que possui
+        self.locked_count = 0       # mutexes travados
+        self.hooks = Hooks()
+
+        # valor inicial de cada semáforo (os não informados começam com 1)
+        for id, count in (semaphores or {}).items():
+            self.semaphore(id, count)
+
+
+    def mutex(self, id: str = '') -> Mutex:
+        """Mutex com o id informado (criado no primeiro uso)"""
+        mutex = self.mutexes.get(id)
+        if mutex is None:
+            mutex = self.mutexes[id] = Mutex(id)
+        return mutex
+
+
+    def semaphore(self, id: str, count: int = None) -> Semaphore:
+        """Semáforo com o id informado (criado no primeiro uso, com 'count' ou 1)"""
+        semaphore = self.semaphores.get(id)
+        if semaphore is None:
+            semaphore = self.semaphores[id] = Semaphore(id, 1 if count is None else count)
+        return semaphore
+
+
+    def acquire(self, mutex: Mutex, task):
+        """Trava o mutex para 'task' (ou mantém, se já for a dona)"""
+        if mutex.owner is task:
+            mutex.locked = True
+            return
+
+        self.release(mutex)
+        mutex.locked = True
+        mutex.owner = task
+        self.locked_count += 1
+        self.held[task] = self.held.get(task, 0) + 1
+
+
+    def release(self, mutex: Mutex):
+        """Destrava o mutex"""
+        owner = mutex.owner
+        mutex.locked = False
+        mutex.owner = None
+
+        if owner is not None:
+            self.locked_count -= 1
+            if self.held[owner] == 1:
+                del self.held[owner]
+            else:
+                self.held[owner] -= 1
+
+
+    def holds(self, task) -> bool:
+        """Se a tarefa possui algum mutex (está em seção crítica)"""
+        return task in self.held
+
+
+    def waiting(self, task) -> bool:
+        """Se a tarefa está na fila de espera de algum mutex ou semáforo"""
+        return any(task in mutex.waiting_queue for mutex in self.mutexes.values()) or \
+            any(task in semaphore.waiting_queue for semaphore in self.semaphores.values())
+
+
+    def blocked(self, task) -> bool:
+        """Se existe mutex travado por outra tarefa"""
+        return self.locked_count > self.held.get(task, 0)
+
+
+    def get_context(self) -> tuple:
+        """Estado das primitivas com as tarefas representadas pela posição (task.index);
+        as que estão no estado inicial ficam de fora"""
+        return (
+            tuple(
+                (id, mutex.locked, mutex.owner.index if mutex.owner else None, tuple(task.index for task in mutex.waiting_queue))
+                for id, mutex in self.mutexes.items()
+                if mutex.locked or mutex.owner or mutex.waiting_queue
+            ),
+            tuple(
+                (id, semaphore.count, tuple(task.index for task in semaphore.waiting_queue))
+                for id, semaphore in self.semaphores.items()
+                if semaphore.count != semaphore.initial or semaphore.waiting_queue
+            )
+        )
+
+
+    def set_context(self, context: tuple, tasks: list):
+        """Restaura o estado salvo por get_context; as primitivas ausentes voltam ao estado inicial"""
+        mutexes, semaphores = context
+        mutexes = {id: state for id, *state in mutexes}
+        semaphores = {id: state for id, *state in semaphores}
+
+        self.held = {}
+        self.locked_count = 0
+
+        for id, mutex in self.mutexes.items():
+            locked, owner, waiting_queue = mutexes.get(id, (False, None, ()))
+            mutex.owner = None
+            if owner is not None:
+                self.acquire(mutex, tasks[owner])
+            mutex.locked = locked
+            mutex.waiting_queue.replace(tasks[index] for index in waiting_queue)
+
+        for id, semaphore in self.semaphores.items():
+            count, waiting_queue = semaphores.get(id, (semaphore.initial, ()))
+            semaphore.count = count
+            semaphore.waiting_queue.replace(tasks[index] for index in waiting_queue)
@@ -1,18 +1,97 @@
 from tcb import TCB, State
+from readyQueue import ReadyQueue
+from taskTable import TaskTable
+from timeline import Timeline
+from mutex import Synchronization
 
 class Process:
     def __init__(self):
         self.tasks: list[TCB] = []
         self.task_current: TCB = None
+        self.ready_queue: ReadyQueue = None
+
+        # modo tabela: tarefas ainda não ingressadas ficam apenas na tabela
+        self.table: TaskTable = None
+        self.order = None
+        self.pending = 0
 
     def add_task(self, task: TCB):
         self.tasks.append(task)
 
 
     def has_task(self) -> bool:
+        if self.table is not None and self.pending < len(self.order):
+            return True
         if not self.tasks: return False
         return any(task.state != State.TERMINATED for task in self.tasks)
     
 
     def sort_ready(self):
         self.tasks = sorted(self.tasks, key=lambda task: task.start)
+
+
+    def attach_queue(self, ready_queue: ReadyQueue):
+        """Cria a fila de prontas do escalonador a partir da ordem atual das tarefas"""
+        self.ready_queue = ready_queue
+        ready_queue.attach(self.tasks)
+
+
+    def load_table(self, table: TaskTable):
+        """Executa sobre uma tabela compacta: os TCBs são criados no ingresso e descartados ao terminar"""
+        self.table = table
+        self.order = table.order()
+        self.pending = 0
+
+
+    def admit(self, time: int, timeline: Timeline, sync: Synchronization):
+        """Modo tabela: grava e descarta as tarefas terminadas e cria as que ingressam em 'time'.
+        Uma tarefa terminada que ainda está na fila de espera de um mutex ou semáforo pode ser
+        acordada e voltar a rodar (como no modo lista), então só é descartada quando sai da fila."""
+        if self.table is None:
+            return
+
+        if any(task.state == State.TERMINATED for task in self.tasks):
+            kept = []
+            for task in self.tasks:
+                if task.state != State.TERMINATED or sync.waiting(task):
+                    kept.append(task)
+                else:
+                    self.table.store(self.order[task.index], task)
+            self.tasks = kept
+
+        while self.pending < len(self.order) and self.table.start[self.order[self.pending]] <= time:
+            task = self.table.tcb(self.order[self.pending])
+            task.index = self.pending   # posição na ordem de ingresso, como em sort_ready
+            self.pending += 1
+
+            self.tasks.append(task)
+            if self.ready_queue is not None:
+                self.ready_queue.add(task)
+
+            # até aqui a tarefa não existia na linha do tempo
+            timeline.append(task.id, 'n', time)
+
+
+    def next_arrival(self) -> int:
+        """Modo tabela: instante de ingresso da próxima tarefa ainda não criada"""
+        if self.table is None or self.pending >= len(self.order):
+            return None
+        return self.table.start[self.order[self.pending]]
+
+
+    def finish(self, time: int, timeline: Timeline, running: list[TCB] = None) -> Timeline:
+        """Modo tabela: grava as tarefas restantes (e as que ocupam a CPU, 'running') e completa a linha do tempo na ordem da tabela"""
+        if self.table is None:
+            return timeline
+
+        for task in self.tasks:
+            self.table.store(self.order[task.index], task)
+        if running is None:
+            running = [self.task_current] if self.task_current else []
+        for task in running:
+            self.table.store(self.order[task.index], task)
+
+        timeline.pad(time)
+        timeline.reorder(self.table.ids[row] for row in range(len(self.table)))
+
+        return timeline
@@ -0,0 +1,195 @@
+import heapq
+from tcb import TCB, State
+
+# Estruturas persistentes de tarefas prontas usadas pelo escalonador.
+# As transições de estado do TCB avisam a fila (ver TCB.state), então cada
+# decisão custa O(log n) em vez de percorrer a lista de tarefas.
+#
+# As entradas do heap são (chave, índice, versão, tarefa). O índice é a posição
+# da tarefa na ordem de ingresso e desempata como o min/max sobre a lista original.
+# Entradas de tarefas que deixaram o estado READY são descartadas de forma
+# preguiçosa quando chegam ao topo. A chave é pura (só lê a tarefa); os dados
+# que a política grava na tarefa ao entrar na fila (posição do RR, vruntime
+# inicial do CFS...) vêm antes, em on_enqueue.
+#
+# Envelhecimento (PRIOPEnv): a cada troca todas as tarefas prontas ganham alpha
+# na prioridade. Em vez de somar em cada uma, a fila conta as trocas (época) e a
+# tarefa guarda a época em que ficou pronta (TCB.policy_data), então
+#   prioridade envelhecida = prioridade ao ficar pronta + alpha x (época - época de entrada)
+# Como todas as prontas envelhecem juntas, a ordem entre elas não muda e a chave
+# alpha x época de entrada - prioridade vale enquanto a tarefa estiver pronta.
+# O valor é gravado em priority_current quando a tarefa deixa de estar pronta.
+
+
+class Aging:
+    def __init__(self, alpha: int):
+        self.alpha = alpha
+        self.epoch = 0
+
+
+    def age(self):
+        """Todas as tarefas prontas ganham alpha"""
+        self.epoch += 1
+
+
+    def key(self, task: TCB) -> int:
+        # fora da fila (ex.: em execução) a tarefa não envelhece: vale a época atual
+        epoch = self.epoch if task.policy_data is None else task.policy_data
+        return self.alpha * epoch - task.priority_current
+
+
+    def priority(self, task: TCB) -> int:
+        """Prioridade envelhecida da tarefa"""
+        if task.policy_data is None:
+            return task.priority_current
+        return task.priority_current + self.alpha * (self.epoch - task.policy_data)
+
+
+    def enter(self, task: TCB):
+        # restaurada pelo histórico: mantém a época salva
+        if task.policy_data is None:
+            task.policy_data = self.epoch
+
+
+    def settle(self, task: TCB):
+        """Grava o envelhecimento acumulado na tarefa que deixa a fila"""
+        task.priority_current = self.priority(task)
+        task.policy_data = None
+
+
+class ReadyQueue:
+    def __init__(self, key=None, aging: Aging = None, on_enqueue=None):
+        self.key = key              # chave de ordenação das tarefas prontas (None = sem heap)
+        self.aging = aging          # envelhecimento das tarefas prontas (PRIOPEnv)
+        self.on_enqueue = on_enqueue    # preparo da tarefa antes de calcular a chave (None = nada)
+        self.heap: list[tuple] = []
+        self.running: dict[int, TCB] = {}
+        self.ready_count = 0
+
+
+    def attach(self, tasks: list[TCB]):
+        """Associa a fila às tarefas e carrega os estados atuais"""
+        for index, task in enumerate(tasks):
+            if task.index is None:
+                task.index = index
+            self.add(task)
+
+
+    def add(self, task: TCB):
+        """Inclui uma tarefa que passou a fazer parte do processo"""
+        task.queue = self
+        self.update(task, State.NEW)
+
+
+    def update(self, task: TCB, old_state: State):
+        """Chamado pelo TCB a cada transição de estado"""
+        if old_state == State.READY:
+            self.ready_count -= 1
+            if self.aging is not None and task.state != State.READY:
+                self.aging.settle(task)
+        elif old_state == State.RUNNING:
+            self.running.pop(task.index, None)
+
+        if task.state == State.READY:
+            self.ready_count += 1
+            if self.aging is not None:
+                self.aging.enter(task)
+            self.push(task)
+        elif task.state == State.RUNNING:
+            self.running[task.index] = task
+
+
+    def remove(self, task: TCB):
+        """Retira a tarefa da fila (ex.: migração para outro núcleo); as entradas do heap ficam vencidas"""
+        if task.state == State.READY:
+            self.ready_count -= 1
+            if self.aging is not None:
+                self.aging.settle(task)
+        elif task.state == State.RUNNING:
+            self.running.pop(task.index, None)
+
+        task.queue_version += 1
+        task.queue = None
+
+
+    def load(self) -> int:
+        """Tarefas prontas e em execução"""
+        return self.ready_count + len(self.running)
+
+
+    def push(self, task: TCB):
+        """Insere a tarefa pronta no heap"""
+        if self.key is None:
+            return
+
+        task.queue_version += 1
+        if self.on_enqueue is not None:
+            self.on_enqueue(task)
+        heapq.heappush(self.heap, (self.key(task), task.index, task.queue_version, task))
+
+        # reconstrói o heap quando as entradas vencidas dominam
+        if len(self.heap) > 2 * self.ready_count + 64:
+            self.heap = [entry for entry in self.heap if self.valid(entry)]
+            heapq.heapify(self.heap)
+
+
+    def valid(self, entry: tuple) -> bool:
+        _, _, version, task = entry
+        return task.state == State.READY and task.queue_version == version
+
+
+    def peek(self, exclude: TCB = None) -> tuple:
+        """Retorna a entrada (chave, índice, ...) da melhor tarefa pronta diferente de 'exclude'"""
+        heap = self.heap
+
+        while heap and not self.valid(heap[0]):
+            heapq.heappop(heap)
+
+        if not heap:
+            return None
+
+        if heap[0][3] is not exclude:
+            return heap[0]
+
+        # a melhor é a excluída: procura a segunda e devolve a primeira ao heap
+        top = heapq.heappop(heap)
+        entry = self.peek()
+        heapq.heappush(heap, top)
+        return entry
+
+
+    def first_ready(self, exclude: TCB = None) -> TCB:
+        entry = self.peek(exclude)
+        return entry[3] if entry else None
+
+
+    def has_ready(self, exclude: TCB = None) -> bool:
+        if exclude is not None and exclude.state == State.READY:
+            return self.ready_count > 1
+        return self.ready_count > 0
+
+
+    def first_running(self) -> TCB:
+        """Primeira tarefa RUNNING na ordem da lista de tarefas"""
+        if not self.running:
+            return None
+        return self.running[min(self.running)]
+
+
+    def has_active(self) -> bool:
+        """Se existe alguma tarefa RUNNING ou READY"""
+        return self.ready_count > 0 or bool(self.running)
+
+
+    def best(self, offset: int = 0) -> TCB:
+        """Tarefa RUNNING ou READY de menor (chave, índice); 'offset' é somado à chave das tarefas RUNNING"""
+        entry = self.peek()
+        best_key = entry[:2] if entry else None
+        best_task = entry[3] if entry else None
+
+        for index, task in self.running.items():
+            key = (self.key(task) + offset, index)
+            if best_key is None or key < best_key:
+                best_key, best_task = key, task
+
+        return best_task
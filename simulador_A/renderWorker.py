@@ -0,0 +1,153 @@
+import multiprocessing
+import queue
+from tcb import TCB
+from mutex import Synchronization
+from timeline import Timeline
+
+# Desenho do gráfico fora do laço da simulação. O simulador envia quadros
+# imutáveis (apenas os trechos da linha do tempo que mudaram e o texto da
+# tabela) por uma fila limitada e nunca espera pela interface:
+#
+# - se a fila estiver cheia, o quadro é acumulado e enviado junto com o próximo
+# - o processo de desenho junta todos os quadros disponíveis e desenha só o último
+# - o PNG só é gravado nos quadros com save=True
+#
+# O desenho roda em outro processo (e não em uma thread) porque os backends
+# interativos do matplotlib precisam da thread principal de quem cria a janela.
+
+FRAME_QUEUE_SIZE = 4
+POLL_INTERVAL = 0.05    # segundos entre atualizações da janela sem quadros novos
+
+
+class Frame:
+    """Retrato imutável de um passo da simulação"""
+
+    __slots__ = ('ids', 'changes', 'rows', 'colors', 'title', 'save')
+
+    def __init__(self, ids: tuple, changes: dict, rows: tuple, colors: tuple, title: str, save: bool = False):
+        self.ids = ids            # ordem das tarefas no gráfico
+        self.changes = changes    # id -> (primeiro trecho alterado, trechos a partir dele)
+        self.rows = rows          # linhas da tabela (TCB.table_row)
+        self.colors = colors
+        self.title = title
+        self.save = save
+
+
+    @classmethod
+    def capture(cls, timeline: Timeline, tasks: list[TCB], sync: Synchronization, title: str, save: bool = False) -> "Frame":
+        if timeline.changes is None:
+            timeline.watch()
+
+        changes = {
+            task_id: (position, tuple(tuple(run) for run in timeline.runs[task_id][position:]))
+            for task_id, position in timeline.take_changes().items()
+        }
+        return cls(
+            tuple(timeline.keys()),
+            changes,
+            tuple(tuple(task.table_row(sync)) for task in tasks),
+            tuple(task.color for task in tasks),
+            title,
+            save
+        )
+
+
+    def merge(self, frame: "Frame") -> "Frame":
+        """Junta este quadro com o seguinte (o mais novo prevalece)"""
+        changes = dict(self.changes)
+
+        for task_id, (position, runs) in frame.changes.items():
+            if task_id in changes:
+                old_position, old_runs = changes[task_id]
+                if old_position < position:
+                    runs = old_runs[:position - old_position] + runs
+                    position = old_position
+            changes[task_id] = (position, runs)
+
+        return Frame(frame.ids, changes, frame.rows, frame.colors, frame.title, self.save or frame.save)
+
+
+    def apply(self, timeline: Timeline):
+        """Aplica o quadro na cópia da linha do tempo mantida pelo processo de desenho"""
+        if tuple(timeline.keys()) != self.ids:
+            timeline.runs = {task_id: timeline.runs.get(task_id, []) for task_id in self.ids}
+
+        for task_id, (position, runs) in self.changes.items():
+            timeline.replace(task_id, position, runs)
+
+
+def render_loop(frames):
+    """Processo de desenho: consome os quadros até receber None"""
+    import matplotlib.pyplot as plt
+    from matplotlib.gridspec import GridSpec
+    from gantt import GanttRenderer
+
+    plt.ion()
+    fig = plt.figure(figsize=(14, 6))
+    gs = GridSpec(2, 1, height_ratios=[3, 1], figure=fig)
+    renderer = GanttRenderer(fig, fig.add_subplot(gs[0]), fig.add_subplot(gs[1]))
+
+    timeline = Timeline()
+    timeline.watch()
+    running = True
+
+    while running:
+        try:
+            frame = frames.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            fig.canvas.flush_events()
+            continue
+
+        # atrasado: junta todos os quadros já disponíveis e desenha só o resultado
+        while frame is not None:
+            try:
+                next_frame = frames.get_nowait()
+            except queue.Empty:
+                break
+            if next_frame is None:
+                running = False
+                break
+            frame = frame.merge(next_frame)
+
+        if frame is None:
+            break
+
+        frame.apply(timeline)
+        renderer.render(timeline, frame.rows, frame.colors, frame.title, save=frame.save)
+
+    plt.close(fig)
+
+
+class RenderWorker:
+    def __init__(self, size: int = FRAME_QUEUE_SIZE):
+        context = multiprocessing.get_context('spawn')
+        self.frames = context.Queue(size)
+        self.pending: Frame = None     # quadro que não coube na fila
+        self.process = context.Process(target=render_loop, args=(self.frames,), daemon=True)
+        self.process.start()
+
+
+    def push(self, frame: Frame):
+        """Envia o quadro sem bloquear; com a fila cheia, acumula para o próximo envio"""
+        if self.pending is not None:
+            frame = self.pending.merge(frame)
+
+        try:
+            self.frames.put_nowait(frame)
+            self.pending = None
+        except queue.Full:
+            self.pending = frame
+
+
+    def submit(self, timeline: Timeline, tasks: list[TCB], sync: Synchronization, title: str, save: bool = False):
+        self.push(Frame.capture(timeline, tasks, sync, title, save))
+
+
+    def close(self):
+        """Envia o que falta, espera o último desenho (e o PNG) e encerra o processo"""
+        if self.pending is not None:
+            self.frames.put(self.pending)
+            self.pending = None
+
+        self.frames.put(None)
+        self.process.join()
@@ -0,0 +1,169 @@
+import hashlib, json, os, tempfile, zlib
+from functools import lru_cache
+from taskTable import TaskTable, STATIC_COLUMNS
+
+# Cache persistente de resultados, endereçado pelo conteúdo. A chave é o hash
+# da carga de trabalho (colunas fixas da TaskTable), da configuração do
+# escalonador e da versão do simulador (hash dos fontes .py), então qualquer
+# mudança em um deles gera outra chave e nada precisa ser invalidado.
+#
+# O cache é opcional: headless.py, sweep.py e main.py só o consultam com --cache
+# (ou --cache-dir). A chave não distingue o modo lista do modo compacto
+# (TaskTable), pois os dois produzem o mesmo resultado (ver tests/).
+#
+# Cada resultado (métricas, tarefas e linha do tempo em trechos, como na saída
+# json do headless.py) é um arquivo json comprimido com zlib em
+# <diretório>/<2 primeiros dígitos da chave>/<chave>.
+#
+# - vários processos podem compartilhar o diretório: cada arquivo é escrito em
+#   um temporário e publicado com os.replace (atômico), e quem lê nunca vê um
+#   arquivo pela metade
+# - LRU limitado por tamanho: uma leitura atualiza o mtime da entrada e, quando o
+#   total passa de max_bytes, as entradas mais antigas são removidas
+#
+# Exemplo:
+#   cache = ResultCache()
+#   key = cache.key(table, 'SRTF', 2, 0)
+#   result = cache.get(key)
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'escalonador')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+CACHE_ENV = 'ESCALONADOR_CACHE'     # diretório do cache (padrão: DEFAULT_DIRECTORY)
+
+
+@lru_cache(maxsize=None)
+def simulator_version() -> str:
+    """Hash dos fontes do simulador: resultados de outra versão nunca são reaproveitados"""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py'):
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(directory, name), 'rb') as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+def workload_digest(tasks) -> str:
+    """Hash da carga de trabalho (TaskTable ou lista de TCBs ainda não executados)"""
+    table = tasks if isinstance(tasks, TaskTable) else TaskTable.from_tasks(tasks)
+    digest = hashlib.sha256()
+    for name in STATIC_COLUMNS:
+        column = getattr(table, name)
+        digest.update(name.encode('ascii'))
+        digest.update(memoryview(column).cast('B'))
+    for column in (table.ids, table.colors, table.event_locks):
+        digest.update(memoryview(column.offsets).cast('B'))
+        digest.update(column.data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get(CACHE_ENV) or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+
+    def key(self, tasks, algorithm: str, quantum: int, alpha: int, cores: int = 1, migration: str = 'FIXED', steal: str = 'NONE',
+            semaphores: dict[str, int] = None, keep_timeline: bool = True, workload: str = None) -> str:
+        """Chave do resultado; 'workload' é o hash já calculado da carga (workload_digest), se houver"""
+        config = json.dumps([
+            workload or workload_digest(tasks), simulator_version(), algorithm, quantum, alpha, cores,
+            migration, steal, sorted((semaphores or {}).items()), keep_timeline
+        ])
+        return hashlib.sha256(config.encode('utf-8')).hexdigest()
+
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+
+    def get(self, key: str) -> dict:
+        """Resultado salvo (None se ausente ou ilegível); marca a entrada como usada"""
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                result = json.loads(zlib.decompress(file.read()))
+            os.utime(path)
+        except (OSError, ValueError, zlib.error):
+            # ausente, removida por outro processo ou corrompida
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return result
+
+
+    def put(self, key: str, result: dict):
+        """Salva o resultado e remove as entradas mais antigas se o cache passar do limite"""
+        path = self.path(key)
+        data = zlib.compress(json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    file.write(data)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except OSError:
+            # o cache é só um atalho: sem permissão ou espaço, a simulação segue sem ele
+            return
+
+        self.evict()
+
+
+    def entries(self) -> list[tuple]:
+        """(mtime, tamanho, caminho) de cada entrada"""
+        entries = []
+        try:
+            folders = [entry.path for entry in os.scandir(self.directory) if entry.is_dir()]
+        except OSError:
+            return entries
+
+        for folder in folders:
+            try:
+                for entry in os.scandir(folder):
+                    if entry.name.startswith('.tmp-'):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except OSError:
+                continue
+        return entries
+
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até o total caber em max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                # outro processo já removeu
+                pass
+            total -= size
+
+
+    def clear(self):
+        for _, _, path in self.entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
@@ -0,0 +1,62 @@
+from math import inf
+from readyQueue import ReadyQueue
+from tcb import TCB
+from schedulingPolicy import PreemptivePolicy, register_policy
+
+# Round robin: fila FIFO pela ordem em que as tarefas ficam prontas (ingresso,
+# volta do IO ou fim do quantum); a tarefa em execução sai da CPU ao estourar o
+# quantum, se outra estiver esperando, e vai para o fim da fila.
+#
+# policy_data: posição na fila (None enquanto a tarefa não está nela)
+
+
+def position(task: TCB) -> int:
+    return task.policy_data
+
+
+@register_policy
+class RRPolicy(PreemptivePolicy):
+    name = 'RR'
+
+    def __init__(self, scheduler):
+        super().__init__(scheduler)
+        self.order = 0  # última posição distribuída na fila
+
+
+    def ready_key(self):
+        return position
+
+
+    def on_enqueue(self, task: TCB):
+        if task.policy_data is None:
+            self.order += 1
+            task.policy_data = self.order
+
+
+    def dispatched(self, task: TCB):
+        task.policy_data = None
+
+
+    def choose(self, queue: ReadyQueue, running: TCB) -> TCB:
+        if running and (self.scheduler.remaining_quantum_time < self.scheduler.quantum or not queue.has_ready()):
+            return running
+        return queue.first_ready()
+
+
+    def window(self, queue: ReadyQueue, running: TCB) -> tuple[int, callable]:
+        if not queue.has_ready():
+            return inf, self.step_increment
+        return max(0, self.scheduler.quantum - self.scheduler.remaining_quantum_time), self.step_increment
+
+
+    def migrate(self, task: TCB, target: "RRPolicy"):
+        # entra no fim da fila do outro núcleo
+        task.policy_data = None
+
+
+    def get_context(self):
+        return self.order
+
+
+    def set_context(self, context):
+        self.order = context
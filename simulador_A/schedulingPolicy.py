@@ -0,0 +1,186 @@
+import importlib
+from math import inf
+from process import Process
+from readyQueue import ReadyQueue, Aging
+from tcb import TCB, State
+from mutex import Synchronization
+
+# Registro dos algoritmos de escalonamento. Cada algoritmo é uma classe
+# (SchedulingPolicy) registrada pelo nome usado no cabeçalho do arquivo de
+# tarefas; o TaskScheduler cria uma instância por escalonador (por núcleo, no
+# SMP), então o algoritmo pode guardar o próprio estado. Um algoritmo novo é um
+# módulo com a classe decorada por @register_policy, incluído em POLICY_MODULES
+# (ou importado antes de criar o escalonador).
+#
+# A política responde:
+#   ready_key()                 chave da fila de prontas (a menor é a melhor; None = sem heap)
+#   on_enqueue(task)            grava em policy_data o que a chave lê, quando a tarefa entra no heap (None = nada)
+#   execute(process, tasks, sync)   decisão do tick; True quando não há mais tarefas
+#   steady(process, tasks, sync)    (ticks, passo): por quantos ticks seguintes a decisão
+#                                   não muda, e o quantum restante após k ticks (motor por eventos)
+#
+# Os dados por tarefa (vruntime do CFS, nível da MLFQ...) ficam em TCB.policy_data,
+# que faz parte do contexto da tarefa (histórico e modo tabela).
+
+POLICY_MODULES = ('classicPolicies', 'rrPolicy', 'cfsPolicy', 'edfPolicy', 'mlfqPolicy')
+
+POLICIES: dict[str, type] = {}
+
+
+def register_policy(policy: type) -> type:
+    """Registra o algoritmo pelo nome (maiúsculo, como no cabeçalho do arquivo)"""
+    POLICIES[policy.name.upper()] = policy
+    return policy
+
+
+def load_policies():
+    for module in POLICY_MODULES:
+        importlib.import_module(module)
+
+
+def get_policy(name: str) -> type:
+    load_policies()
+    try:
+        return POLICIES[name.upper()]
+    except KeyError:
+        raise ValueError(f'Scheduler não suportado: {name}') from None
+
+
+def policy_names() -> list[str]:
+    """Algoritmos disponíveis, na ordem de registro"""
+    load_policies()
+    return list(POLICIES)
+
+
+class SchedulingPolicy:
+    name: str = None
+    aging: Aging = None     # envelhecimento das tarefas prontas, aplicado pela fila
+    on_enqueue = None       # preparo da tarefa que entra na fila de prontas, antes da chave
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler      # TaskScheduler: quantum, alpha, remaining_quantum_time, dispatch e preempt
+
+
+    def ready_key(self):
+        """Chave da fila de prontas: a tarefa escolhida é a de menor (chave, posição na lista)"""
+        return None
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization) -> bool:
+        raise NotImplementedError
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        """Sem janela estável: o motor executa todos os ticks"""
+        return 0, None
+
+
+    def skip(self, ticks: int):
+        """Ticks creditados em lote pelo motor por eventos (além do passo do quantum)"""
+
+
+    def migrate(self, task: TCB, target: "SchedulingPolicy"):
+        """A tarefa passa para o escalonador de outro núcleo ('target')"""
+
+
+    def get_context(self):
+        """Estado próprio do algoritmo, para o histórico de retrocesso"""
+        return None
+
+
+    def set_context(self, context):
+        pass
+
+
+    # Passos do quantum restante nas janelas estáveis: passo(r, k) é o valor após k ticks
+
+    def step_increment(self, remaining: int, ticks: int) -> int:
+        return remaining + ticks
+
+    def step_keep(self, remaining: int, ticks: int) -> int:
+        return remaining
+
+    def step_one(self, remaining: int, ticks: int) -> int:
+        return 1
+
+    def step_cycle(self, remaining: int, ticks: int) -> int:
+        # reinicia em 1 sempre que alcança o quantum
+        quantum = self.scheduler.quantum
+        if remaining >= quantum:
+            return (ticks - 1) % quantum + 1
+        return (remaining + ticks - 1) % quantum + 1
+
+
+class PreemptivePolicy(SchedulingPolicy):
+    """Base dos algoritmos que escolhem pela fila de prontas: a tarefa atual sai
+    da CPU (READY) quando choose escolhe outra"""
+
+    def choose(self, queue: ReadyQueue, running: TCB) -> TCB:
+        """Tarefa do próximo tick; 'running' (em execução, ou None) continua se for a escolhida"""
+        raise NotImplementedError
+
+
+    def window(self, queue: ReadyQueue, running: TCB) -> tuple[int, callable]:
+        """Janela estável com 'running' em execução e fora de seção crítica"""
+        return 0, None
+
+
+    def dispatched(self, task: TCB):
+        """A tarefa saiu da fila de prontas para a CPU"""
+
+
+    def execute(self, process: Process, tasks: list[TCB], sync: Synchronization) -> bool:
+        scheduler = self.scheduler
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        if task_running and task_running.finished():
+            task_running.terminate(sync)
+            process.task_current = task_running = None
+            scheduler.remaining_quantum_time = 1
+
+        if not queue.has_active():
+            process.task_current = None
+            return False
+
+        # seção crítica: continua até sair dela
+        if task_running and sync.holds(task_running):
+            scheduler.remaining_quantum_time += 1
+            return False
+
+        # suspensa neste tick (IO, ML ou SW)
+        if task_running and task_running.state != State.RUNNING:
+            task_running = None
+
+        task = self.choose(queue, task_running)
+
+        if task is None or task is task_running:
+            scheduler.remaining_quantum_time += 1
+            return False
+
+        if task_running:
+            scheduler.preempt(task_running, State.READY, sync)
+        scheduler.dispatch(process, task, sync)
+        self.dispatched(task)
+        scheduler.remaining_quantum_time = 1
+
+        return False
+
+
+    def steady(self, process: Process, tasks: list[TCB], sync: Synchronization) -> tuple[int, callable]:
+        queue: ReadyQueue = process.ready_queue
+        task_running: TCB = process.task_current
+
+        if task_running and task_running.finished():
+            return 0, None
+
+        if not queue.has_active():
+            return (inf, self.step_keep) if not task_running else (0, None)
+
+        if task_running and sync.holds(task_running):
+            return inf, self.step_increment
+
+        if not task_running or task_running.state != State.RUNNING:
+            return 0, None
+
+        return self.window(queue, task_running)
@@ -0,0 +1,305 @@
+import heapq
+from enum import Enum
+from process import Process
+from readyQueue import ReadyQueue, Aging
+from taskScheduler import TaskScheduler
+from tcb import TCB, State
+from mutex import Synchronization
+from timeline import Timeline
+
+# Simulação com vários núcleos (SMP). Cada núcleo tem o próprio Process (tarefa
+# atual e tarefas do núcleo), a própria fila de prontas e o próprio
+# TaskScheduler, então decide com os mesmos executores do uniprocessador (com
+# um núcleo o escalonamento é o mesmo). O SMPScheduler:
+#
+# - coloca cada tarefa que ingressa no núcleo menos carregado
+# - migra as tarefas que acordam, conforme a MigrationPolicy
+# - deixa núcleos ociosos roubarem tarefas prontas, conforme a StealPolicy
+# - registra uma linha do tempo por núcleo (lanes) com a cor da tarefa em execução
+#
+# Cada núcleo decide em O(log n) (fila de prontas com heap), o roubo também
+# (com envelhecimento, por um segundo heap na ordem de ingresso) e a escolha do
+# núcleo percorre apenas os núcleos, então o tick custa O(núcleos · log n).
+#
+# Exemplo:
+#   python headless.py test.txt --cores 4 --migration WAKE --steal IDLE
+
+LANE_PREFIX = 'CPU'
+
+
+class MigrationPolicy(Enum):
+    FIXED = "FIXED"     # a tarefa fica no núcleo em que ingressou
+    WAKE = "WAKE"       # ao acordar, vai para o núcleo menos carregado
+
+    def get_wake_core(self, scheduler: "SMPScheduler", core: "Core") -> "Core":
+        """Núcleo da tarefa que acabou de acordar em 'core'"""
+        if self is MigrationPolicy.WAKE:
+            target = scheduler.least_loaded()
+            # só migra se equilibra a carga (o núcleo atual já conta a tarefa)
+            if target.load() + 1 < core.load():
+                return target
+        return core
+
+
+class StealPolicy(Enum):
+    NONE = "NONE"       # sem roubo de tarefas
+    IDLE = "IDLE"       # núcleo ocioso rouba a melhor tarefa pronta do núcleo mais carregado
+
+    def get_victim(self, scheduler: "SMPScheduler", core: "Core") -> "Core":
+        """Núcleo de onde 'core' rouba uma tarefa (None = não rouba)"""
+        if self is StealPolicy.IDLE and core.idle():
+            victim = scheduler.busiest()
+            if victim is not core and victim.spare() > 0:
+                return victim
+        return None
+
+
+class CoreQueue(ReadyQueue):
+    """Fila de prontas de um núcleo; avisa o SMPScheduler quando uma tarefa acorda ou termina.
+    Com envelhecimento mantém também um heap por ordem de ingresso (arrival), de onde o roubo tira a tarefa."""
+
+    def __init__(self, core: "Core", scheduler: "SMPScheduler", key=None, aging: Aging = None, on_enqueue=None):
+        super().__init__(key, aging, on_enqueue)
+        self.core = core
+        self.scheduler = scheduler
+        self.arrival: list[tuple] = []      # (índice, versão, tarefa), só com envelhecimento
+
+
+    def push(self, task: TCB):
+        super().push(task)
+        if self.aging is None:
+            return
+
+        # mesma versão da entrada do heap principal: as duas vencem juntas
+        heapq.heappush(self.arrival, (task.index, task.queue_version, task))
+        if len(self.arrival) > 2 * self.ready_count + 64:
+            self.arrival = [entry for entry in self.arrival if self.arrived(entry)]
+            heapq.heapify(self.arrival)
+
+
+    def arrived(self, entry: tuple) -> bool:
+        _, version, task = entry
+        return task.state == State.READY and task.queue_version == version
+
+
+    def first_arrived(self) -> TCB:
+        """Tarefa pronta que ingressou primeiro (menor índice)"""
+        arrival = self.arrival
+        while arrival and not self.arrived(arrival[0]):
+            heapq.heappop(arrival)
+        return arrival[0][2] if arrival else None
+
+
+    def update(self, task: TCB, old_state: State):
+        super().update(task, old_state)
+
+        if task.state == State.TERMINATED:
+            self.core.discard(task)
+        elif old_state == State.TERMINATED:
+            # acordada pelo mutex depois de terminar: volta para a lista, como no uniprocessador
+            self.core.process.tasks[task] = None
+        elif old_state == State.SUSPENDED and task.state == State.READY:
+            self.scheduler.wake(task, self.core)
+
+
+class ArrivalQueue:
+    """Fila de prontas do processo: as tarefas que ficam prontas pela primeira vez vão para um núcleo"""
+
+    aging = None
+
+    def __init__(self, scheduler: "SMPScheduler"):
+        self.scheduler = scheduler
+
+
+    def attach(self, tasks: list[TCB]):
+        for index, task in enumerate(tasks):
+            if task.index is None:
+                task.index = index
+            self.add(task)
+
+
+    def add(self, task: TCB):
+        task.queue = self
+        self.update(task, State.NEW)
+
+
+    def update(self, task: TCB, old_state: State):
+        if task.state == State.READY:
+            self.scheduler.place(task)
+
+
+class Core:
+    def __init__(self, id: int, scheduler: "SMPScheduler"):
+        self.id = id
+        self.lane = f'{LANE_PREFIX}{id}'
+        self.scheduler = TaskScheduler(scheduler.policy.name, scheduler.quantum, scheduler.alpha)
+        policy = self.scheduler.policy
+        self.queue = CoreQueue(self, scheduler, policy.ready_key(), policy.aging, policy.on_enqueue)
+        self.process = Process()
+        self.process.attach_queue(self.queue)
+        # tarefas do núcleo: dicionário usado como conjunto (entrada e saída em O(1) na migração);
+        # as decisões vêm da fila, e quem percorre as tarefas (ex.: boost do MLFQ) não depende da ordem
+        self.process.tasks = {}
+
+        self.busy_ticks = 0
+        self.dispatches = 0
+        self.migrations = 0         # tarefas recebidas de outros núcleos
+        self.steals = 0             # das quais roubadas por este núcleo
+        self.last: TCB = None       # última tarefa em execução (para contar as trocas)
+
+
+    def load(self) -> int:
+        return self.queue.load()
+
+
+    def idle(self) -> bool:
+        return self.queue.load() == 0
+
+
+    def spare(self) -> int:
+        """Tarefas prontas que não vão rodar neste núcleo no próximo tick"""
+        return self.queue.ready_count - (0 if self.queue.running else 1)
+
+
+    def running(self) -> TCB:
+        return self.queue.first_running()
+
+
+    def first_ready(self) -> TCB:
+        """Melhor tarefa pronta do núcleo; com envelhecimento (PRIOPEnv), a primeira pronta na ordem de ingresso"""
+        if self.queue.aging is None:
+            return self.queue.first_ready()
+        return self.queue.first_arrived()
+
+
+    def add(self, task: TCB):
+        self.process.tasks[task] = None
+        self.queue.add(task)
+
+
+    def discard(self, task: TCB):
+        """Retira a tarefa do núcleo"""
+        self.process.tasks.pop(task, None)
+
+
+    def remove(self, task: TCB):
+        """Retira a tarefa do núcleo (migração)"""
+        self.queue.remove(task)
+        self.discard(task)
+        if self.process.task_current is task:
+            self.process.task_current = None
+
+
+class SMPScheduler(TaskScheduler):
+    def __init__(self, type_scheduler: str, quantum: int = None, alpha: int = None, cores: int = 2,
+                 migration: str = 'FIXED', steal: str = 'NONE'):
+        super().__init__(type_scheduler, quantum, alpha)
+        if cores < 1:
+            raise ValueError('a quantidade de núcleos deve ser ao menos 1')
+
+        self.migration = MigrationPolicy[migration]
+        self.steal = StealPolicy[steal]
+        self.cores = [Core(id, self) for id in range(cores)]
+        self.lanes = Timeline(core.lane for core in self.cores)
+        self.arrivals = ArrivalQueue(self)
+
+
+    def attach(self, process: Process):
+        """As tarefas do processo entram nos núcleos quando ficam prontas"""
+        if process.ready_queue is None:
+            process.attach_queue(self.arrivals)
+
+
+    def least_loaded(self) -> Core:
+        return min(self.cores, key=Core.load)
+
+
+    def busiest(self) -> Core:
+        return max(self.cores, key=Core.spare)
+
+
+    def place(self, task: TCB):
+        """Tarefa que ingressou: vai para o núcleo menos carregado"""
+        self.least_loaded().add(task)
+
+
+    def migrate(self, task: TCB, source: Core, target: Core):
+        source.remove(task)
+        source.scheduler.policy.migrate(task, target.scheduler.policy)
+        target.add(task)
+        target.migrations += 1
+
+
+    def wake(self, task: TCB, core: Core):
+        target = self.migration.get_wake_core(self, core)
+        if target is not core:
+            self.migrate(task, core, target)
+
+
+    def balance(self):
+        """Núcleos ociosos roubam uma tarefa pronta (StealPolicy)"""
+        for core in self.cores:
+            victim = self.steal.get_victim(self, core)
+            if victim is not None:
+                self.migrate(victim.first_ready(), victim, core)
+                core.steals += 1
+
+
+    def record(self, ticks: int):
+        """Registra 'ticks' ticks na linha do tempo de cada núcleo"""
+        for core in self.cores:
+            task = core.running()
+            self.lanes.append(core.lane, task.color if task else 'n', ticks)
+
+            if task:
+                core.busy_ticks += ticks
+                if task is not core.last:
+                    core.dispatches += 1
+            core.last = task
+
+
+    def execute(self, process: Process, sync: Synchronization) -> bool:
+        """Executa o escalonador de cada núcleo"""
+        self.attach(process)
+        self.balance()
+
+        for core in self.cores:
+            core.scheduler.execute(core.process, sync)
+
+        self.record(1)
+        return False
+
+
+    def steady_ticks(self, process: Process, sync: Synchronization) -> int:
+        """Ticks seguintes em que nenhum núcleo troca de tarefa"""
+        self.attach(process)
+        if any(self.steal.get_victim(self, core) for core in self.cores):
+            return 0
+        return min(core.scheduler.steady_ticks(core.process, sync) for core in self.cores)
+
+
+    def skip(self, process: Process, sync: Synchronization, ticks: int):
+        for core in self.cores:
+            core.scheduler.skip(core.process, sync, ticks)
+        self.record(ticks)
+
+
+    def running(self, process: Process) -> list[TCB]:
+        return [task for core in self.cores for task in core.scheduler.running(core.process)]
+
+
+    def core_metrics(self) -> list[dict]:
+        """Utilização e trocas de cada núcleo"""
+        total = self.lanes.length()
+        return [
+            {
+                'core': core.id,
+                'busy_ticks': core.busy_ticks,
+                'idle_ticks': total - core.busy_ticks,
+                'utilization': core.busy_ticks / total if total else 0.0,
+                'dispatches': core.dispatches,
+                'migrations': core.migrations,
+                'steals': core.steals
+            }
+            for core in self.cores
+        ]
@@ -0,0 +1,189 @@
+import argparse, csv, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from workloadFile import load_workload
+from schedulingPolicy import policy_names
+from engine import simulate
+from smpScheduler import MigrationPolicy, StealPolicy
+from taskTable import TaskTable
+from timeline import Timeline
+from headless import build_result
+from resultCache import ResultCache, workload_digest
+
+# Varredura de parâmetros: executa cada combinação de arquivo x algoritmo x
+# quantum x alpha x núcleos em um pool de processos e escreve uma linha por combinação,
+# à medida que os resultados chegam (na ordem da grade).
+#
+# Cada arquivo (.txt ou binário) é lido uma única vez para a tabela compacta
+# (TaskTable), que é enviada a cada processo uma só vez, pelo inicializador do
+# pool. As tarefas da fila de trabalho são apenas índices e parâmetros.
+#
+# Com o cache de resultados (--cache, resultCache.py), compartilhado entre os
+# processos e com o headless.py, as combinações já simuladas saem direto do disco.
+#
+# Exemplo:
+#   python sweep.py test.txt default_file.txt -a FCFS SRTF PRIOP -q 1 2 3 4 --alpha 0 1 -j 8
+#   python sweep.py test.txt -c 1 2 4 8 --steal IDLE
+
+COLUMNS = ['file', 'algorithm', 'quantum', 'alpha', 'cores', 'time', 'turnaround_time', 'waiting_time', 'context_switches', 'utilization', 'wall_time', 'cached']
+
+# cargas de trabalho do processo, políticas SMP e cache (preenchidos por load_workloads)
+WORKLOADS: list[TaskTable] = []
+POLICIES: tuple[str, str] = ('FIXED', 'NONE')
+CACHE: ResultCache = None
+DIGESTS: list[str] = []     # hash de cada carga de trabalho (chave do cache)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Varredura paralela de algoritmos, quantum e alpha')
+    parser.add_argument('files', nargs='+', help='arquivos .txt com o cabeçalho (algoritmo;quantum;alpha) e as tarefas, ou binários (workloadFile.py)')
+    parser.add_argument('-a', '--algorithms', nargs='+', type=str.upper, choices=policy_names(), help='algoritmos (padrão: todos)')
+    parser.add_argument('-q', '--quanta', nargs='+', type=int, help='valores de quantum (padrão: o do arquivo)')
+    parser.add_argument('--alpha', nargs='+', type=int, dest='alphas', help='valores de alpha (padrão: o do arquivo)')
+    parser.add_argument('-c', '--cores', nargs='+', type=int, default=[1], help='quantidades de núcleos (padrão: 1)')
+    parser.add_argument('--migration', type=str.upper, choices=[item.name for item in MigrationPolicy], default='FIXED', help='política de migração com vários núcleos')
+    parser.add_argument('--steal', type=str.upper, choices=[item.name for item in StealPolicy], default='NONE', help='roubo de tarefas com vários núcleos')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='quantidade de processos (padrão: núcleos disponíveis)')
+    parser.add_argument('-f', '--format', choices=['csv', 'json'], default='csv', help='csv ou uma linha json por combinação (padrão: csv)')
+    parser.add_argument('-o', '--output', help='arquivo de saída (padrão: saída padrão)')
+    parser.add_argument('--cache', action='store_true', help='consulta e grava o cache de resultados (resultCache.py); sem a opção sempre simula')
+    parser.add_argument('--cache-dir', help='diretório do cache de resultados, implica --cache (padrão: $ESCALONADOR_CACHE ou ~/.cache/escalonador)')
+    return parser
+
+
+def load_workloads(workloads: list[TaskTable], policies: tuple[str, str] = ('FIXED', 'NONE'), cache: ResultCache = None, digests: list[str] = None):
+    """Inicializador do pool: recebe as cargas de trabalho (e as políticas de migração e roubo e o cache) uma única vez por processo"""
+    global WORKLOADS, POLICIES, CACHE, DIGESTS
+    WORKLOADS = workloads
+    POLICIES = policies
+    CACHE = cache
+    DIGESTS = digests or []
+
+
+def run_job(job: tuple) -> dict:
+    """Executa uma combinação (índice do arquivo, algoritmo, quantum, alpha, núcleos)"""
+    workload, algorithm, quantum, alpha, cores = job
+    migration, steal = POLICIES
+
+    started = time.perf_counter()
+
+    if CACHE is None:
+        # a tabela pode ser reaproveitada: os TCBs são criados a partir das colunas
+        # fixas e toda tarefa grava de volta os seus campos ao terminar
+        _, task_scheduler, end, timeline = simulate(algorithm, quantum, alpha, WORKLOADS[workload], cores=cores, migration=migration, steal=steal,
+                                                    statistics=False)
+        return job_row(algorithm, quantum, alpha, cores, end, task_scheduler.turnaround_time, task_scheduler.waiting_time, timeline,
+                       time.perf_counter() - started, False)
+
+    key = CACHE.key(None, algorithm, quantum, alpha, cores, migration, steal, workload=DIGESTS[workload])
+    result = CACHE.get(key)
+    cached = result is not None
+
+    if not cached:
+        # mesmo resultado que o headless.py grava, para as entradas servirem aos dois
+        process, task_scheduler, end, timeline = simulate(algorithm, quantum, alpha, WORKLOADS[workload], cores=cores, migration=migration, steal=steal)
+        result = build_result(algorithm, quantum, alpha, process, task_scheduler, end, timeline)
+        CACHE.put(key, result)
+
+    timeline = Timeline()
+    for task_id, runs in result['timeline'].items():
+        timeline.replace(task_id, 0, runs)
+
+    return job_row(algorithm, quantum, alpha, cores, result['time'], result['turnaround_time'], result['waiting_time'], timeline,
+                   time.perf_counter() - started, cached)
+
+
+def job_row(algorithm: str, quantum: int, alpha: int, cores: int, end: int, turnaround_time: float, waiting_time: float, timeline: Timeline,
+            wall_time: float, cached: bool) -> dict:
+    return {
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'alpha': alpha,
+        'cores': cores,
+        'time': end,
+        'turnaround_time': turnaround_time,
+        'waiting_time': waiting_time,
+        'context_switches': timeline.dispatches(),
+        'utilization': round(timeline.running_ticks() / (end * cores), 6) if end else 0.0,
+        'wall_time': round(wall_time, 6),
+        'cached': cached
+    }
+
+
+def build_jobs(headers: list[tuple], algorithms: list[str], quanta: list[int], alphas: list[int], cores: list[int] = None) -> list[tuple]:
+    """Grade de combinações; sem valores na linha de comando usa o cabeçalho de cada arquivo"""
+    jobs = []
+    for workload, (_, quantum, alpha) in enumerate(headers):
+        for algorithm in algorithms:
+            for job_quantum in quanta or [quantum]:
+                for job_alpha in alphas or [alpha]:
+                    for job_cores in cores or [1]:
+                        jobs.append((workload, algorithm, job_quantum, job_alpha, job_cores))
+    return jobs
+
+
+def run_sweep(files: list[str], algorithms: list[str] = None, quanta: list[int] = None, alphas: list[int] = None, jobs: int = None,
+              cores: list[int] = None, migration: str = 'FIXED', steal: str = 'NONE', cache: ResultCache = None):
+    """Gera (arquivo, resultado) para cada combinação, na ordem da grade ('cache': resultados já simulados)"""
+    headers, workloads = [], []
+    for file in files:
+        try:
+            algorithm, quantum, alpha, table = load_workload(file)
+        except (OSError, ValueError) as error:
+            raise ValueError(f'{file}: {error}') from error
+
+        headers.append((algorithm, quantum, alpha))
+        workloads.append(table)
+
+    if cores and min(cores) < 1:
+        raise ValueError('a quantidade de núcleos deve ser ao menos 1')
+
+    grid = build_jobs(headers, algorithms or policy_names(), quanta, alphas, cores)
+    policies = (migration, steal)
+    digests = [workload_digest(table) for table in workloads] if cache else None
+    jobs = max(1, jobs or os.cpu_count())
+
+    if jobs == 1:
+        load_workloads(workloads, policies, cache, digests)
+        for job, result in zip(grid, map(run_job, grid)):
+            yield files[job[0]], result
+        return
+
+    # lotes maiores reduzem a comunicação entre processos; 4 lotes por processo equilibram a carga
+    chunksize = max(1, len(grid) // (4 * jobs))
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=load_workloads, initargs=(workloads, policies, cache, digests)) as executor:
+        for job, result in zip(grid, executor.map(run_job, grid, chunksize=chunksize)):
+            yield files[job[0]], result
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+
+    try:
+        if args.format == 'csv':
+            writer = csv.DictWriter(output, fieldnames=COLUMNS)
+            writer.writeheader()
+
+        cache = ResultCache(args.cache_dir) if args.cache or args.cache_dir is not None else None
+        for file, result in run_sweep(args.files, args.algorithms, args.quanta, args.alphas, args.jobs, args.cores, args.migration, args.steal, cache):
+            row = {'file': file, **result}
+            if args.format == 'csv':
+                writer.writerow(row)
+            else:
+                output.write(json.dumps(row, ensure_ascii=False) + '\n')
+            output.flush()
+
+    except ValueError as error:
+        print(f'ERRO | {error}', file=sys.stderr)
+        return 1
+
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+from tcb import TCB
+import random
+
+DEFAULT_ALGORITHM = "FCFS"
+DEFAULT_QUANTUM = 2
+DEFAULT_ALPHA = 1
+
+RANDOM_INIT = 0
+RANDOM_END = 10
+
+# eventos de sincronização, na ordem em que o tipo é reconhecido
+SYNC_EVENTS = ['ML', 'SW', 'SS', 'MU']
+
+
+def read_file(path: str) -> tuple[str, int, int, list[TCB]]:
+    """Lê o arquivo .txt com o algoritmo, o quantum, o alpha e as tarefas"""
+    with open(path, 'r', encoding="utf-8") as file:
+        lines = file.readlines()
+
+    return parse_lines(lines)
+
+
+def parse_header(line: str) -> tuple[str, int, int]:
+    """Cabeçalho 'algoritmo;quantum;alpha' (campos vazios usam os valores padrão)"""
+    items = line.strip().split(';')
+    algorithm = items[0].upper() if items[0] else DEFAULT_ALGORITHM
+    quantum = int(items[1]) if items[1] else DEFAULT_QUANTUM
+    alpha = int(items[2]) if len(items) >= 3 and items[2] else DEFAULT_ALPHA
+    return algorithm, quantum, alpha
+
+
+def parse_event(item: str) -> dict:
+    """'IO:início-duração', 'ML:início', 'MU:início', 'SW:início' ou 'SS:início'.
+    O id do mutex/semáforo vem logo após o código (ex.: 'MLa:3' e 'MUa:5'); sem id é o mutex global."""
+    event_type, time_event = item.split(':')
+    if 'IO' in event_type:
+        start_s, dur_s = time_event.split('-')
+        return {
+            'type': event_type,
+            'start': int(start_s),
+            'duration': int(dur_s),
+            'duration_current': 0,
+            'lock': ''
+        }
+
+    # ML, SW, SS ou MU (tipos desconhecidos são tratados como MU)
+    code = next((code for code in SYNC_EVENTS if code in event_type), 'MU')
+    return {
+        'type': code,
+        'start': int(time_event),
+        'duration': 1,               # opcional — para marcar ocorrência
+        'duration_current': 0,
+        'lock': event_type.replace(code, '', 1) if code in event_type else ''
+    }
+
+
+def parse_task(line: str) -> TCB:
+    """Converte uma linha 'id;cor;ingresso;duração;prioridade;eventos...' no TCB"""
+    items = [item.strip() for item in line.strip().split(';')]
+    if len(items) < 5:
+        raise ValueError(f'esperados ao menos 5 campos, encontrados {len(items)}')
+
+    return TCB(
+        items[0],               # pid
+        "#" + items[1],         # color
+        int(items[2]),          # ingresso
+        int(items[3]),          # duração
+        int(items[4]),          # prioridade
+        [parse_event(item) for item in items[5:] if item]
+    )
+
+
+def iter_tasks(lines, first_line: int = 2):
+    """Gera os TCBs linha a linha (sem o cabeçalho); uma linha inválida gera ValueError com o número da linha"""
+    for number, line in enumerate(lines, start=first_line):
+        if not line.strip():
+            continue
+        try:
+            yield parse_task(line)
+        except (ValueError, IndexError) as e:
+            raise ValueError(f'linha {number}: {e}') from e
+
+
+def iter_file_tasks(path: str):
+    with open(path, 'r', encoding="utf-8") as file:
+        next(file, None)    # cabeçalho
+        yield from iter_tasks(file)
+
+
+def stream_file(path: str):
+    """Como read_file, mas as tarefas são lidas sob demanda (gerador) e erros não são substituídos por tarefas aleatórias"""
+    with open(path, 'r', encoding="utf-8") as file:
+        algorithm, quantum, alpha = parse_header(file.readline())
+
+    return algorithm, quantum, alpha, iter_file_tasks(path)
+
+
+def parse_lines(lines: list[str]) -> tuple[str, int, int, list[TCB]]:
+    """Converte as linhas do arquivo (cabeçalho + uma tarefa por linha) na lista de tarefas"""
+
+    # lê a primeira linha com o tipo do algoritmo e o valor do quantum
+    algorithm, quantum, alpha = parse_header(lines[0])
+
+    tasks: list[TCB] = []
+
+    # inicializa as tarefas e adiciona dentro do processo
+    try:
+
+        for task in lines[1:]:
+
+            if not task and not task.strip():
+                continue
+
+            items: list[str] = [item.strip() for item in task.strip().split(';')]
+
+            events: list[dict] = []
+            
+            for item in items[5:]:
+                if not item:
+                    continue
+                events.append(parse_event(item))
+
+            try:
+                if len(items) == 3:
+                    # significa que o usuário não adicionou uma cor
+                    if '#' not in items[1]:
+                        tcb: TCB = TCB(
+                            items[0],       # pid
+                            "#{:06x}".format(random.randint(0, 0xFFFFFF)),       # color
+                            int(items[1]),  # ingresso
+                            int(items[2]),  # duração
+                            int(items[3]),  # prioridade
+                            events
+                        )
+                else:            
+                    tcb: TCB = TCB(
+                        items[0],       # pid
+                        "#" + items[1],       # color
+                        int(items[2]),  # ingresso
+                        int(items[3]),  # duração
+                        int(items[4]),  # prioridade
+                        events
+                    )
+
+            except Exception as e:
+                print(f'ERRO | def parse_lines | {e}')
+                tcb: TCB = TCB(
+                    f"t{len(tasks) + 1:02d}",                       # pid
+                    "#{:06x}".format(random.randint(0, 0xFFFFFF)),  # color
+                    random.randint(RANDOM_INIT, RANDOM_END),        # ingresso
+                    random.randint(RANDOM_INIT, RANDOM_END),        # duração
+                    random.randint(RANDOM_INIT, RANDOM_END),        # prioridade
+                    events
+                )
+
+
+            tasks.append(tcb)
+
+    except Exception as e:
+        print(f'ERRO | def parse_lines | {e}')
+        return
+
+    return algorithm, quantum, alpha, tasks
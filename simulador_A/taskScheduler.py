@@ -1,30 +1,14 @@
-from enum import Enum
+from time import perf_counter
 from process import Process
 from tcb import TCB, State
-from mutex import Mutex
+from mutex import Synchronization
+from readyQueue import ReadyQueue
+from metrics import StreamingMetrics
+from schedulingPolicy import SchedulingPolicy, get_policy
 
 # A classe Escalonador de Tarefas(Task Scheduler) é quem decide
-# a ordem de execução das tarefas
-
-# Tipos de Tarefas: orientadas a processamento (CPU-bound tasks)
-class SchedulerSystemType(Enum):
-    FCFS = "FCFS"   # cooperativo
-    SRTF = "SRTF"   # preemptivo
-    PRIOP = "PRIOP" # preemptivo por prioridade
-    PRIOPENV = "PRIOPENV" # preemptivo por prioridade com envelhecimento
-
-    def get_executor(self, scheduler: "TaskScheduler"):
-        if self is SchedulerSystemType.FCFS:
-            return scheduler._TaskScheduler__execute_fcfs
-        elif self is SchedulerSystemType.SRTF:
-            return scheduler._TaskScheduler__execute_srtf
-        elif self is SchedulerSystemType.PRIOP:
-            return scheduler._TaskScheduler__execute_priop
-        elif self is SchedulerSystemType.PRIOPENV:
-            return scheduler._TaskScheduler__execute_prioenv
-        else:
-            raise ValueError(f"Scheduler não suportado: {self}")
-
+# a ordem de execução das tarefas; o algoritmo (SchedulingPolicy) vem do
+# registro em schedulingPolicy.py, pelo nome do cabeçalho do arquivo
 
 class TaskScheduler:
     def __init__(self, type_scheduler: str, quantum: int = None, alpha: int = None):
@@ -35,267 +19,117 @@ class TaskScheduler:
         self.quantum:int = quantum
         self.alpha:int = alpha
         self.remaining_quantum_time: int = 0
-        self.type_scheduler = SchedulerSystemType[type_scheduler]
+        self.policy: SchedulingPolicy = get_policy(type_scheduler)(self)
+        self.metrics: StreamingMetrics = None   # estatísticas incrementais (inscritas nos ganchos)
 
 
-    def task_swap(self, process: Process, task: TCB, mutex: Mutex):
+    def task_swap(self, process: Process, task: TCB, sync: Synchronization):
         """Faz a troca de contexto"""
         # se já está em execução, nada a fazer
         if process.task_current == task:
             return
 
-        # se o mutex está travado por outro TCB, a tarefa candidata não pode rodar
-        if mutex.locked and mutex.owner is not None and mutex.owner != task:
+        # se algum mutex está travado por outro TCB, a tarefa candidata não pode rodar
+        if sync.blocked(task):
             # não podemos colocar 'task' para RUNNING — ela fica READY
             return
 
         # coloca a tarefa atualmente em CPU de volta para READY (se aplicável)
         if process.task_current and process.task_current.state not in (State.TERMINATED, State.SUSPENDED):
-            process.task_current.state = State.READY
+            self.preempt(process.task_current, State.READY, sync)
 
         # troca: coloca a candidata para RUNNING
+        self.dispatch(process, task, sync)
+
+
+    def dispatch(self, process: Process, task: TCB, sync: Synchronization):
+        """Coloca a tarefa na CPU (avisa on_dispatch se ela não estava em execução)"""
+        old_state = task.state
         task.state = State.RUNNING
         process.task_current = task
 
+        on_dispatch = sync.hooks.on_dispatch
+        if on_dispatch and old_state != State.RUNNING:
+            on_dispatch(task)
 
-    def __execute_fcfs(self, process: Process, tasks: list[TCB], mutex:Mutex) -> bool:
-        """Execução do algoritmo FCFS"""
-        task_running: TCB = process.task_current
-
-        # continua até a que a tarefa saia da seção crítica
-        if task_running and mutex.owner and mutex.owner == task_running:
-            #if task_running == State.RUNNING:
-            self.remaining_quantum_time += 1
-            return False
-
-        task_running: TCB = next((task for task in tasks if task.state == State.RUNNING), None)
-
-        # Se não tiver task rodando, tenta encontrar uma tarefa pronta
-        if not task_running:
-            self.remaining_quantum_time = 1
-            task_ready: TCB = next((task for task in tasks if task.state == State.READY), None)
-            if not task_ready: # se não tiver tarefa pronta verifica se existe alguma tarefa que está por vir
-                task: TCB = next((task for task in tasks if task.state == State.NEW or State.SUSPENDED), None)
-                if not task:
-                    return True # Não existe mais tarefas para ser processada
-                
-                return False # aguarda a tarefa ficar pronta
-            
-            # coloca a tarefa para rodar
-            task_ready.state = State.RUNNING
-            process.task_current = task_ready
-            
-            return False
-
-        if self.remaining_quantum_time >= self.quantum:
-            self.remaining_quantum_time = 1
-
-            task_running.state = State.READY # coloca a tarefa na fila de pronta
-
-            # pega a próxima tarefa ques está pronta e que não é a mesma que rodou na última execução
-            task_ready: TCB = next((task for task in tasks if task.state == State.READY and task != task_running), None)
-
-            # A tarefa continua rodando, pois não tem nenhuma tarefa pronta disponível no momento
-            if not task_ready:
-                task_running.state = State.RUNNING 
-                return False
-            
-            # troca a tarefa para a próxima até estourar o quantum
-            task_ready.state = State.RUNNING
-            process.task_current = task_ready
-
-            return False
-        
-        self.remaining_quantum_time += 1
-
-        return False
-
-
-    def __execute_srtf(self, process: Process, tasks: list[TCB], mutex:Mutex) -> bool:
-        """Execução do algoritmo SRTF"""
-        task_running: TCB = process.task_current
-
-        if task_running and task_running.finished():
-            task_running.state = State.TERMINATED
-            process.task_current = None
-            task_running = process.task_current
-            self.remaining_quantum_time = 1
-
-        tasks = [task for task in tasks if task.state == State.RUNNING or task.state == State.READY]
-        
-        if not tasks: # significa que tem tarefa suspensa ou ainda falta carregar na memória
-            process.task_current = None
-            return False
-        
-        # se a tarefa atual pertence a seção crítica, deixa ela rodar até sair da seção
-        if task_running and mutex.owner and mutex.owner == task_running:
-            #if task_running == State.RUNNING:
-            self.remaining_quantum_time += 1
-            return False
-
-        # faz a troca de tarefa se estourou o quantum
-        if task_running and self.remaining_quantum_time >= self.quantum:
-
-            # procura todas as tarefas prontas
-            tasks_ready = [task for task in tasks if task.state == State.READY and task != task_running]
-
-            # a tarefa atual continua rodando, pois ainda não existe tarefas prontas
-            if not tasks_ready:
-                self.remaining_quantum_time += 1
-                return False
-            
-            tasks = tasks_ready
-        
-        # if task_running.finished():
-        #     tasks_ready = [task for task in tasks if task.state == State.READY and task != task_running]
-
-        #     if 
-
-
-        # procura a tarefa de menor tempo de duração restante
-        # se tiver mais de uma tarefa, pega a primeira delas
-        task = min(tasks, key=lambda task: task.duration - task.duration_current)
-
-        if task == task_running:
-            self.remaining_quantum_time += 1
-            return False
-        elif task_running:
-            task_running.state = State.SUSPENDED
-        
-        self.task_swap(process, task, mutex)
-        self.remaining_quantum_time = 1
-
-        return False
-    
-
-    def __execute_priop(self, process: Process, tasks: list[TCB], mutex:Mutex):
-        """Execução do algoritmo PRIOP"""
-        task_running: TCB = process.task_current
-
-        # Faz a verificação se a tarefa que está rodando ainda não terminou
-        if task_running and task_running.finished():
-            task_running.state = State.TERMINATED
-            process.task_current = None
-            task_running = process.task_current
-            self.remaining_quantum_time = 1
-
-        tasks = [task for task in tasks if task.state == State.RUNNING or task.state == State.READY]
-
-        if not tasks: 
-            process.task_current = None
-            return False
-        
-        task_running: TCB = process.task_current
-
-        # se a tarefa estiver na seção crítica, continua até que ela saia da seção
-        if task_running and mutex.owner and mutex.owner.id == task_running.id:
-            #if task_running == State.RUNNING:
-            self.remaining_quantum_time += 1
-            return False
-
-        if task_running and self.remaining_quantum_time >= self.quantum:
-
-            # tenta procurar outra tarefa pronta para executar
-            tasks_ready = [task for task in process.tasks if task.state == State.READY and task_running != task]
-            
-            if not tasks_ready:
-                # coloca a última tarefa para executar novamente, pois não encontrou nenhuma tarefa pronta
-                self.remaining_quantum_time += 1
-                return False
-            
-            task_running.state = State.SUSPENDED
-            tasks = tasks_ready
-
-
-        # se existir outra tarefa pronta e com prioridade maior que a tarefa atual, faz a troca
-        task = max(tasks, key=lambda task: task.priority_init)
-        if task != task_running:
-            self.remaining_quantum_time = 1
-            self.task_swap(process, task, mutex)
-        else:
-            task_running.state = State.RUNNING
-            self.remaining_quantum_time += 1
-
-        return False
-
-        
-    def __execute_prioenv(self, process: Process, tasks: list[TCB], mutex: Mutex):
-        """Executa o algoritmo PRIOEnv"""
-
-        task_running: TCB = process.task_current
-
-        # Faz a verificação se a tarefa que está rodando ainda não terminou
-        if task_running and task_running.finished():
-            task_running.state = State.TERMINATED
-            process.task_current = None
-            task_running = process.task_current
-            self.remaining_quantum_time = 1
 
-        tasks = [task for task in tasks if task.state == State.RUNNING or task.state == State.READY]
+    def preempt(self, task: TCB, state: State, sync: Synchronization):
+        """Tira a tarefa da CPU antes do fim (READY ou SUSPENDED, conforme o algoritmo)"""
+        old_state = task.state
+        task.state = state
 
-        if not tasks: 
-            process.task_current = None
-            return False
-        
+        on_preempt = sync.hooks.on_preempt
+        if on_preempt and old_state == State.RUNNING:
+            on_preempt(task)
 
-        tasks_ready = []
-
-        # se a tarefa estiver na seção crítica, continua até que ela saia da seção
-        if task_running and mutex.owner and mutex.owner.id == task_running.id:
-            #if task_running == State.RUNNING:
-            self.remaining_quantum_time += 1
-            return False
 
-        if task_running and self.remaining_quantum_time >= self.quantum:
+    def attach(self, process: Process):
+        """Cria a fila de prontas do processo com a ordenação do algoritmo"""
+        if process.ready_queue is None:
+            process.attach_queue(ReadyQueue(self.policy.ready_key(), self.policy.aging, self.policy.on_enqueue))
 
-            # tenta procurar outra tarefa pronta para executar
-            tasks_ready = [task for task in process.tasks if task.state == State.READY and task_running.id != task.id]
-            
-            if not tasks_ready:
-                # coloca a última tarefa para executar novamente, pois não encontrou nenhuma tarefa pronta
-                self.remaining_quantum_time += 1
-                return False
-            
-            task_running.state = State.SUSPENDED
-            tasks = tasks_ready
 
+    def steady_ticks(self, process: Process, sync: Synchronization) -> int:
+        """Quantidade de ticks seguintes em que o escalonador não troca de tarefa"""
+        self.attach(process)
+        ticks, _ = self.policy.steady(process, process.tasks, sync)
+        return ticks
 
-        # se existir outra tarefa pronta e com prioridade maior que a tarefa atual, faz a troca
-        task = max(tasks, key=lambda task: task.priority_current)
 
-        if task and task != task_running:
-            self.remaining_quantum_time = 1
+    def skip(self, process: Process, sync: Synchronization, ticks: int):
+        """Avança em lote 'ticks' execuções estáveis do escalonador"""
+        _, step = self.policy.steady(process, process.tasks, sync)
+        self.remaining_quantum_time = step(self.remaining_quantum_time, ticks)
+        self.policy.skip(ticks)
 
-            # incrementa a prioridade, pois o escalonador escolheu outra tarefa
-        
-            #tasks_ready = [t for t in process.tasks if t.state == State.READY and (task_running and task_running.id != t.id and t.id != task.id)]
-            tasks_ready = [t for t in process.tasks if t.state == State.READY]
-            for t in tasks_ready:
-                t.priority_current += self.alpha
 
+    def execute(self, process: Process, sync: Synchronization) -> bool:
+        """Executa o escalonador com o algoritmo definido na construtora"""
+        self.attach(process)
+        tasks: list[TCB] = process.tasks
+        executor = self.policy.execute
+
+        on_execute = sync.hooks.on_execute
+        if on_execute is None:
+            return executor(process, tasks, sync)
 
-            self.task_swap(process, task, mutex)
-            if process.task_current.id == task.id:
-                task.priority_current -= self.alpha
+        # tempo real de cada chamada do executor (Counters.executor_time)
+        started = perf_counter()
+        finished = executor(process, tasks, sync)
+        on_execute(self.policy.name, perf_counter() - started)
+        return finished
 
-        else:
-            task_running.state = State.RUNNING
-            self.remaining_quantum_time += 1
 
+    def get_context(self) -> tuple:
+        """Quantum restante e estado próprio do algoritmo (histórico de retrocesso)"""
+        return self.remaining_quantum_time, self.policy.get_context()
 
-        return False
 
+    def set_context(self, context: tuple):
+        self.remaining_quantum_time, policy_context = context
+        self.policy.set_context(policy_context)
 
 
-    def execute(self, process: Process, mutex:Mutex) -> bool:
-        """Executa o escalonador com o algoritmo definido na construtora"""
-        tasks: list[TCB] = process.tasks
-        executor = self.type_scheduler.get_executor(self)
-        return executor(process, tasks, mutex)
+    def running(self, process: Process) -> list[TCB]:
+        """Tarefas que ocupam a CPU (uma por núcleo); a tarefa atual que já terminou mantém o próprio término"""
+        task = process.task_current
+        return [task] if task and task.state != State.TERMINATED else []
 
 
     def update_metrics(self, process: Process):
         """Atualiza métricas do escalonador"""
+        # resposta e eficiência só existem com as estatísticas incrementais
+        if self.metrics is not None:
+            self.response_time = self.metrics.response.stats.mean
+            self.efficiency = self.metrics.utilization()
+
+        if process.table is not None:
+            # modo tabela: as tarefas terminadas já foram gravadas nas colunas
+            lifetime_sum, waiting_time_sum, total_tasks = process.table.totals()
+            self.turnaround_time = lifetime_sum / total_tasks
+            self.waiting_time = waiting_time_sum / total_tasks
+            return
+
         tasks: list[TCB] = process.tasks
 
         lifetime_sum = 0
@@ -311,4 +145,3 @@ class TaskScheduler:
         self.turnaround_time = lifetime_sum / total_tasks
         self.waiting_time = waiting_time_sum / total_tasks
 
-        
\ No newline at end of file
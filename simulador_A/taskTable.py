@@ -0,0 +1,217 @@
+from array import array
+from tcb import TCB, State
+
+# Representação compacta de uma carga de trabalho (struct-of-arrays). Cada campo
+# da tarefa é uma coluna em um array de inteiros, os textos (id e cor) ficam em
+# um único buffer e os eventos IO/ML/MU/SW/SS em colunas com deslocamento por tarefa.
+#
+# O Process pode executar direto sobre a tabela (Process.load_table): o TCB só
+# é criado quando a tarefa ingressa e os campos são gravados de volta na tabela
+# quando ela termina, então a memória cresce com as tarefas vivas e não com o
+# total de tarefas.
+
+EVENT_TYPES = ['IO', 'ML', 'MU', 'SW', 'SS']
+NO_STOP = -1
+
+# colunas fixas (não mudam durante a simulação) e o typecode de cada uma
+STATIC_COLUMNS = {
+    'start': 'i',
+    'duration': 'i',
+    'priority_init': 'i',
+    'event_offsets': 'I',
+    'event_type': 'b',
+    'event_start': 'i',
+    'event_duration': 'i'
+}
+
+
+def to_array(column) -> array:
+    """Copia uma coluna (ex.: memoryview de um arquivo mapeado) para um array"""
+    if isinstance(column, array):
+        return column
+    copy = array(column.format)
+    copy.frombytes(column.cast('B'))
+    return copy
+
+
+class StringColumn:
+    """Textos concatenados em um único buffer, com deslocamentos"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array('I', [0])
+
+
+    def append(self, value: str):
+        self.data += value.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+
+    def __getitem__(self, row: int) -> str:
+        # str(...) aceita tanto bytearray quanto memoryview (arquivo mapeado)
+        return str(self.data[self.offsets[row]:self.offsets[row + 1]], 'utf-8')
+
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+
+    @classmethod
+    def from_buffers(cls, data, offsets) -> "StringColumn":
+        """Coluna somente leitura sobre buffers existentes (sem cópia)"""
+        column = cls()
+        column.data = data
+        column.offsets = offsets
+        return column
+
+
+    def __getstate__(self):
+        return {'data': bytearray(self.data), 'offsets': to_array(self.offsets)}
+
+
+class TaskTable:
+    def __init__(self):
+        self.ids = StringColumn()
+        self.colors = StringColumn()
+        self.start = array('i')
+        self.duration = array('i')
+        self.duration_current = array('i')
+        self.priority_init = array('i')
+        self.priority_current = array('i')
+        self.state = array('b')
+        self.waiting = array('i')
+        self.total_waiting_time = array('i')
+        self.stop = array('i')
+
+        # eventos da tarefa 'row': event_offsets[row] até event_offsets[row + 1]
+        self.event_offsets = array('I', [0])
+        self.event_type = array('b')
+        self.event_start = array('i')
+        self.event_duration = array('i')
+        self.event_locks = StringColumn()    # id do mutex/semáforo de cada evento
+
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+    def append(self, id: str, color: str, start: int, duration: int, priority: int, events: list[dict]):
+        """Adiciona uma tarefa ainda não iniciada"""
+        self.ids.append(id)
+        self.colors.append(color)
+        self.start.append(start)
+        self.duration.append(duration)
+        self.duration_current.append(0)
+        self.priority_init.append(priority)
+        self.priority_current.append(priority)
+        self.state.append(State.NEW.value)
+        self.waiting.append(0)
+        self.total_waiting_time.append(0)
+        self.stop.append(NO_STOP)
+
+        for event in events:
+            self.event_type.append(0 if 'IO' in event['type'] else EVENT_TYPES.index(event['type']))
+            self.event_start.append(event['start'])
+            self.event_duration.append(event['duration'])
+            self.event_locks.append(event.get('lock', ''))
+        self.event_offsets.append(len(self.event_type))
+
+
+    @classmethod
+    def from_tasks(cls, tasks) -> "TaskTable":
+        """Monta a tabela a partir de qualquer iterável de TCBs (ex.: um gerador)"""
+        table = cls()
+        for task in tasks:
+            table.append(task.id, task.color, task.start, task.duration, task.priority_init, task.events)
+        return table
+
+
+    @classmethod
+    def from_buffers(cls, ids: StringColumn, colors: StringColumn, event_locks: StringColumn, **columns) -> "TaskTable":
+        """Tabela sobre colunas fixas já existentes (ex.: memoryview de um arquivo mapeado), sem copiá-las.
+        Apenas as colunas dinâmicas são alocadas; a tabela não aceita append."""
+        table = cls()
+        table.ids = ids
+        table.colors = colors
+        table.event_locks = event_locks
+        for name in STATIC_COLUMNS:
+            setattr(table, name, columns[name])
+
+        count = len(table.start)
+        table.duration_current = array('i', bytes(4 * count))
+        table.priority_current = array('i', table.priority_init)
+        table.state = array('b', bytes(count))      # State.NEW
+        table.waiting = array('i', bytes(4 * count))
+        table.total_waiting_time = array('i', bytes(4 * count))
+        table.stop = array('i', [NO_STOP]) * count
+        return table
+
+
+    def __getstate__(self):
+        """Cópia serializável (para outro processo): as colunas mapeadas viram arrays"""
+        state = dict(self.__dict__)
+        state.pop('buffer', None)
+        for name in STATIC_COLUMNS:
+            state[name] = to_array(state[name])
+        return state
+
+
+    def events(self, row: int) -> list[dict]:
+        return [
+            {
+                'type': EVENT_TYPES[self.event_type[position]],
+                'start': self.event_start[position],
+                'duration': self.event_duration[position],
+                'duration_current': 0,
+                'lock': self.event_locks[position]
+            }
+            for position in range(self.event_offsets[row], self.event_offsets[row + 1])
+        ]
+
+
+    def tcb(self, row: int) -> TCB:
+        """Cria o TCB da tarefa (chamado no ingresso)"""
+        return TCB(
+            self.ids[row],
+            self.colors[row],
+            self.start[row],
+            self.duration[row],
+            self.priority_init[row],
+            self.events(row)
+        )
+
+
+    def store(self, row: int, task: TCB):
+        """Grava de volta na tabela os campos dinâmicos do TCB"""
+        self.duration_current[row] = task.duration_current
+        self.priority_current[row] = task.priority_current
+        self.state[row] = task.state.value
+        self.waiting[row] = task.waiting
+        self.total_waiting_time[row] = task.total_waiting_time
+        self.stop[row] = task.stop if task.stop is not None else NO_STOP
+
+
+    def order(self) -> array:
+        """Linhas em ordem de ingresso (estável, como Process.sort_ready)"""
+        return array('I', sorted(range(len(self)), key=self.start.__getitem__))
+
+
+    def totals(self) -> tuple[int, int, int]:
+        """Soma do tempo de vida, soma do tempo de espera e quantidade de tarefas"""
+        lifetime_sum = sum(self.stop) - sum(self.start)
+        waiting_time_sum = sum(self.total_waiting_time)
+        return lifetime_sum, waiting_time_sum, len(self)
+
+
+    def nbytes(self) -> int:
+        """Memória ocupada pelas colunas"""
+        columns = [
+            self.start, self.duration, self.duration_current, self.priority_init, self.priority_current,
+            self.state, self.waiting, self.total_waiting_time, self.stop,
+            self.event_offsets, self.event_type, self.event_start, self.event_duration
+        ]
+        return self.ids.nbytes() + self.colors.nbytes() + self.event_locks.nbytes() + sum(column.itemsize * len(column) for column in columns)
@@ -1,5 +1,6 @@
+from bisect import bisect_right, insort
 from enum import Enum
-from mutex import Mutex
+from mutex import Synchronization
 
 class State(Enum):
     NEW = 0
@@ -9,7 +10,86 @@ class State(Enum):
     TERMINATED = 4
 
 
+# Eventos que obrigam o simulador a executar um tick completo
+class EventType(Enum):
+    ARRIVAL = 0     # ingresso da tarefa
+    COMPLETION = 1  # término da tarefa
+    IO_START = 2    # início de um evento de IO
+    IO_END = 3      # fim de um evento de IO
+    ML = 4          # mutex lock
+    MU = 5          # mutex unlock
+    WAKE = 6        # tarefa suspensa volta a ficar pronta
+    QUANTUM = 7     # estouro do quantum
+    SW = 8          # espera no semáforo
+    SS = 9          # sinal no semáforo
+
+
+# Código de cada tipo de evento da tarefa (mesma ordem de taskTable.EVENT_TYPES)
+OP_IO = 0
+OP_ML = 1   # mutex lock
+OP_MU = 2   # mutex unlock
+OP_SW = 3   # semáforo: espera (P)
+OP_SS = 4   # semáforo: sinal (V)
+
+OPCODES = {'ML': OP_ML, 'MU': OP_MU, 'SW': OP_SW, 'SS': OP_SS}
+OPCODE_EVENTS = (EventType.IO_START, EventType.ML, EventType.MU, EventType.SW, EventType.SS)
+
+
+def event_opcode(event_type: str) -> int:
+    if 'IO' in event_type:
+        return OP_IO
+    for name, opcode in OPCODES.items():
+        if name in event_type:
+            return opcode
+    raise ValueError(f'tipo de evento desconhecido: {event_type}')
+
+
+class Event:
+    """Evento já alcançado pela tarefa (o único dado que muda é duration_current)"""
+
+    __slots__ = ('opcode', 'type', 'start', 'duration', 'duration_current', 'position', 'lock')
+
+    def __init__(self, opcode: int, type: str, start: int, duration: int, position: int, lock: str, duration_current: int = 0):
+        self.opcode = opcode
+        self.type = type
+        self.start = start
+        self.duration = duration
+        self.duration_current = duration_current
+        self.position = position    # posição no arquivo: eventos ativos são tratados nessa ordem
+        self.lock = lock            # id do mutex/semáforo
+
+
+    def pending(self) -> bool:
+        return self.duration_current < self.duration
+
+
+def event_position(event) -> int:
+    return event.position if isinstance(event, Event) else event[4]
+
+
+def compile_events(events: list[dict]) -> tuple:
+    """Programa de eventos: (código, tipo, início, duração, posição, id do lock) ordenado por início.
+    Eventos já concluídos (duração <= 0) nunca têm efeito e são descartados."""
+    program = [
+        (event_opcode(event['type']), event['type'], event['start'], event['duration'], position, event.get('lock', ''))
+        for position, event in enumerate(events)
+        if event.get('duration_current', 0) < event['duration']
+    ]
+    program.sort(key=lambda spec: (spec[2], spec[4]))
+    return tuple(program)
+
+
+# Colunas da tabela de tarefas exibida junto do gráfico (ver TCB.table_row)
+TABLE_COLUMNS = ["ID", "Cor", "Início", "Duração", "Prioridade", "IO", "ML/MU", "Lock", "Estado"]
+
+
 class TCB:
+    # sem __dict__ por instância: cada tarefa ocupa apenas os campos abaixo
+    __slots__ = (
+        'id', 'color', 'start', 'stop', 'waiting', 'total_waiting_time', 'duration', 'duration_current',
+        'priority_init', 'priority_current', 'index', 'queue', 'queue_version', '_state',
+        'program', 'cursor', 'active', 'mu_pending', 'policy_data'
+    )
 
     def __init__(self, id:int, color: str, start:int, duration: int, priority: int, events: list[dict]):
         self.id = id
@@ -22,8 +102,32 @@ class TCB:
         self.duration_current = 0
         self.priority_init = priority
         self.priority_current = priority
-        self.state = State.NEW
-        self.events = events
+        self.index = None   # posição da tarefa na lista do processo
+        self.queue = None   # fila de prontas avisada a cada troca de estado
+        self.queue_version = 0
+        self._state = State.NEW
+        self.policy_data = None  # dados do algoritmo de escalonamento (ex.: vruntime do CFS, nível da MLFQ)
+
+        # eventos: o programa fica ordenado por início e o cursor aponta para o
+        # próximo ainda não alcançado; os alcançados e não removidos ficam em
+        # 'active', na ordem do arquivo
+        self.program = compile_events(events)
+        self.cursor = 0
+        self.active: list[Event] = []
+        self.mu_pending = self.count_mu(self.program)      # id do mutex -> MUs ainda não removidos
+
+
+    @property
+    def state(self) -> State:
+        return self._state
+
+
+    @state.setter
+    def state(self, state: State):
+        old_state = self._state
+        self._state = state
+        if self.queue is not None and old_state != state:
+            self.queue.update(self, old_state)
 
 
     def increment_priority(self):
@@ -38,101 +142,355 @@ class TCB:
         return self.duration_current >= self.duration
     
 
+    def activate(self):
+        """Move para 'active' os eventos cujo início já foi alcançado por duration_current"""
+        program = self.program
+        while self.cursor < len(program) and program[self.cursor][2] <= self.duration_current:
+            insort(self.active, Event(*program[self.cursor]), key=event_position)
+            self.cursor += 1
+
+
+    @property
+    def events(self) -> list[dict]:
+        """Cópia dos eventos ainda não removidos, na ordem do arquivo"""
+        self.activate()
+        remaining = [(event.position, event.type, event.start, event.duration, event.duration_current, event.lock) for event in self.active]
+        remaining += [(position, event_type, start, duration, 0, lock) for _, event_type, start, duration, position, lock in self.program[self.cursor:]]
+        remaining.sort()
+        return [
+            {'type': event_type, 'start': start, 'duration': duration, 'duration_current': duration_current, 'lock': lock}
+            for _, event_type, start, duration, duration_current, lock in remaining
+        ]
+
+
+    @staticmethod
+    def count_mu(events) -> dict[str, int]:
+        """Quantidade de MUs por mutex (specs do programa ou eventos ativos)"""
+        counts = {}
+        for event in events:
+            opcode, lock = (event.opcode, event.lock) if isinstance(event, Event) else (event[0], event[5])
+            if opcode == OP_MU:
+                counts[lock] = counts.get(lock, 0) + 1
+        return counts
+
+
+    def get_context(self) -> tuple:
+        """Campos que mudam durante a simulação, usados pelo histórico de retrocesso"""
+        # os eventos ainda não alcançados são determinados por duration_current
+        self.activate()
+        return (
+            self.state,
+            self.stop,
+            self.waiting,
+            self.total_waiting_time,
+            self.duration_current,
+            self.priority_current,
+            self.policy_data,
+            tuple((event.position, event.duration_current) for event in self.active)
+        )
+
+
+    def set_context(self, context: tuple):
+        """Restaura os campos salvos por get_context"""
+        state, self.stop, self.waiting, self.total_waiting_time, self.duration_current, self.priority_current, self.policy_data, events = context
+
+        program = self.program
+        specs = {spec[4]: spec for spec in program}
+        self.cursor = bisect_right(program, self.duration_current, key=lambda spec: spec[2])
+        self.active = [Event(*specs[position], duration_current) for position, duration_current in events]
+        self.mu_pending = self.count_mu(self.active)
+        for lock, count in self.count_mu(program[self.cursor:]).items():
+            self.mu_pending[lock] = self.mu_pending.get(lock, 0) + count
+
+        # por último, reinserindo na fila de prontas com os campos já restaurados,
+        # mesmo que o estado não mude (a chave da entrada antiga pode estar vencida)
+        old_state = self._state
+        self._state = state
+        if self.queue is not None:
+            self.queue.update(self, old_state)
+
+
+    def table_row(self, sync: Synchronization) -> list[str]:
+        """Linha da tarefa na tabela (mesma ordem de TABLE_COLUMNS)"""
+        events = self.events
+        return [
+            str(self.id),
+            self.color,
+            str(self.start),
+            f"{self.duration_current}/{self.duration}",
+            str(self.queue.aging.priority(self) if self.queue is not None and self.queue.aging else self.priority_current),
+            ", ".join([f'{event["start"]}/{event["duration"]}/{event["duration_current"]}' for event in events if 'IO' in event['type']]),
+            ", ".join([f'{event["type"]}{event["lock"]}:{event["start"]}' for event in events if event['type'] in OPCODES]),
+            "1" if sync.holds(self) else "0",
+            self.state.name
+        ]
+
+
     def print_info(self):
         print(f"ID: {self.id}  ###  Cor: {self.color}  ###  Início: {self.start}  ###  Duration: {self.duration_current}/{self.duration}  ###  Prioridade: {self.priority_init}  ###  State: {self.state}")
 
 
-    def update_events(self, mutex: Mutex):
+    # Transições que avisam os ganchos de instrumentação (Synchronization.hooks);
+    # sem inscritos, o custo é testar o atributo do gancho.
+
+    def block(self, sync: Synchronization, primitive=None, queued: bool = False):
+        """Suspende a tarefa por IO (primitive None) ou por um mutex/semáforo ocupado;
+        'queued': acabou de entrar na fila de espera da primitiva (avisa mesmo se já estava suspensa por IO)"""
+        old_state = self.state
+        self.state = State.SUSPENDED
+
+        on_block = sync.hooks.on_block
+        if on_block and (old_state != State.SUSPENDED or queued):
+            on_block(self, primitive)
+
+
+    def wake(self, sync: Synchronization, primitive):
+        """Acordada pelo mutex/semáforo que liberou a vaga"""
+        self.state = State.READY
+
+        on_wake = sync.hooks.on_wake
+        if on_wake:
+            on_wake(self, primitive)
+
+
+    def terminate(self, sync: Synchronization):
+        if self.state != State.TERMINATED:
+            self.state = State.TERMINATED
+
+            on_terminate = sync.hooks.on_terminate
+            if on_terminate:
+                on_terminate(self)
+
+
+    def notify_lock(self, sync: Synchronization, primitive):
+        on_lock = sync.hooks.on_lock
+        if on_lock:
+            on_lock(self, primitive)
+
+
+    def notify_unlock(self, sync: Synchronization, primitive):
+        on_unlock = sync.hooks.on_unlock
+        if on_unlock:
+            on_unlock(self, primitive)
+
+
+    def update_events(self, sync: Synchronization):
         # não processa se a tarefa não estiver ativa para processar eventos
         # (chame update_events apenas quando estiver RUNNING ou SUSPENDED conforme seu fluxo)
-        active_events = []
 
-        # 1) remover eventos já concluídos (iterar sobre cópia)
-        for event in self.events[:]:
-            if event['duration_current'] >= event['duration']:
-                self.events.remove(event)
+        # 1) coletar eventos que já começaram (relativo ao progresso da tarefa):
+        #    o cursor só avança, então cada evento é alcançado uma única vez
+        self.activate()
+        active_events = self.active
 
-        # 2) coletar eventos que já começaram (relativo ao progresso da tarefa)
-        for event in self.events:
-            if self.duration_current >= event['start']:
-                active_events.append(event)
+        # 2) remover eventos já concluídos
+        if any(event.duration_current >= event.duration for event in active_events):
+            active_events[:] = [event for event in active_events if event.duration_current < event.duration]
 
-        has_interrupt = next((True for event in active_events if 'IO' in event['type']), False)
+        has_interrupt = any(event.opcode == OP_IO for event in active_events)
 
         if (not active_events or not has_interrupt) and self.state == State.SUSPENDED:
-            if mutex.owner and mutex.owner.id == self.id:
+            if sync.holds(self):
                 self.state = State.RUNNING
             else:
                 self.state = State.READY
+
+            on_wake = sync.hooks.on_wake
+            if on_wake:
+                on_wake(self, None)
             return
 
-        # 3) processar eventos ativos (um por vez pode ser adequado)
-        for event in active_events:
-            event_type = event['type']
+        # 3) processar eventos ativos (um por vez pode ser adequado);
+        #    itera sobre uma cópia porque ML/MU/SW/SS são removidos durante o laço
+        for event in active_events[:]:
+            opcode = event.opcode
 
             # I/O: suspende e avança contagem
-            if 'IO' in event_type:
-                self.state = State.SUSPENDED
-                event['duration_current'] += 1
-                # quando terminar, na próxima iteração o evento será removido pela etapa 1
+            if opcode == OP_IO:
+                self.block(sync)
+                event.duration_current += 1
+                # quando terminar, na próxima iteração o evento será removido pela etapa 2
 
             # Mutex Lock
-            elif 'ML' in event_type:
+            elif opcode == OP_ML:
+                mutex = sync.mutex(event.lock)
                 # se livre, adquiri
-                if not mutex.locked or (mutex.owner and mutex.owner.id == self.id):
-                    mutex.locked = True
-                    mutex.owner = self   # salva o TCB
-                    print(f"[t] {self.id} adquiriu o mutex")
+                if not mutex.locked or mutex.owner is self:
+                    sync.acquire(mutex, self)
+                    self.notify_lock(sync, mutex)
                     # remover o evento ML (já consumido)
-
-                    if event in self.events:
-                        self.events.remove(event)
+                    active_events.remove(event)
                 else:
                     # mutex ocupado: tarefa bloqueia e entra na fila de espera (se ainda não estiver)
-                    if self not in mutex.waiting_queue:
-                        mutex.waiting_queue.append(self)
-                    self.state = State.SUSPENDED
+                    self.block(sync, mutex, mutex.waiting_queue.append(self))
+                    # bloqueada: os eventos seguintes (ex.: o MU) esperam o mutex
+                    return
                     # NÃO remove o evento ML — opcionalmente você pode manter o ML até ser despertado
                     # e então removê-lo quando reentrar (ou remover já e manter uma flag)
 
             # Mutex Unlock
-            elif 'MU' in event_type:
-                # só o dono pode liberar
-                if mutex.owner.id == self.id:
+            elif opcode == OP_MU:
+                # remove o evento MU (dono ou não)
+                active_events.remove(event)
+                self.mu_pending[event.lock] -= 1
 
-                    mutex.locked = False
-                    mutex.owner = None
-                    print(f"[t] {self.id} liberou o mutex")
-                    # acorda o próximo (se houver)
+                # só o dono pode liberar (MU de quem não é dono é ignorado)
+                mutex = sync.mutex(event.lock)
+                if mutex.owner is self:
 
-                    print(len(mutex.waiting_queue))
+                    sync.release(mutex)
+                    self.notify_unlock(sync, mutex)
+
+                    # acorda o próximo (se houver)
                     if mutex.waiting_queue:
-                        next_tcb = mutex.waiting_queue.pop(0)
-                        next_tcb.state = State.READY
-
-                        print(f"[t] {next_tcb.id} acordou (mutex disponível)")
-                    # remove o evento MU
-                    if event in self.events:
-                        self.events.remove(event)
-
-                    ml_mu = [event for event in self.events if 'ML' in event['type'] or 'MU' in event['type']]
-                    if next((True for event in ml_mu if 'MU' in event['type']), False):
-                        mutex.owner = self
-                        mutex.locked = True
-                        print(f"[t] {self.id} readquiriu o mutex automaticamente")
+                        mutex.waiting_queue.pop().wake(sync, mutex)
+
+                    # ainda há MU pela frente: mantém o mutex
+                    if self.mu_pending[event.lock]:
+                        sync.acquire(mutex, self)
+                        self.notify_lock(sync, mutex)
                         return
 
+            # Semáforo: espera (P)
+            elif opcode == OP_SW:
+                semaphore = sync.semaphore(event.lock)
+                if semaphore.count > 0:
+                    semaphore.count -= 1
+                    self.notify_lock(sync, semaphore)
+                    active_events.remove(event)
                 else:
-                    # se não for dono, ignorar MU (ou logar erro)
-                    if event in self.events:
-                        self.events.remove(event)
+                    # sem recursos: bloqueia como no ML, e tenta de novo quando acordar
+                    self.block(sync, semaphore, semaphore.waiting_queue.append(self))
+                    return
+
+            # Semáforo: sinal (V)
+            else:
+                active_events.remove(event)
+                semaphore = sync.semaphore(event.lock)
+                semaphore.count += 1
+                self.notify_unlock(sync, semaphore)
+
+                if semaphore.waiting_queue:
+                    semaphore.waiting_queue.pop().wake(sync, semaphore)
 
 
-    def update_state(self, time: int, mutex:Mutex):
+    def next_event(self, time: int, sync: Synchronization) -> tuple[int, EventType]:
+        """Retorna o próximo instante (após o tick 'time') em que o estado da tarefa pode mudar"""
+
+        if self.state == State.NEW:
+            return self.start, EventType.ARRIVAL
+
+        # eventos alcançados e ainda não concluídos (os concluídos são removidos em update_events)
+        self.activate()
+        active_events = [event for event in self.active if event.duration_current < event.duration]
+
+        if self.state == State.RUNNING:
+            # uma tarefa já concluída (acordada depois de terminar) termina de novo no próximo tick
+            event_time, event_type = time + max(1, self.duration - self.duration_current), EventType.COMPLETION
+
+            # um evento ativo dispara no próximo tick; o próximo do programa, ao alcançar o seu início.
+            # Empates ficam com o primeiro na ordem do arquivo.
+            candidate, candidate_time = (active_events[0], time + 1) if active_events else (None, None)
+            if self.cursor < len(self.program):
+                spec = self.program[self.cursor]
+                start = time + spec[2] - self.duration_current
+                if candidate is None or start < candidate_time or (start == candidate_time and spec[4] < candidate.position):
+                    candidate, candidate_time = spec, start
+
+            if candidate is not None and candidate_time < event_time:
+                opcode = candidate.opcode if isinstance(candidate, Event) else candidate[0]
+                event_time = candidate_time
+                event_type = OPCODE_EVENTS[opcode]
+
+            return event_time, event_type
+
+        if self.state == State.SUSPENDED:
+            if self.finished():
+                return time + 1, EventType.WAKE
+
+            # sem IO ativo a tarefa volta a ficar pronta no próximo tick
+            if not any(event.opcode == OP_IO for event in active_events):
+                return time + 1, EventType.WAKE
+
+            # mesma ordem de update_events: os IOs avançam até o primeiro ML/SW parado,
+            # e os eventos depois dele (inclusive IOs) esperam a tarefa ser acordada
+            io_events = self.progressing_io()
+            for event in active_events:
+                if event.opcode == OP_MU:
+                    return time + 1, EventType.MU
+
+                if event.opcode == OP_SS:
+                    return time + 1, EventType.SS
+
+                # ML só fica parado se o mutex pertence a outra tarefa e a tarefa já está na fila
+                if event.opcode == OP_ML:
+                    mutex = sync.mutex(event.lock)
+                    if not mutex.locked or mutex.owner is self or self not in mutex.waiting_queue:
+                        return time + 1, EventType.ML
+                    break
+
+                # SW, se o semáforo está zerado e a tarefa já está na fila
+                if event.opcode == OP_SW:
+                    semaphore = sync.semaphore(event.lock)
+                    if semaphore.count > 0 or self not in semaphore.waiting_queue:
+                        return time + 1, EventType.SW
+                    break
+
+            # parada no ML/SW sem IO antes: só muda quando outra tarefa liberar a vaga
+            if not io_events:
+                return None
+
+            return time + 1 + min(event.duration - event.duration_current for event in io_events), EventType.IO_END
+
+        # READY e TERMINATED só mudam por decisão do escalonador
+        return None
+
+
+    def progressing_io(self) -> list[Event]:
+        """Suspensa: IOs ativos que avançam a cada tick (os anteriores ao primeiro ML/SW, no qual update_events para)"""
+        io_events = []
+        for event in self.active:
+            if event.duration_current >= event.duration:
+                continue
+            if event.opcode == OP_IO:
+                io_events.append(event)
+            elif event.opcode in (OP_ML, OP_SW):
+                break
+        return io_events
+
+
+    def advance(self, ticks: int):
+        """Credita em lote 'ticks' ticks nos quais o estado da tarefa não muda"""
+
+        if self.state in (State.SUSPENDED, State.RUNNING):
+            # equivalente à etapa 2 de update_events
+            self.activate()
+            self.active[:] = [event for event in self.active if event.duration_current < event.duration]
+
+        if self.state == State.READY:
+            self.waiting += ticks
+            self.total_waiting_time += ticks
+
+        elif self.state == State.SUSPENDED:
+            self.waiting += ticks
+            self.total_waiting_time += ticks
+            for event in self.progressing_io():
+                event.duration_current += ticks
+
+        elif self.state == State.RUNNING:
+            self.waiting = 0
+            self.duration_current += ticks
+
+
+    def update_state(self, time: int, sync: Synchronization):
 
         if self.state == State.NEW and time >= self.start:
             self.state = State.READY
 
+            on_arrive = sync.hooks.on_arrive
+            if on_arrive:
+                on_arrive(self)
+
         elif self.state == State.READY:
             self.waiting += 1
             self.total_waiting_time += 1
@@ -140,20 +498,20 @@ class TCB:
         elif self.state == State.SUSPENDED:
 
             if self.finished():
-                self.state = State.TERMINATED
+                self.terminate(sync)
                 self.stop = time
             else:
                 self.waiting += 1
                 self.total_waiting_time += 1
-                self.update_events(mutex)
+                self.update_events(sync)
 
         elif self.state == State.RUNNING:
             self.waiting = 0
             self.duration_current += 1
-            self.update_events(mutex)
+            self.update_events(sync)
 
             if self.finished():
-                self.state = State.TERMINATED
+                self.terminate(sync)
                 self.stop = time
 
         #elif self.state == State.TERMINATED:
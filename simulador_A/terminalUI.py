@@ -0,0 +1,235 @@
+import argparse, curses, sys
+from tcb import TCB, TABLE_COLUMNS
+from schedulingPolicy import policy_names
+from history import History, load_history
+
+# Modo passo-a-passo no terminal (curses), para usar por SSH: não importa o
+# matplotlib. Mostra o gráfico de Gantt (mesma codificação de
+# engine.save_timeline), a tabela de tarefas do plot_timeline e o estado do
+# escalonador.
+#
+# A cada passo só são reescritas as linhas cujo texto mudou (a tela guarda o
+# último texto de cada linha), e o curses envia ao terminal apenas as células
+# alteradas. As linhas do Gantt são recalculadas apenas para as tarefas com
+# trechos novos (Timeline.take_changes), a não ser que a janela de ticks role.
+#
+# Teclas:
+#   → / l / espaço   avança um tick          ← / h   volta um tick
+#   p                play/pause              + / -   velocidade do play
+#   g                vai até um instante     q       sair
+#
+# Exemplo:
+#   python terminalUI.py tarefas.txt -a SRTF
+
+TICKS_PER_SECOND = 4
+MAX_TICKS_PER_SECOND = 256
+LABEL_WIDTH = 6
+
+# símbolos do Gantt para os estados da linha do tempo: a cor da tarefa (RUNNING) vira um bloco colorido
+READY_CELL = '·'
+NEW_CELL = ' '
+RUNNING_CELL = '█'
+
+# colunas da tabela (sem a cor, que aparece no Gantt)
+COLUMNS = [index for index, name in enumerate(TABLE_COLUMNS) if name != 'Cor']
+COLUMN_WIDTHS = {'ID': 6, 'Início': 7, 'Duração': 8, 'Prioridade': 10, 'IO': 18, 'ML/MU': 18, 'Lock': 5, 'Estado': 10}
+
+
+def nearest_color(color: str) -> int:
+    """Cor do curses mais próxima da cor '#rrggbb' da tarefa"""
+    try:
+        red, green, blue = (int(color[index:index + 2], 16) >= 0x80 for index in (1, 3, 5))
+    except ValueError:
+        return curses.COLOR_WHITE
+    code = (curses.COLOR_RED if red else 0) | (curses.COLOR_GREEN if green else 0) | (curses.COLOR_BLUE if blue else 0)
+    return code if code else curses.COLOR_WHITE
+
+
+def gantt_cells(runs: list[list], first: int, width: int) -> str:
+    """Células dos ticks 'first' até 'first + width' a partir dos trechos da tarefa"""
+    cells = []
+    for start, end, state in runs:
+        if end <= first:
+            continue
+        start = max(start, first)
+        end = min(end, first + width)
+        if start >= end:
+            break
+        cell = NEW_CELL if state == 'n' else READY_CELL if state == ' ' else RUNNING_CELL
+        cells.append(cell * (end - start))
+    return ''.join(cells)
+
+
+class TerminalUI:
+    def __init__(self, screen, history: History, tasks: list[TCB], title: str):
+        self.screen = screen
+        self.history = history
+        self.tasks = tasks                  # ordem das linhas (a do arquivo)
+        self.title = title
+        self.lines: dict[int, tuple] = {}   # linha da tela -> (texto, atributo) desenhado por último
+        self.gantt: dict[str, str] = {}     # id -> células desenhadas por último
+        self.first_tick = 0                 # primeiro tick visível no Gantt
+        self.playing = False
+        self.speed = TICKS_PER_SECOND
+        self.message = ''
+
+        self.pairs: dict[str, int] = {}
+        if curses.has_colors():
+            curses.start_color()
+            curses.use_default_colors()
+            # as cores básicas (1 a 7) usam o próprio número como par
+            for color in range(1, 8):
+                curses.init_pair(color, color, -1)
+            for task in tasks:
+                self.pairs[task.id] = curses.color_pair(nearest_color(task.color))
+
+        history.timeline.watch()
+
+
+    def put(self, row: int, text: str, attribute: int = 0):
+        """Escreve a linha apenas se o texto (ou o atributo) mudou desde o último desenho"""
+        height, width = self.screen.getmaxyx()
+        if row >= height:
+            return
+        text = text[:width - 1].ljust(width - 1)
+        if self.lines.get(row) == (text, attribute):
+            return
+        self.lines[row] = (text, attribute)
+        self.screen.addstr(row, 0, text, attribute)
+
+
+    def put_gantt(self, row: int, task: TCB, cells: str):
+        """Linha do Gantt: rótulo e blocos na cor da tarefa (reescrita só quando as células mudam)"""
+        height, width = self.screen.getmaxyx()
+        if row >= height:
+            return
+        label = f'{task.id[:LABEL_WIDTH - 1]:<{LABEL_WIDTH - 1}}|'
+        text = (label + cells)[:width - 1].ljust(width - 1)
+        if self.lines.get(row) == (text, 0):
+            return
+        self.lines[row] = (text, 0)
+        self.screen.addstr(row, 0, label)
+        self.screen.addstr(row, LABEL_WIDTH, text[LABEL_WIDTH:], self.pairs.get(task.id, 0))
+
+
+    def draw(self):
+        history = self.history
+        scheduler = history.task_scheduler
+        timeline = history.timeline
+        height, width = self.screen.getmaxyx()
+        ticks = history.ticks
+
+        # janela de ticks: rola para manter o tick atual visível
+        columns = max(1, width - LABEL_WIDTH - 1)
+        first_tick = max(0, ticks - columns) if ticks > self.first_tick + columns or ticks < self.first_tick else self.first_tick
+        changed = timeline.take_changes()
+        if first_tick != self.first_tick:
+            self.first_tick = first_tick
+            changed = {task.id: 0 for task in self.tasks}
+
+        current = history.process.task_current
+        status = 'play' if self.playing else 'pausa'
+        if history.finished:
+            status = 'fim'
+        self.put(0, f'{self.title} | tick {ticks} | quantum usado {scheduler.remaining_quantum_time} | '
+                    f'atual {current.id if current else "-"} | {status} ({self.speed} ticks/s)', curses.A_BOLD)
+        self.put(1, ' ' * LABEL_WIDTH + str(first_tick))
+
+        row = 2
+        for task in self.tasks:
+            if task.id in changed or task.id not in self.gantt:
+                self.gantt[task.id] = gantt_cells(timeline.runs[task.id], first_tick, columns)
+            self.put_gantt(row, task, self.gantt[task.id])
+            row += 1
+
+        row += 1
+        self.put(row, ' '.join(f'{TABLE_COLUMNS[index]:<{COLUMN_WIDTHS[TABLE_COLUMNS[index]]}}' for index in COLUMNS), curses.A_UNDERLINE)
+        row += 1
+        for task in self.tasks:
+            values = task.table_row(history.sync)
+            self.put(row, ' '.join(f'{values[index][:COLUMN_WIDTHS[TABLE_COLUMNS[index]]]:<{COLUMN_WIDTHS[TABLE_COLUMNS[index]]}}' for index in COLUMNS))
+            row += 1
+
+        self.put(height - 1, self.message or '→/l/espaço avança  ←/h volta  p play/pausa  +/- velocidade  g ir até  q sair', curses.A_DIM)
+        self.screen.refresh()
+
+
+    def ask_time(self) -> int:
+        """Lê o instante na última linha"""
+        height, _ = self.screen.getmaxyx()
+        self.put(height - 1, 'Instante: ')
+        self.screen.timeout(-1)
+        curses.echo()
+        try:
+            answer = self.screen.getstr(height - 1, len('Instante: ')).decode('utf-8', 'replace')
+        finally:
+            curses.noecho()
+        self.lines.pop(height - 1, None)
+        try:
+            return int(answer)
+        except ValueError:
+            self.message = f'Instante inválido: {answer}'
+            return None
+
+
+    def run(self):
+        curses.curs_set(0)
+        history = self.history
+
+        while True:
+            self.draw()
+            self.screen.timeout(max(1, 1000 // self.speed) if self.playing else -1)
+            key = self.screen.getch()
+            self.message = ''
+
+            if key == -1:
+                # play: o tempo de espera acabou sem tecla
+                if not history.advance(history.ticks):
+                    self.playing = False
+            elif key in (ord('q'), ord('Q')):
+                return
+            elif key in (curses.KEY_RIGHT, ord('l'), ord(' ')):
+                self.playing = False
+                history.advance(history.ticks)
+            elif key in (curses.KEY_LEFT, ord('h')):
+                self.playing = False
+                history.rewind()
+            elif key in (ord('p'), ord('P')):
+                self.playing = not self.playing and not history.finished
+            elif key == ord('+'):
+                self.speed = min(MAX_TICKS_PER_SECOND, self.speed * 2)
+            elif key == ord('-'):
+                self.speed = max(1, self.speed // 2)
+            elif key in (ord('g'), ord('G')):
+                self.playing = False
+                time = self.ask_time()
+                if time is not None:
+                    history.seek(time)
+            elif key == curses.KEY_RESIZE:
+                self.lines.clear()
+                self.gantt.clear()
+                self.screen.erase()
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Modo passo-a-passo no terminal (curses)')
+    parser.add_argument('file', help='arquivo .txt com o cabeçalho (algoritmo;quantum;alpha) e as tarefas')
+    parser.add_argument('-a', '--algorithm', type=str.upper, choices=policy_names(), help='substitui o algoritmo do arquivo')
+    parser.add_argument('-q', '--quantum', type=int, help='substitui o quantum do arquivo')
+    parser.add_argument('--alpha', type=int, help='substitui o alpha do arquivo')
+    args = parser.parse_args(argv)
+
+    try:
+        history, tasks = load_history(args.file, args.algorithm, args.quantum, args.alpha)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {args.file}: {error}', file=sys.stderr)
+        return 1
+
+    scheduler = history.task_scheduler
+    title = f'Algoritmo: {scheduler.policy.name} | Quantum: {scheduler.quantum} | Alpha: {scheduler.alpha}'
+    curses.wrapper(lambda screen: TerminalUI(screen, history, tasks, title).run())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,4 @@
+import os, sys
+
+# Os módulos do simulador são importados pelo nome (como nos scripts), a partir da pasta do simulador
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
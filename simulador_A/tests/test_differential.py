@@ -0,0 +1,68 @@
+import pytest
+from taskFile import parse_lines
+from taskTable import TaskTable
+from engine import simulate
+from schedulingPolicy import policy_names
+from workloadGenerator import WorkloadGenerator
+
+# Testes diferenciais: o mesmo arquivo de tarefas executado por caminhos que
+# devem dar o mesmo resultado (tempo, médias, linha do tempo e estatísticas).
+#
+# Exemplo:
+#   python -m pytest tests
+
+# tarefa terminada ainda na fila do semáforo, acordada depois (modo lista x modo tabela)
+WAKE_AFTER_TERMINATE = [
+    'CFS;1;1',
+    't00;54f764;4;4;8',
+    't01;2b155c;0;2;3;IO:2-1;IO:2-1',
+    't02;2e4936;3;7;5;ML:2;MU:8;SWs:3;SSs:4',
+    't03;a9604a;0;7;4;SWs:2;SSs:5',
+    't04;1c3bd6;10;3;9;SWs:1;SSs:4'
+]
+
+# mutexes com id, dois semáforos e IO no mesmo instante dos locks
+LOCKS = [
+    'RR;1;0',
+    't00;b3e3a9;2;1;6;IO:0-1;ML1:0;MU1:1',
+    't01;187fa7;2;4;7;SWs:0;SSs:2;SWs:1;SSs:5',
+    't02;3ad002;0;7;1;ML0:5;MU0:7;IO:5-1',
+    't03;7517ec;9;3;3;SWt:0;SSt:4;SWs:2;SSs:2',
+    't04;5f9e00;10;6;6',
+    't05;c18415;2;4;6;SWt:0;SSt:3;ML:2;MU:6;IO:0-1',
+    't06;25068a;8;4;5;SWs:0;SSs:4;SWs:1;SSs:6'
+]
+
+
+def generated(seed: int) -> list[str]:
+    generator = WorkloadGenerator(seed=seed, arrival_rate=0.4, io_density=1, mutex_probability=0.3, mutex_count=2)
+    return [line.rstrip('\n') for line in generator.lines(40)]
+
+
+WORKLOADS = {
+    'wake_after_terminate': WAKE_AFTER_TERMINATE,
+    'locks': LOCKS,
+    'generated': generated(7)
+}
+
+
+def run(lines: list[str], policy: str, cores: int = 1, table: bool = False, events: bool = True) -> tuple:
+    _, quantum, alpha, tasks = parse_lines(lines)
+    if table:
+        tasks = TaskTable.from_tasks(tasks)
+    _, task_scheduler, time, timeline = simulate(policy, quantum, alpha, tasks, events=events, cores=cores)
+    return (
+        time,
+        task_scheduler.turnaround_time,
+        task_scheduler.waiting_time,
+        {task_id: [tuple(run) for run in runs] for task_id, runs in timeline.items()},
+        task_scheduler.metrics.summary()
+    )
+
+
+@pytest.mark.parametrize('cores', [1, 2])
+@pytest.mark.parametrize('policy', policy_names())
+@pytest.mark.parametrize('workload', WORKLOADS)
+def test_list_matches_table(workload, policy, cores):
+    lines = WORKLOADS[workload]
+    assert run(lines, policy, cores, table=True) == run(lines, policy, cores)
@@ -0,0 +1,154 @@
+from bisect import bisect_right
+
+# Linha do tempo codificada em trechos: para cada tarefa, uma lista de
+# [início, fim, estado] (fim exclusivo). Um tick com o mesmo estado do anterior
+# apenas estende o último trecho, então a memória cresce com as trocas de
+# estado e não com a quantidade de ticks.
+#
+# Os estados usam a mesma codificação de engine.save_timeline: a cor da tarefa
+# (RUNNING), ' ' (READY/SUSPENDED) ou 'n' (NEW/TERMINATED).
+
+
+class Timeline:
+    def __init__(self, ids=()):
+        self.runs: dict[str, list[list]] = {task_id: [] for task_id in ids}
+
+        # menor índice de trecho alterado por tarefa desde o último take_changes
+        # (None = não rastreia; habilitado por quem redesenha de forma incremental)
+        self.changes: dict[str, int] = None
+
+
+    def watch(self):
+        """Passa a registrar quais trechos mudaram"""
+        self.changes = {task_id: 0 for task_id in self.runs}
+
+
+    def take_changes(self) -> dict[str, int]:
+        """Retorna e limpa as tarefas alteradas (id -> primeiro trecho alterado)"""
+        changes, self.changes = self.changes, {}
+        return changes
+
+
+    def mark(self, task_id: str, position: int):
+        if self.changes is not None:
+            self.changes[task_id] = min(self.changes.get(task_id, position), position)
+
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.runs
+
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+
+    def __iter__(self):
+        return iter(self.runs)
+
+
+    def __getitem__(self, task_id: str) -> list[str]:
+        """Estados tick a tick da tarefa (compatível com a antiga lista por tarefa)"""
+        return [state for start, end, state in self.runs[task_id] for _ in range(end - start)]
+
+
+    def keys(self):
+        return self.runs.keys()
+
+
+    def items(self):
+        """Pares (id, trechos)"""
+        return self.runs.items()
+
+
+    def length(self, task_id: str = None) -> int:
+        """Quantidade de ticks registrados (da tarefa ou o maior entre todas)"""
+        if task_id is not None:
+            runs = self.runs[task_id]
+            return runs[-1][1] if runs else 0
+        return max((runs[-1][1] for runs in self.runs.values() if runs), default=0)
+
+
+    def append(self, task_id: str, state: str, ticks: int = 1):
+        """Registra 'ticks' ticks com o estado informado"""
+        runs = self.runs.get(task_id)
+        if runs is None:
+            runs = self.runs[task_id] = []
+
+        if ticks <= 0:
+            return
+
+        if runs and runs[-1][2] == state:
+            runs[-1][1] += ticks
+        else:
+            end = runs[-1][1] if runs else 0
+            runs.append([end, end + ticks, state])
+
+        if self.changes is not None:
+            self.mark(task_id, len(runs) - 1)
+
+
+    def dispatches(self) -> int:
+        """Quantidade de vezes em que uma tarefa assumiu a CPU (trechos RUNNING)"""
+        return sum(1 for runs in self.runs.values() for _, _, state in runs if state not in (' ', 'n'))
+
+
+    def running_ticks(self) -> int:
+        """Ticks em que alguma tarefa ocupou a CPU, somados entre as tarefas"""
+        return sum(end - start for runs in self.runs.values() for start, end, state in runs if state not in (' ', 'n'))
+
+
+    def state_at(self, task_id: str, time: int) -> str:
+        """Estado da tarefa no tick 'time' (busca binária nos trechos)"""
+        runs = self.runs[task_id]
+        position = bisect_right(runs, time, key=lambda run: run[0]) - 1
+        if position < 0 or time >= runs[position][1]:
+            return None
+        return runs[position][2]
+
+
+    def truncate(self, length: int):
+        """Descarta os ticks a partir de 'length'"""
+        for task_id, runs in self.runs.items():
+            if not runs or runs[-1][1] <= length:
+                continue
+            while runs and runs[-1][0] >= length:
+                runs.pop()
+            if runs and runs[-1][1] > length:
+                runs[-1][1] = length
+            self.mark(task_id, max(0, len(runs) - 1))
+
+
+    def pad(self, length: int, state: str = 'n'):
+        """Completa todas as tarefas até 'length' ticks"""
+        for task_id in self.runs:
+            self.append(task_id, state, length - self.length(task_id))
+
+
+    def reorder(self, ids):
+        """Reordena as tarefas (ordem das linhas no gráfico)"""
+        self.runs = {task_id: self.runs[task_id] for task_id in ids}
+        if self.changes is not None:
+            self.changes = {task_id: 0 for task_id in self.runs}
+
+
+    def replace(self, task_id: str, position: int, runs):
+        """Substitui os trechos da tarefa a partir de 'position' (cópia recebida de outro processo)"""
+        current = self.runs.setdefault(task_id, [])
+        current[position:] = [list(run) for run in runs]
+        self.mark(task_id, position)
+
+
+    def to_dict(self) -> dict[str, list[str]]:
+        """Linha do tempo tick a tick de todas as tarefas"""
+        return {task_id: self[task_id] for task_id in self.runs}
+
+
+class NullTimeline(Timeline):
+    """Linha do tempo que descarta os estados: para execuções que só precisam das métricas (metrics.py)"""
+
+    def append(self, task_id: str, state: str, ticks: int = 1):
+        pass
+
+
+    def reorder(self, ids):
+        pass
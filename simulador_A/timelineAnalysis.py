@@ -0,0 +1,418 @@
+import argparse, csv, json, sys
+import numpy as np
+from tcb import State
+from timeline import Timeline
+from traceFile import TraceFile, MAGIC as TRACE_MAGIC, HEADER as TRACE_HEADER, RECORD, TICK, PREEMPT, BLOCK, LOCK, UNLOCK, NO_PRIMITIVE
+
+# Análise vetorizada (NumPy) depois da simulação. A linha do tempo vira um
+# conjunto de intervalos em colunas (tarefa, início, fim, estado), um por trecho,
+# e todas as estatísticas são reduções sobre essas colunas (bincount, cumsum,
+# reduceat), sem laços em Python por tick.
+#
+# Duas origens:
+# - Timeline (ou o 'timeline' do json do headless.py): os estados são os da
+#   codificação de engine.save_timeline, INACTIVE ('n'), WAITING (' ') e RUNNING
+# - rastro binário (traceFile.py): os estados do TCB (NEW, READY, RUNNING,
+#   SUSPENDED, TERMINATED) e os eventos, para contar preempções e bloqueios e
+#   medir por quanto tempo cada mutex fica travado
+#
+# Os intervalos podem ser exportados em csv ou em .npz (colunar, comprimido) e
+# recarregados com Intervals.load.
+#
+# Exemplo:
+#   python headless.py tarefas.txt --record rastro.bin
+#   python timelineAnalysis.py rastro.bin --window 100 --csv tarefas.csv --npz intervalos.npz
+
+TIMELINE_STATES = ('INACTIVE', 'WAITING', 'RUNNING')
+TRACE_STATES = tuple(state.name for state in State)
+
+# registro do rastro como dtype estruturado (mesmo layout de traceFile.RECORD)
+RECORD_DTYPE = np.dtype([('time', '=u4'), ('kind', 'u1'), ('state', 'u1'), ('padding', 'V2'), ('task', '=u4'), ('argument', '=i4')])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+
+def change_intervals(task: np.ndarray, start: np.ndarray, state: np.ndarray, length: int) -> tuple:
+    """Intervalos a partir das trocas de estado ordenadas por (tarefa, instante).
+    Em um mesmo instante vale a última troca (o estado do tick é o do fim dele), e trocas
+    consecutivas para o mesmo estado são juntadas; o último intervalo de cada tarefa vai até 'length'."""
+    count = len(task)
+    if not count:
+        empty = np.zeros(0, np.int64)
+        return empty, empty, empty, np.zeros(0, np.int8)
+
+    last = np.ones(count, bool)
+    last[:-1] = (task[1:] != task[:-1]) | (start[1:] != start[:-1])
+    task, start, state = task[last], start[last], state[last]
+
+    new = np.ones(len(task), bool)
+    new[1:] = (task[1:] != task[:-1]) | (state[1:] != state[:-1])
+    task, start, state = task[new], start[new], state[new]
+
+    end = np.empty_like(start)
+    end[:-1] = start[1:]
+    end[-1] = length
+    end[:-1][task[1:] != task[:-1]] = length
+    return task, start, end, state
+
+
+class Intervals:
+    """Trechos da linha do tempo em colunas NumPy, ordenados por (tarefa, início) e cobrindo [0, length) de cada tarefa"""
+
+    def __init__(self, ids: list[str], colors: list[str], task: np.ndarray, start: np.ndarray, end: np.ndarray, state: np.ndarray,
+                 length: int, states: tuple, events: dict = None, primitives: list[tuple] = None):
+        self.ids = ids
+        self.colors = colors
+        self.task = task
+        self.start = start
+        self.end = end
+        self.state = state
+        self.length = length
+        self.states = states                    # nome de cada código de estado
+        self.running = states.index('RUNNING')
+        self.events = events                    # rastro: colunas time, kind, task, argument (sem os ticks)
+        self.primitives = primitives or []      # rastro: (tipo, id) de cada primitiva
+
+
+    def __len__(self) -> int:
+        return len(self.task)
+
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.end - self.start
+
+
+    @classmethod
+    def from_timeline(cls, timeline: Timeline | dict) -> "Intervals":
+        """Intervalos dos trechos de uma Timeline (ou do dict id -> trechos da saída json)"""
+        runs_by_task = dict(timeline.items())
+        ids = list(runs_by_task)
+        length = max((runs[-1][1] for runs in runs_by_task.values() if runs), default=0)
+
+        starts, ends, codes, counts, colors = [], [], [], [], []
+        for runs in runs_by_task.values():
+            color = None
+            for start, end, state in runs:
+                starts.append(start)
+                ends.append(end)
+                if state == 'n':
+                    codes.append(0)
+                elif state == ' ':
+                    codes.append(1)
+                else:
+                    codes.append(2)
+                    color = color or state
+            count = len(runs)
+            # completa as tarefas mais curtas (ex.: saída sem a execução inteira)
+            last = runs[-1][1] if runs else 0
+            if last < length:
+                starts.append(last)
+                ends.append(length)
+                codes.append(0)
+                count += 1
+            counts.append(count)
+            colors.append(color)
+
+        task = np.repeat(np.arange(len(ids), dtype=np.int64), counts)
+        intervals = cls(ids, colors, task, np.array(starts, np.int64), np.array(ends, np.int64), np.array(codes, np.int8), length, TIMELINE_STATES)
+        intervals.merge()
+        return intervals
+
+
+    @classmethod
+    def from_trace(cls, trace: TraceFile) -> "Intervals":
+        """Intervalos com os estados do TCB e os eventos de um rastro binário (lido direto do mmap)"""
+        records = np.frombuffer(trace.buffer, dtype=RECORD_DTYPE, count=len(trace), offset=TRACE_HEADER.size)
+        length = trace.time
+        ids = [info[0] for info in trace.task_info]
+
+        transitions = records[records['kind'] != TICK]
+        events = {
+            'time': transitions['time'].astype(np.int64),
+            'kind': transitions['kind'].astype(np.int8),
+            'task': transitions['task'].astype(np.int64),
+            'argument': transitions['argument'].astype(np.int64)
+        }
+
+        # o estado do último tick (sem tarefas) não entra na linha do tempo
+        inside = events['time'] < length
+        tasks = np.concatenate([np.arange(len(ids), dtype=np.int64), events['task'][inside]])
+        starts = np.concatenate([np.zeros(len(ids), np.int64), events['time'][inside]])
+        states = np.concatenate([np.full(len(ids), State.NEW.value, np.int8), transitions['state'][inside].astype(np.int8)])
+
+        # estável: cada tarefa fica com NEW no instante 0 e depois os registros em ordem de tempo
+        order = np.argsort(tasks, kind='stable')
+        task, start, end, state = change_intervals(tasks[order], starts[order], states[order], length)
+
+        colors = [info[1] for info in trace.task_info]
+        primitives = [(primitive.kind, primitive.id) for primitive in trace.primitives]
+        return cls(ids, colors, task, start, end, state, length, TRACE_STATES, events, primitives)
+
+
+    def merge(self):
+        """Junta trechos consecutivos da mesma tarefa com o mesmo estado e descarta os vazios"""
+        keep = self.end > self.start
+        task, start, state = self.task[keep], self.start[keep], self.state[keep]
+        self.task, self.start, self.end, self.state = change_intervals(task, start, state, self.length)
+
+
+    def save(self, path: str):
+        """Exporta as colunas em .npz (comprimido)"""
+        columns = {
+            'task': self.task, 'start': self.start, 'end': self.end, 'state': self.state,
+            'ids': np.array(self.ids, dtype=str), 'colors': np.array([color or '' for color in self.colors], dtype=str),
+            'states': np.array(self.states, dtype=str), 'length': np.array(self.length)
+        }
+        if self.events is not None:
+            columns.update({f'event_{name}': column for name, column in self.events.items()})
+            columns['primitive_kinds'] = np.array([kind for kind, _ in self.primitives], dtype=str)
+            columns['primitive_ids'] = np.array([id for _, id in self.primitives], dtype=str)
+        np.savez_compressed(path, **columns)
+
+
+    @classmethod
+    def load(cls, path: str) -> "Intervals":
+        with np.load(path) as data:
+            events = primitives = None
+            if 'event_time' in data:
+                events = {name: data[f'event_{name}'] for name in ('time', 'kind', 'task', 'argument')}
+                primitives = list(zip(data['primitive_kinds'].tolist(), data['primitive_ids'].tolist()))
+            return cls(
+                data['ids'].tolist(), [color or None for color in data['colors'].tolist()],
+                data['task'], data['start'], data['end'], data['state'], int(data['length']),
+                tuple(data['states'].tolist()), events, primitives
+            )
+
+
+    def state_matrix(self) -> np.ndarray:
+        """Matriz tarefas x ticks com o código do estado de cada célula (cada tarefa cobre [0, length))"""
+        return np.repeat(self.state, self.lengths).reshape(len(self.ids), self.length)
+
+
+    def time_in_state(self) -> np.ndarray:
+        """Ticks de cada tarefa (linhas) em cada estado (colunas)"""
+        tasks, states = len(self.ids), len(self.states)
+        return np.bincount(self.task * states + self.state, weights=self.lengths, minlength=tasks * states).reshape(tasks, states).astype(np.int64)
+
+
+    def task_stats(self) -> dict[str, np.ndarray]:
+        """Estatísticas por tarefa: ticks em cada estado, fatia da CPU, rajadas (trechos RUNNING) e, com rastro, preempções e bloqueios"""
+        tasks = len(self.ids)
+        time_in_state = self.time_in_state()
+        running_ticks = time_in_state[:, self.running]
+        total = running_ticks.sum()
+
+        bursts = self.state == self.running
+        burst_tasks = self.task[bursts]
+        burst_lengths = self.lengths[bursts]
+        burst_count = np.bincount(burst_tasks, minlength=tasks)
+        burst_max = np.zeros(tasks, np.int64)
+        np.maximum.at(burst_max, burst_tasks, burst_lengths)
+
+        stats = {
+            **{f'ticks_{name.lower()}': time_in_state[:, code] for code, name in enumerate(self.states)},
+            'cpu_share': running_ticks / total if total else np.zeros(tasks),
+            'bursts': burst_count,
+            'mean_burst': np.divide(running_ticks, burst_count, out=np.zeros(tasks), where=burst_count > 0),
+            'max_burst': burst_max
+        }
+
+        if self.events is not None:
+            kind, task, argument = self.events['kind'], self.events['task'], self.events['argument']
+            stats['preemptions'] = np.bincount(task[kind == PREEMPT], minlength=tasks)
+            stats['io_blocks'] = np.bincount(task[(kind == BLOCK) & (argument == NO_PRIMITIVE)], minlength=tasks)
+            stats['lock_blocks'] = np.bincount(task[(kind == BLOCK) & (argument != NO_PRIMITIVE)], minlength=tasks)
+
+        return stats
+
+
+    def window_stats(self, window: int) -> dict[str, np.ndarray]:
+        """Por janela de 'window' ticks: ticks de CPU ocupada, ticks de espera somados entre as tarefas e despachos"""
+        windows = -(-self.length // window) if self.length else 0
+        lengths = self.lengths
+        waiting_codes = [code for code, name in enumerate(self.states) if name in ('WAITING', 'READY', 'SUSPENDED')]
+
+        def per_tick(mask: np.ndarray) -> np.ndarray:
+            # quantidade de tarefas no estado em cada tick: +1 no início e -1 no fim de cada trecho
+            delta = np.bincount(self.start[mask], minlength=self.length + 1) - np.bincount(self.end[mask], minlength=self.length + 1)
+            return np.cumsum(delta[:self.length])
+
+        def per_window(counts: np.ndarray) -> np.ndarray:
+            if not windows:
+                return np.zeros(0, np.int64)
+            return np.add.reduceat(counts, np.arange(0, self.length, window))
+
+        running = self.state == self.running
+        busy = per_window(per_tick(running))
+        ticks = np.minimum(window, self.length - np.arange(windows) * window)
+        return {
+            'start': np.arange(windows) * window,
+            'busy': busy,
+            'waiting': per_window(per_tick(np.isin(self.state, waiting_codes) & (lengths > 0))),
+            'dispatches': np.bincount(self.start[running] // window, minlength=windows) if windows else np.zeros(0, np.int64),
+            'utilization': busy / ticks if windows else np.zeros(0)
+        }
+
+
+    def state_histograms(self) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+        """Histograma da duração dos trechos em cada estado, com faixas em potências de 2: estado -> (contagens, limites)"""
+        lengths = self.lengths
+        top = int(lengths.max()) if len(lengths) else 1
+        edges = 2 ** np.arange(0, int(np.ceil(np.log2(max(top, 1)))) + 2)
+        return {name: np.histogram(lengths[self.state == code], bins=edges) for code, name in enumerate(self.states)}
+
+
+    def lock_holds(self) -> dict[str, dict]:
+        """Com rastro: quantas vezes e por quanto tempo cada mutex ficou travado (travas ainda abertas contam até o fim)"""
+        if self.events is None:
+            return {}
+
+        mutexes = np.array([kind == 'mutex' for kind, _ in self.primitives] + [False], bool)
+        kind, task, argument, time = self.events['kind'], self.events['task'], self.events['argument'], self.events['time']
+        tasks = len(self.ids)
+
+        def ranked(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+            """(chave mutex x tarefa, ordem dentro da chave, instante) dos eventos, ordenados por chave e instante"""
+            selected = np.flatnonzero(mask)
+            selected = selected[mutexes[argument[selected]]]
+            keys = argument[selected] * tasks + task[selected]
+            times = time[selected]
+            order = np.lexsort((times, keys))
+            keys, times = keys[order], times[order]
+            first = np.searchsorted(keys, keys, side='left')
+            return keys, np.arange(len(keys)) - first, times
+
+        lock_keys, lock_ranks, lock_times = ranked(kind == LOCK)
+        unlock_keys, unlock_ranks, unlock_times = ranked(kind == UNLOCK)
+
+        # a k-ésima trava de uma tarefa em um mutex termina na k-ésima liberação
+        stride = max(len(lock_ranks), len(unlock_ranks)) + 1
+        unlock_ids = unlock_keys * stride + unlock_ranks
+        lock_ids = lock_keys * stride + lock_ranks
+        position = np.searchsorted(unlock_ids, lock_ids)
+        matched = position < len(unlock_ids)
+        matched[matched] = unlock_ids[position[matched]] == lock_ids[matched]
+        ends = np.full(len(lock_ids), self.length, np.int64)
+        ends[matched] = unlock_times[position[matched]]
+        holds = ends - lock_times
+
+        primitive = lock_keys // tasks if tasks else lock_keys
+        result = {}
+        for number in np.unique(primitive):
+            values = holds[primitive == number]
+            kind_name, id = self.primitives[number]
+            result[f'{kind_name}:{id}'] = {
+                'count': int(len(values)),
+                'total': int(values.sum()),
+                'mean': float(values.mean()),
+                'max': int(values.max())
+            }
+        return result
+
+
+    def summary(self, window: int = None) -> dict:
+        """Resumo em tipos do Python (para json)"""
+        stats = self.task_stats()
+        histograms = self.state_histograms()
+        result = {
+            'length': self.length,
+            'tasks': len(self.ids),
+            'intervals': len(self),
+            'time_in_state': {name: int(ticks) for name, ticks in zip(self.states, self.time_in_state().sum(axis=0))},
+            'histograms': {name: {'counts': counts.tolist(), 'edges': edges.tolist()} for name, (counts, edges) in histograms.items()},
+            'locks': self.lock_holds()
+        }
+        if 'preemptions' in stats:
+            result['preemptions'] = int(stats['preemptions'].sum())
+        if window:
+            result['windows'] = {name: column.tolist() for name, column in self.window_stats(window).items()}
+        return result
+
+
+def write_task_csv(intervals: Intervals, output):
+    """Uma linha por tarefa com as estatísticas de task_stats"""
+    stats = intervals.task_stats()
+    writer = csv.writer(output)
+    writer.writerow(['id', *stats])
+    columns = [column.tolist() for column in stats.values()]
+    for row, task_id in enumerate(intervals.ids):
+        writer.writerow([task_id, *(round(column[row], 6) if isinstance(column[row], float) else column[row] for column in columns)])
+
+
+def write_intervals_csv(intervals: Intervals, output, chunk: int = 1 << 16):
+    """Uma linha por intervalo (id, início, fim, estado), escrita em blocos"""
+    writer = csv.writer(output)
+    writer.writerow(['id', 'start', 'end', 'state'])
+    ids, states = intervals.ids, intervals.states
+    for first in range(0, len(intervals), chunk):
+        block = slice(first, first + chunk)
+        writer.writerows(
+            (ids[task], start, end, states[state])
+            for task, start, end, state in zip(intervals.task[block].tolist(), intervals.start[block].tolist(),
+                                               intervals.end[block].tolist(), intervals.state[block].tolist())
+        )
+
+
+def load_intervals(path: str) -> Intervals:
+    """Rastro binário, .npz exportado ou json do headless.py (campo 'timeline')"""
+    with open(path, 'rb') as file:
+        magic = file.read(len(TRACE_MAGIC))
+
+    if magic == TRACE_MAGIC:
+        return Intervals.from_trace(TraceFile(path))
+    if path.endswith('.npz'):
+        return Intervals.load(path)
+
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            result = json.load(file)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError('não é um rastro da simulação, um .npz nem um json do headless.py') from None
+    if not isinstance(result, dict) or 'timeline' not in result:
+        raise ValueError('o json não tem a linha do tempo (execute o headless.py sem --no-timeline)')
+    return Intervals.from_timeline(result['timeline'])
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Análise vetorizada da linha do tempo de uma simulação')
+    parser.add_argument('input', help='rastro binário (headless.py --record), .npz exportado ou json do headless.py')
+    parser.add_argument('-w', '--window', type=int, help='inclui as estatísticas por janela de WINDOW ticks')
+    parser.add_argument('--csv', help='grava as estatísticas por tarefa em csv')
+    parser.add_argument('--intervals', help='grava os intervalos em csv')
+    parser.add_argument('--npz', help='grava os intervalos em .npz (colunar)')
+    parser.add_argument('-o', '--output', help='arquivo do resumo em json (padrão: saída padrão)')
+    args = parser.parse_args(argv)
+
+    if args.window is not None and args.window < 1:
+        print('ERRO | a janela deve ter ao menos 1 tick', file=sys.stderr)
+        return 1
+
+    try:
+        intervals = load_intervals(args.input)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {args.input}: {error}', file=sys.stderr)
+        return 1
+
+    if args.csv:
+        with open(args.csv, 'w', encoding='utf-8', newline='') as output:
+            write_task_csv(intervals, output)
+    if args.intervals:
+        with open(args.intervals, 'w', encoding='utf-8', newline='') as output:
+            write_intervals_csv(intervals, output)
+    if args.npz:
+        intervals.save(args.npz)
+
+    summary = intervals.summary(args.window)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(summary, output, ensure_ascii=False)
+            output.write('\n')
+    else:
+        json.dump(summary, sys.stdout, ensure_ascii=False)
+        sys.stdout.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,374 @@
+import argparse, json, mmap, struct, sys
+from bisect import bisect_right
+from tcb import State
+from engine import timeline_state
+from timeline import Timeline
+from metrics import StreamingMetrics
+from hooks import Counters
+
+# Rastro binário da simulação. O TraceRecorder é um ouvinte dos ganchos
+# (hooks.py): só custa algo quando inscrito. Cada ingresso, despacho,
+# preempção, bloqueio (IO ou mutex/semáforo), despertar, lock, unlock e término
+# vira um registro de tamanho fixo, acumulado em um buffer e acrescentado ao
+# arquivo. Os ids das tarefas e das primitivas ficam no rodapé, gravado ao fechar.
+#
+#   cabeçalho | registros ... | nomes (json) | rodapé
+#
+# O TraceFile abre o rastro com mmap e reconstrói a linha do tempo, as métricas
+# ou o estado das tarefas em qualquer tick sem executar o escalonador: os
+# registros estão em ordem de tempo, então um instante é localizado por busca
+# binária e só os registros até ele são lidos. replay(ouvinte) repete os ganchos
+# gravados para qualquer ouvinte (ex.: StreamingMetrics, Counters).
+#
+# Exemplo:
+#   python headless.py tarefas.txt --record rastro.bin
+#   python traceFile.py rastro.bin --at 120
+
+MAGIC = b'ESCT'
+VERSION = 1
+BYTE_ORDER_MARK = 0x01020304
+BUFFER_SIZE = 1 << 20   # bytes acumulados antes de cada escrita
+
+# magic, versão, marcador
+HEADER = struct.Struct('=4sII')
+# instante, tipo, estado da tarefa após o registro, tarefa, argumento
+RECORD = struct.Struct('=IBBxxIi')
+# registros, posição e tamanho dos nomes, magic (ausente se o rastro não foi fechado)
+FOOTER = struct.Struct('=QQQ4s')
+
+# Tipos de registro. O argumento é a quantidade de ticks (TICK), a primitiva
+# (BLOCK/WAKE/LOCK/UNLOCK; -1 = IO ou nenhuma) ou o tempo de espera total (TERMINATE)
+TICK = 0
+ARRIVE = 1
+DISPATCH = 2
+PREEMPT = 3
+BLOCK = 4
+WAKE = 5
+LOCK = 6
+UNLOCK = 7
+TERMINATE = 8
+
+NO_PRIMITIVE = -1
+
+
+class TraceRecorder:
+    """Ouvinte dos ganchos que grava o rastro binário em 'path' (feche com close)"""
+
+    def __init__(self, path: str):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, BYTE_ORDER_MARK))
+        self.buffer = bytearray()
+        self.count = 0
+        self.time = 0
+        self.tasks: dict[str, int] = {}             # id da tarefa -> número no rastro
+        self.task_info: list[list] = []             # [id, cor, início, duração]
+        self.primitives: dict[tuple, int] = {}      # (tipo, id) -> número no rastro
+
+
+    def write(self, kind: int, task: int, state: int, argument: int):
+        self.buffer += RECORD.pack(self.time, kind, state, task, argument)
+        self.count += 1
+        if len(self.buffer) >= BUFFER_SIZE:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+
+
+    def task_number(self, task) -> int:
+        number = self.tasks.get(task.id)
+        if number is None:
+            number = self.tasks[task.id] = len(self.task_info)
+            self.task_info.append([task.id, task.color, task.start, task.duration])
+        return number
+
+
+    def primitive_number(self, primitive) -> int:
+        if primitive is None:
+            return NO_PRIMITIVE
+        key = (primitive.kind, primitive.id)
+        number = self.primitives.get(key)
+        if number is None:
+            number = self.primitives[key] = len(self.primitives)
+        return number
+
+
+    def transition(self, kind: int, task, argument: int = 0):
+        self.write(kind, self.task_number(task), task.state.value, argument)
+
+
+    def on_tick(self, time: int, ticks: int):
+        self.time = time
+        self.write(TICK, 0, 0, ticks)
+
+
+    def on_arrive(self, task):
+        self.transition(ARRIVE, task)
+
+
+    def on_dispatch(self, task):
+        self.transition(DISPATCH, task)
+
+
+    def on_preempt(self, task):
+        self.transition(PREEMPT, task)
+
+
+    def on_block(self, task, primitive):
+        self.transition(BLOCK, task, self.primitive_number(primitive))
+
+
+    def on_wake(self, task, primitive):
+        self.transition(WAKE, task, self.primitive_number(primitive))
+
+
+    def on_lock(self, task, primitive):
+        self.transition(LOCK, task, self.primitive_number(primitive))
+
+
+    def on_unlock(self, task, primitive):
+        self.transition(UNLOCK, task, self.primitive_number(primitive))
+
+
+    def on_terminate(self, task):
+        self.transition(TERMINATE, task, task.total_waiting_time)
+
+
+    def close(self):
+        """Descarrega o buffer e grava os nomes e o rodapé"""
+        if self.file.closed:
+            return
+
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+        names = json.dumps({'tasks': self.task_info, 'primitives': list(self.primitives)}, ensure_ascii=False).encode('utf-8')
+        position = self.file.tell()
+        self.file.write(names)
+        self.file.write(FOOTER.pack(self.count, position, len(names), MAGIC))
+        self.file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceTask:
+    """Tarefa reconstruída do rastro, com os campos lidos pelos ouvintes dos ganchos"""
+
+    __slots__ = ('id', 'color', 'start', 'duration', 'state', 'total_waiting_time')
+
+    def __init__(self, id: str, color: str, start: int, duration: int):
+        self.id = id
+        self.color = color
+        self.start = start
+        self.duration = duration
+        self.state = State.NEW
+        self.total_waiting_time = 0
+
+
+class TracePrimitive:
+    """Mutex ou semáforo do rastro (tipo e id, como em hooks.Counters e hooks.Trace)"""
+
+    __slots__ = ('kind', 'id')
+
+    def __init__(self, kind: str, id: str):
+        self.kind = kind
+        self.id = id
+
+
+class RecordTimes:
+    """Instantes dos registros como sequência, para a busca binária"""
+
+    def __init__(self, view: memoryview, count: int):
+        self.view = view
+        self.count = count
+
+
+    def __len__(self) -> int:
+        return self.count
+
+
+    def __getitem__(self, position: int) -> int:
+        return struct.unpack_from('=I', self.view, HEADER.size + position * RECORD.size)[0]
+
+
+class TraceFile:
+    """Rastro aberto com mmap (somente leitura)"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = self.view = memoryview(self.buffer)
+
+        if len(view) < HEADER.size or bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f'{path}: não é um rastro da simulação')
+        _, version, mark = HEADER.unpack_from(view)
+        if version != VERSION:
+            raise ValueError(f'{path}: versão {version} não suportada')
+        if mark != BYTE_ORDER_MARK:
+            raise ValueError(f'{path}: gravado em uma máquina com outra ordem de bytes')
+        if len(view) < HEADER.size + FOOTER.size or bytes(view[-len(MAGIC):]) != MAGIC:
+            raise ValueError(f'{path}: rastro incompleto (o gravador não foi fechado)')
+
+        self.count, position, size, _ = FOOTER.unpack_from(view, len(view) - FOOTER.size)
+        if HEADER.size + self.count * RECORD.size != position or position + size + FOOTER.size != len(view):
+            raise ValueError(f'{path}: rastro corrompido')
+
+        names = json.loads(bytes(view[position:position + size]).decode('utf-8'))
+        self.task_info: list[list] = names['tasks']
+        self.primitives = [TracePrimitive(kind, id) for kind, id in names['primitives']]
+        self.times = RecordTimes(view, self.count)
+
+
+    def __len__(self) -> int:
+        return self.count
+
+
+    @property
+    def time(self) -> int:
+        """Instante final da simulação (o último tick, em que não havia mais tarefas)"""
+        return self.times[self.count - 1] if self.count else 0
+
+
+    def position(self, time: int) -> int:
+        """Quantidade de registros até o fim do tick 'time' (busca binária)"""
+        return bisect_right(self.times, time)
+
+
+    def records(self, start: int = 0, stop: int = None):
+        """Registros (instante, tipo, estado, tarefa, argumento) de 'start' até 'stop'"""
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return iter(())
+        return RECORD.iter_unpack(self.view[HEADER.size + start * RECORD.size:HEADER.size + stop * RECORD.size])
+
+
+    def tasks(self) -> list[TraceTask]:
+        return [TraceTask(*info) for info in self.task_info]
+
+
+    def replay(self, listener, until: int = None):
+        """Repete os ganchos gravados (até o tick 'until') para os métodos on_* do ouvinte"""
+        tasks = self.tasks()
+        primitives = self.primitives
+        handlers = {
+            kind: getattr(listener, name, None)
+            for kind, name in (
+                (ARRIVE, 'on_arrive'), (DISPATCH, 'on_dispatch'), (PREEMPT, 'on_preempt'), (BLOCK, 'on_block'),
+                (WAKE, 'on_wake'), (LOCK, 'on_lock'), (UNLOCK, 'on_unlock'), (TERMINATE, 'on_terminate')
+            )
+        }
+        on_tick = getattr(listener, 'on_tick', None)
+        states = list(State)
+
+        for time, kind, state, number, argument in self.records(stop=None if until is None else self.position(until)):
+            if kind == TICK:
+                if on_tick:
+                    on_tick(time, argument)
+                continue
+
+            task = tasks[number]
+            task.state = states[state]
+            if kind == TERMINATE:
+                task.total_waiting_time = argument
+
+            handler = handlers[kind]
+            if handler is None:
+                continue
+            if kind in (BLOCK, WAKE, LOCK, UNLOCK):
+                handler(task, primitives[argument] if argument != NO_PRIMITIVE else None)
+            else:
+                handler(task)
+
+        return listener
+
+
+    def states(self, time: int) -> dict[str, State]:
+        """Estado de cada tarefa ao fim do tick 'time'"""
+        tasks = self.tasks()
+        states = list(State)
+        for _, kind, state, number, _ in self.records(stop=self.position(time)):
+            if kind != TICK:
+                tasks[number].state = states[state]
+        return {task.id: task.state for task in tasks}
+
+
+    def timeline(self, until: int = None) -> Timeline:
+        """Linha do tempo (mesma codificação de engine.save_timeline) até o tick 'until' (padrão: o fim da simulação)"""
+        tasks = self.tasks()
+        length = self.time if until is None else until + 1
+        timeline = Timeline(task.id for task in tasks)
+        since = [0] * len(tasks)
+        states = list(State)
+
+        # o estado de um tick é o último registrado nele: o anterior vale de 'since' até o tick da troca
+        for time, kind, state, number, _ in self.records(stop=self.position(length - 1)):
+            if kind == TICK:
+                continue
+            task = tasks[number]
+            new_state = states[state]
+            if new_state != task.state:
+                timeline.append(task.id, timeline_state(task), time - since[number])
+                since[number] = time
+                task.state = new_state
+
+        for number, task in enumerate(tasks):
+            timeline.append(task.id, timeline_state(task), length - since[number])
+
+        return timeline
+
+
+    def metrics(self, cores: int = 1, until: int = None) -> StreamingMetrics:
+        """Estatísticas (metrics.py) recalculadas a partir do rastro"""
+        return self.replay(StreamingMetrics(cores), until)
+
+
+    def counters(self, until: int = None) -> Counters:
+        """Contadores (hooks.Counters) recalculados a partir do rastro; sem o tempo de cada executor"""
+        return self.replay(Counters(), until)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Analisa um rastro binário gravado com headless.py --record')
+    parser.add_argument('trace', help='arquivo do rastro')
+    parser.add_argument('--at', type=int, help='estado das tarefas ao fim do tick informado')
+    parser.add_argument('-c', '--cores', type=int, default=1, help='quantidade de núcleos da simulação, para a utilização (padrão: 1)')
+    parser.add_argument('--timeline', action='store_true', help='inclui a linha do tempo reconstruída')
+    parser.add_argument('-o', '--output', help='arquivo de saída (padrão: saída padrão)')
+    args = parser.parse_args(argv)
+
+    try:
+        trace = TraceFile(args.trace)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {error}', file=sys.stderr)
+        return 1
+
+    until = args.at
+    result = {
+        'records': len(trace),
+        'time': trace.time,
+        'statistics': trace.metrics(args.cores, until).summary(),
+        'counters': trace.counters(until).metrics()
+    }
+    if until is not None:
+        result['states'] = {task_id: state.name for task_id, state in trace.states(until).items()}
+    if args.timeline:
+        result['timeline'] = dict(trace.timeline(until).items())
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            json.dump(result, output, ensure_ascii=False)
+            output.write('\n')
+    else:
+        json.dump(result, sys.stdout, ensure_ascii=False)
+        sys.stdout.write('\n')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
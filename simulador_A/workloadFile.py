@@ -0,0 +1,148 @@
+import argparse, mmap, struct, sys
+from taskFile import stream_file
+from taskTable import TaskTable, StringColumn, STATIC_COLUMNS
+
+# Formato binário da carga de trabalho, para não reler o texto a cada execução.
+# O arquivo guarda as colunas da TaskTable em sequência, cada uma alinhada em
+# 8 bytes, e é aberto com mmap: as colunas fixas da tabela são memoryviews sobre
+# o arquivo (sem cópia) e apenas as colunas dinâmicas são alocadas.
+#
+#   cabeçalho | start | duration | priority_init | event_offsets | event_type |
+#   event_start | event_duration | ids.offsets | ids.data | colors.offsets | colors.data |
+#   event_locks.offsets | event_locks.data
+#
+# Os inteiros usam a ordem de bytes da máquina que gravou; um marcador no
+# cabeçalho detecta arquivos de outra arquitetura.
+#
+# Exemplo:
+#   python workloadFile.py carga.txt carga.bin
+
+MAGIC = b'ESCW'
+VERSION = 2     # 2: id do mutex/semáforo de cada evento (event_locks)
+BYTE_ORDER_MARK = 0x01020304
+ALIGNMENT = 8
+
+# magic, versão, marcador, tarefas, eventos, bytes dos ids, bytes das cores, bytes dos locks, algoritmo, quantum, alpha
+ALGORITHM_SIZE = 16     # bytes do nome do algoritmo no cabeçalho
+HEADER = struct.Struct(f'=4sIIIIIII{ALGORITHM_SIZE}sii')
+
+
+def align(position: int) -> int:
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def sections(table: TaskTable) -> list:
+    """Colunas na ordem do arquivo"""
+    return [getattr(table, name) for name in STATIC_COLUMNS] + [
+        table.ids.offsets, table.ids.data, table.colors.offsets, table.colors.data,
+        table.event_locks.offsets, table.event_locks.data
+    ]
+
+
+def is_binary(path: str) -> bool:
+    with open(path, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def write_binary(path: str, table: TaskTable, algorithm: str, quantum: int, alpha: int):
+    """Grava a tabela (e o cabeçalho do arquivo .txt) no formato binário"""
+    # o struct cortaria o nome sem avisar
+    name = algorithm.encode('ascii')
+    if len(name) > ALGORITHM_SIZE:
+        raise ValueError(f'nome do algoritmo com mais de {ALGORITHM_SIZE} bytes: {algorithm}')
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, VERSION, BYTE_ORDER_MARK, len(table), len(table.event_type),
+            len(table.ids.data), len(table.colors.data), len(table.event_locks.data), name, quantum, alpha
+        ))
+
+        for column in sections(table):
+            file.write(b'\0' * (align(file.tell()) - file.tell()))
+            file.write(column)
+
+
+def read_binary(path: str) -> tuple[str, int, int, TaskTable]:
+    """Abre o arquivo binário com mmap; retorna (algoritmo, quantum, alpha, tabela) sem copiar as colunas fixas"""
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+
+    # magic e versão primeiro: o tamanho do cabeçalho depende da versão
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f'{path}: não é um arquivo de carga binário')
+    if len(view) < len(MAGIC) + 4:
+        raise ValueError(f'{path}: arquivo binário incompleto')
+    version = struct.unpack_from('=I', view, len(MAGIC))[0]
+    if version != VERSION:
+        raise ValueError(f'{path}: versão {version} não suportada')
+    if len(view) < HEADER.size:
+        raise ValueError(f'{path}: arquivo binário incompleto')
+
+    _, _, mark, task_count, event_count, ids_size, colors_size, locks_size, algorithm, quantum, alpha = HEADER.unpack_from(view)
+    if mark != BYTE_ORDER_MARK:
+        raise ValueError(f'{path}: gravado em uma máquina com outra ordem de bytes')
+
+    position = HEADER.size
+
+    def take(typecode: str, count: int) -> memoryview:
+        nonlocal position
+        position = align(position)
+        size = struct.calcsize(typecode) * count
+        if position + size > len(view):
+            raise ValueError(f'{path}: arquivo binário incompleto')
+        column = view[position:position + size].cast(typecode)
+        position += size
+        return column
+
+    counts = {
+        'start': task_count,
+        'duration': task_count,
+        'priority_init': task_count,
+        'event_offsets': task_count + 1,
+        'event_type': event_count,
+        'event_start': event_count,
+        'event_duration': event_count
+    }
+    columns = {name: take(typecode, counts[name]) for name, typecode in STATIC_COLUMNS.items()}
+    ids_offsets = take('I', task_count + 1)
+    ids = StringColumn.from_buffers(take('B', ids_size), ids_offsets)
+    colors_offsets = take('I', task_count + 1)
+    colors = StringColumn.from_buffers(take('B', colors_size), colors_offsets)
+    locks_offsets = take('I', event_count + 1)
+    event_locks = StringColumn.from_buffers(take('B', locks_size), locks_offsets)
+
+    table = TaskTable.from_buffers(ids, colors, event_locks, **columns)
+    table.buffer = buffer   # mantém o arquivo mapeado enquanto a tabela existir
+
+    return algorithm.rstrip(b'\0').decode('ascii'), quantum, alpha, table
+
+
+def load_workload(path: str) -> tuple[str, int, int, TaskTable]:
+    """Carrega um arquivo binário (mmap) ou .txt (lido linha a linha direto para a tabela)"""
+    if is_binary(path):
+        return read_binary(path)
+
+    algorithm, quantum, alpha, tasks = stream_file(path)
+    return algorithm, quantum, alpha, TaskTable.from_tasks(tasks)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description='Converte um arquivo .txt de tarefas para o formato binário')
+    parser.add_argument('input', help='arquivo .txt (ou binário) de entrada')
+    parser.add_argument('output', help='arquivo binário de saída')
+    args = parser.parse_args(argv)
+
+    try:
+        algorithm, quantum, alpha, table = load_workload(args.input)
+        write_binary(args.output, table, algorithm, quantum, alpha)
+    except (OSError, ValueError) as error:
+        print(f'ERRO | {error}', file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import argparse, math, random, sys
+from tcb import TCB
+from taskFile import DEFAULT_ALGORITHM, DEFAULT_QUANTUM, DEFAULT_ALPHA, RANDOM_INIT, RANDOM_END
+
+# Gerador de cargas de trabalho sintéticas e reprodutíveis (mesma semente,
+# mesmas tarefas). As tarefas são produzidas uma a uma, em ordem de ingresso,
+# então é possível gerar milhões delas sem montar listas intermediárias:
+#
+#   generator = WorkloadGenerator(seed=42, arrival_rate=2.0, burst='pareto')
+#   table = TaskTable.from_tasks(generator.tasks(1_000_000))
+#   generator.write('carga.txt', 10_000_000)
+#
+# Distribuições:
+# - ingresso: processo de Poisson com 'arrival_rate' tarefas por tick
+# - duração: 'exponential', 'pareto' (cauda pesada) ou 'uniform', com média 'mean_burst'
+# - prioridade: sorteio ponderado de 'priorities' ({prioridade: peso}) ou uniforme
+# - IO: quantidade por tarefa ~ Poisson('io_density'), duração exponencial com média 'io_duration'
+# - mutex: com probabilidade 'mutex_probability' a tarefa recebe um par ML/MU, de um
+#   dos 'mutex_count' mutexes (com 1, o mutex global)
+
+BURSTS = ['exponential', 'pareto', 'uniform']
+
+
+class WorkloadGenerator:
+    def __init__(self, seed: int = None, arrival_rate: float = 0.5, burst: str = 'exponential', mean_burst: float = 5,
+                 pareto_shape: float = 1.5, max_burst: int = None, priorities: dict[int, float] = None,
+                 io_density: float = 0, io_duration: float = 2, mutex_probability: float = 0,
+                 mutex_count: int = 1):
+        if arrival_rate <= 0:
+            raise ValueError('arrival_rate deve ser positivo')
+        if mean_burst <= 0:
+            raise ValueError('mean_burst deve ser positivo')
+        if burst not in BURSTS:
+            raise ValueError(f'distribuição de duração não suportada: {burst}')
+        if burst == 'pareto' and pareto_shape <= 1:
+            raise ValueError('pareto_shape deve ser maior que 1 (média finita)')
+        if mutex_count < 1:
+            raise ValueError('mutex_count deve ser ao menos 1')
+
+        self.seed = seed
+        self.arrival_rate = arrival_rate
+        self.burst = burst
+        self.mean_burst = mean_burst
+        self.pareto_shape = pareto_shape
+        self.max_burst = max_burst
+        self.priorities = priorities
+        self.io_density = io_density
+        self.io_duration = io_duration
+        self.mutex_probability = mutex_probability
+        self.mutex_count = mutex_count
+
+
+    def sample_burst(self, rng: random.Random) -> int:
+        if self.burst == 'exponential':
+            value = rng.expovariate(1 / self.mean_burst)
+        elif self.burst == 'pareto':
+            # escala para que a média seja mean_burst
+            value = rng.paretovariate(self.pareto_shape) * self.mean_burst * (self.pareto_shape - 1) / self.pareto_shape
+        else:
+            value = rng.uniform(1, 2 * self.mean_burst - 1)
+
+        burst = max(1, round(value))
+        return min(burst, self.max_burst) if self.max_burst else burst
+
+
+    def specs(self, count: int):
+        """Gera (id, cor, ingresso, duração, prioridade, eventos) de 'count' tarefas"""
+        rng = random.Random(self.seed)
+
+        if self.priorities:
+            population = list(self.priorities)
+            cumulative = []
+            total = 0
+            for weight in self.priorities.values():
+                total += weight
+                cumulative.append(total)
+
+        io_limit = math.exp(-self.io_density)
+        arrival = 0.0
+
+        for index in range(count):
+            arrival += rng.expovariate(self.arrival_rate)
+            duration = self.sample_burst(rng)
+
+            if self.priorities:
+                priority = rng.choices(population, cum_weights=cumulative)[0]
+            else:
+                priority = rng.randint(RANDOM_INIT, RANDOM_END)
+
+            events = []
+
+            # quantidade de IOs ~ Poisson(io_density) (método de Knuth)
+            product = rng.random()
+            while product > io_limit:
+                events.append(('IO', rng.randrange(duration), max(1, round(rng.expovariate(1 / self.io_duration)))))
+                product *= rng.random()
+
+            # par ML/MU com o lock antes do unlock
+            if duration > 1 and rng.random() < self.mutex_probability:
+                lock = rng.randrange(duration - 1)
+                unlock = rng.randint(lock + 1, duration - 1)
+                # com um só mutex não sorteia o id (as sementes geram as mesmas cargas de antes)
+                mutex = str(rng.randrange(self.mutex_count)) if self.mutex_count > 1 else ''
+                events.append(('ML' + mutex, lock, 1))
+                events.append(('MU' + mutex, unlock, 1))
+
+            yield f"t{index + 1:02d}", f"{rng.randrange(0x1000000):06x}", int(arrival), duration, priority, events
+
+
+    def tasks(self, count: int):
+        """Gera os TCBs em ordem de ingresso, sob demanda"""
+        for id, color, start, duration, priority, events in self.specs(count):
+            yield TCB(
+                id,
+                "#" + color,
+                start,
+                duration,
+                priority,
+                [{'type': event_type[:2], 'start': start_event, 'duration': duration_event, 'duration_current': 0, 'lock': event_type[2:]}
+                 for event_type, start_event, duration_event in events]
+            )
+
+
+    def lines(self, count: int, algorithm: str = DEFAULT_ALGORITHM, quantum: int = DEFAULT_QUANTUM, alpha: int = DEFAULT_ALPHA):
+        """Gera as linhas do arquivo .txt (cabeçalho + uma tarefa por linha)"""
+        yield f"{algorithm};{quantum};{alpha}\n"
+
+        for id, color, start, duration, priority, events in self.specs(count):
+            items = [id, color, str(start), str(duration), str(priority)]
+            for event_type, start_event, duration_event in events:
+                items.append(f"IO:{start_event}-{duration_event}" if event_type == 'IO' else f"{event_type}:{start_event}")
+            yield ";".join(items) + "\n"
+
+
+    def write(self, path: str, count: int, algorithm: str = DEFAULT_ALGORITHM, quantum: int = DEFAULT_QUANTUM, alpha: int = DEFAULT_ALPHA):
+        """Escreve a carga direto no arquivo, sem montar a lista de tarefas"""
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(self.lines(count, algorithm, quantum, alpha))
+
+
+def parse_priorities(value: str) -> dict[int, float]:
+    """'1:5,5:3,9:1' -> {1: 5.0, 5: 3.0, 9: 1.0}"""
+    priorities = {}
+    for item in value.split(','):
+        priority, _, weight = item.partition(':')
+        priorities[int(priority)] = float(weight) if weight else 1.0
+    return priorities
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description='Gerador de cargas de trabalho sintéticas')
+    parser.add_argument('count', type=int, help='quantidade de tarefas')
+    parser.add_argument('-s', '--seed', type=int, help='semente (mesma semente, mesmas tarefas)')
+    parser.add_argument('-o', '--output', help='arquivo de saída (padrão: saída padrão)')
+    parser.add_argument('-a', '--algorithm', default=DEFAULT_ALGORITHM, help='algoritmo do cabeçalho')
+    parser.add_argument('-q', '--quantum', type=int, default=DEFAULT_QUANTUM, help='quantum do cabeçalho')
+    parser.add_argument('--alpha', type=int, default=DEFAULT_ALPHA, help='alpha do cabeçalho')
+    parser.add_argument('--arrival-rate', type=float, default=0.5, help='tarefas por tick (ingressos de Poisson)')
+    parser.add_argument('--burst', choices=BURSTS, default='exponential', help='distribuição da duração')
+    parser.add_argument('--mean-burst', type=float, default=5, help='duração média')
+    parser.add_argument('--pareto-shape', type=float, default=1.5, help='forma da distribuição de Pareto (> 1)')
+    parser.add_argument('--max-burst', type=int, help='duração máxima')
+    parser.add_argument('--priorities', type=parse_priorities, help="prioridades ponderadas, ex.: '1:5,5:3,9:1'")
+    parser.add_argument('--io-density', type=float, default=0, help='média de eventos de IO por tarefa')
+    parser.add_argument('--io-duration', type=float, default=2, help='duração média dos IOs')
+    parser.add_argument('--mutex-probability', type=float, default=0, help='probabilidade da tarefa usar um mutex')
+    parser.add_argument('--mutex-count', type=int, default=1, help='quantidade de mutexes (MLid/MUid; com 1, o mutex global)')
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    try:
+        generator = WorkloadGenerator(
+            args.seed, args.arrival_rate, args.burst, args.mean_burst, args.pareto_shape, args.max_burst,
+            args.priorities, args.io_density, args.io_duration, args.mutex_probability,
+            args.mutex_count
+        )
+    except ValueError as error:
+        print(f'ERRO | {error}', file=sys.stderr)
+        return 1
+
+    if args.output:
+        generator.write(args.output, args.count, args.algorithm.upper(), args.quantum, args.alpha)
+    else:
+        sys.stdout.writelines(generator.lines(args.count, args.algorithm.upper(), args.quantum, args.alpha))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())